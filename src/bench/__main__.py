@@ -0,0 +1,139 @@
+"""
+Move generation benchmarks.
+
+    python -m src.bench perft --fen FEN --depth N
+    python -m src.bench divide --fen FEN --depth N
+    python -m src.bench suite [--max-nodes N]
+    python -m src.bench suite --timing [--repeat N] [--output results.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from src import config
+from src.bench.perft import divide, perft
+from src.bench.positions import PERFT_POSITIONS
+from src.game.Game import Game
+
+
+def _timed_perft(fen: str, depth: int) -> tuple:
+    """
+    Run perft on a fresh position
+    :return: tuple: (nodes, elapsed seconds)
+    """
+    game = Game(fen=fen)
+    start = time.perf_counter()
+    nodes = perft(game, depth)
+    return nodes, time.perf_counter() - start
+
+
+def _report(nodes: int, elapsed: float) -> str:
+    nps = int(nodes / elapsed) if elapsed else 0
+    return f"nodes {nodes}  time {elapsed:.3f}s  nps {nps}"
+
+
+def run_perft(args) -> int:
+    nodes, elapsed = _timed_perft(args.fen, args.depth)
+    print(_report(nodes, elapsed))
+    return 0
+
+
+def run_divide(args) -> int:
+    game = Game(fen=args.fen)
+    start = time.perf_counter()
+    counts = divide(game, args.depth)
+    elapsed = time.perf_counter() - start
+    for move, nodes in sorted(counts.items()):
+        print(f"{move}: {nodes}")
+    print(f"moves {len(counts)}  {_report(sum(counts.values()), elapsed)}")
+    return 0
+
+
+def run_suite(args) -> int:
+    """
+    Correctness mode checks every depth up to --max-nodes against the known
+    counts. Timing mode runs the deepest such depth --repeat times per position
+    and writes the best times as JSON.
+    """
+    failures = 0
+    results = []
+    for position in PERFT_POSITIONS:
+        depths = [d for d, n in sorted(position["nodes"].items()) if n <= args.max_nodes]
+        if args.timing:
+            depths = depths[-1:]
+        for depth in depths:
+            expected = position["nodes"][depth]
+            runs = [_timed_perft(position["fen"], depth) for _ in range(args.repeat if args.timing else 1)]
+            nodes = runs[0][0]
+            elapsed = min(run[1] for run in runs)
+            passed = nodes == expected and all(run[0] == nodes for run in runs)
+            failures += not passed
+            status = "ok" if passed else f"FAIL expected {expected}"
+            print(f"{position['name']:<28} depth {depth}  {_report(nodes, elapsed)}  {status}")
+            results.append(
+                {
+                    "name": position["name"],
+                    "fen": position["fen"],
+                    "depth": depth,
+                    "nodes": nodes,
+                    "expected": expected,
+                    "seconds": elapsed,
+                    "nps": int(nodes / elapsed) if elapsed else 0,
+                }
+            )
+
+    if args.timing:
+        total_nodes = sum(result["nodes"] for result in results)
+        total_seconds = sum(result["seconds"] for result in results)
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "total_nodes": total_nodes,
+            "total_seconds": total_seconds,
+            "nps": int(total_nodes / total_seconds) if total_seconds else 0,
+            "positions": results,
+        }
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+            print(f"results written to {args.output}")
+        else:
+            print(json.dumps(report, indent=2))
+
+    print(f"{len(results) - failures}/{len(results)} passed")
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in (
+        ("perft", run_perft, "count the leaf nodes of a position"),
+        ("divide", run_divide, "count the leaf nodes below each root move"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--fen", default=config.BASE_FEN)
+        command.add_argument("--depth", type=int, required=True)
+        command.set_defaults(handler=handler)
+
+    suite = commands.add_parser("suite", help="run the perft test positions")
+    suite.add_argument("--max-nodes", type=int, default=1_000_000,
+                       help="skip depths with more leaf nodes than this")
+    suite.add_argument("--timing", action="store_true",
+                       help="time the deepest depth of each position and report JSON")
+    suite.add_argument("--repeat", type=int, default=3, help="runs per position in timing mode")
+    suite.add_argument("--output", help="JSON file for the timing results (default stdout)")
+    suite.set_defaults(handler=run_suite)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
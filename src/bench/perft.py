@@ -0,0 +1,56 @@
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.utils.utils import move_to_uci
+
+
+def _perft(game: Game, generator: MoveGenerator, depth: int, move_lists: list) -> int:
+    """
+    Count the leaf nodes below the current position, one move list per ply
+    """
+    moves = move_lists[depth]
+    count = generator.generate_legal_moves(moves)
+    if depth == 1:
+        return count  # Bulk counting, the last ply is not played
+    nodes = 0
+    for i in range(count):
+        game.make_move(moves[i])
+        nodes += _perft(game, generator, depth - 1, move_lists)
+        game.unmake_move()
+    return nodes
+
+
+def perft(game: Game, depth: int) -> int:
+    """
+    Count the leaf nodes of the legal move tree
+    :param game: Game: root position, restored on return
+    :param depth: int: depth of the tree in plies
+    :return: int: number of leaf nodes
+    """
+    if depth <= 0:
+        return 1
+    generator = MoveGenerator(game)
+    move_lists = [MoveGenerator.new_move_list() for _ in range(depth + 1)]
+    return _perft(game, generator, depth, move_lists)
+
+
+def divide(game: Game, depth: int) -> dict:
+    """
+    Count the leaf nodes below each root move, to locate move generation bugs
+    :param game: Game: root position, restored on return
+    :param depth: int: depth of the tree in plies, root move included
+    :return: dict: leaf nodes by root move in UCI notation
+    """
+    generator = MoveGenerator(game)
+    move_lists = [MoveGenerator.new_move_list() for _ in range(max(depth, 1))]
+    root_moves = MoveGenerator.new_move_list()
+    count = generator.generate_legal_moves(root_moves)
+    result = {}
+    for i in range(count):
+        move = root_moves[i]
+        if depth <= 1:
+            result[move_to_uci(move)] = 1
+            continue
+        game.make_move(move)
+        result[move_to_uci(move)] = _perft(game, generator, depth - 1, move_lists)
+        game.unmake_move()
+    return result
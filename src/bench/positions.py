@@ -0,0 +1,113 @@
+"""
+Perft test positions with their known leaf node counts by depth.
+Sources: chessprogramming.org perft results and the edge case suite of
+Martin Sedlak (en passant, castling and promotion corner cases).
+"""
+
+PERFT_POSITIONS = (
+    {
+        "name": "start",
+        "fen": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "nodes": {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609, 6: 119060324},
+    },
+    {
+        "name": "kiwipete",
+        "fen": "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "nodes": {1: 48, 2: 2039, 3: 97862, 4: 4085603, 5: 193690690},
+    },
+    {
+        "name": "position-3",
+        "fen": "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "nodes": {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624, 6: 11030083},
+    },
+    {
+        "name": "position-4",
+        "fen": "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "nodes": {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292},
+    },
+    {
+        "name": "position-4-mirrored",
+        "fen": "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+        "nodes": {1: 6, 2: 264, 3: 9467, 4: 422333, 5: 15833292},
+    },
+    {
+        "name": "position-5",
+        "fen": "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        "nodes": {1: 44, 2: 1486, 3: 62379, 4: 2103487, 5: 89941194},
+    },
+    {
+        "name": "position-6",
+        "fen": "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        "nodes": {1: 46, 2: 2079, 3: 89890, 4: 3894594, 5: 164075551},
+    },
+    {
+        "name": "illegal-en-passant-1",
+        "fen": "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+        "nodes": {1: 18, 2: 92, 3: 1670, 4: 10138, 5: 185429, 6: 1134888},
+    },
+    {
+        "name": "illegal-en-passant-2",
+        "fen": "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1",
+        "nodes": {1: 13, 2: 102, 3: 1266, 4: 10276, 5: 135655, 6: 1015133},
+    },
+    {
+        "name": "en-passant-capture-checks",
+        "fen": "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+        "nodes": {1: 15, 2: 126, 3: 1928, 4: 13931, 5: 206379, 6: 1440467},
+    },
+    {
+        "name": "short-castling-gives-check",
+        "fen": "5k2/8/8/8/8/8/8/4K2R w K - 0 1",
+        "nodes": {1: 15, 2: 66, 3: 1198, 4: 6399, 5: 120330, 6: 661072},
+    },
+    {
+        "name": "long-castling-gives-check",
+        "fen": "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1",
+        "nodes": {1: 16, 2: 71, 3: 1286, 4: 7418, 5: 141077, 6: 803711},
+    },
+    {
+        "name": "castling-rights",
+        "fen": "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1",
+        "nodes": {1: 26, 2: 1141, 3: 27826, 4: 1274206},
+    },
+    {
+        "name": "castling-prevented",
+        "fen": "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1",
+        "nodes": {1: 44, 2: 1494, 3: 50509, 4: 1720476},
+    },
+    {
+        "name": "promote-out-of-check",
+        "fen": "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+        "nodes": {1: 11, 2: 133, 3: 1442, 4: 19174, 5: 266199, 6: 3821001},
+    },
+    {
+        "name": "discovered-check",
+        "fen": "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1",
+        "nodes": {1: 29, 2: 165, 3: 5160, 4: 31961, 5: 1004658},
+    },
+    {
+        "name": "promote-to-give-check",
+        "fen": "4k3/1P6/8/8/8/8/K7/8 w - - 0 1",
+        "nodes": {1: 9, 2: 40, 3: 472, 4: 2661, 5: 38983, 6: 217342},
+    },
+    {
+        "name": "underpromote-to-give-check",
+        "fen": "8/P1k5/K7/8/8/8/8/8 w - - 0 1",
+        "nodes": {1: 6, 2: 27, 3: 273, 4: 1329, 5: 18135, 6: 92683},
+    },
+    {
+        "name": "self-stalemate",
+        "fen": "K1k5/8/P7/8/8/8/8/8 w - - 0 1",
+        "nodes": {1: 2, 2: 6, 3: 13, 4: 63, 5: 382, 6: 2217},
+    },
+    {
+        "name": "stalemate-and-checkmate",
+        "fen": "8/k1P5/8/1K6/8/8/8/8 w - - 0 1",
+        "nodes": {1: 10, 2: 25, 3: 268, 4: 926, 5: 10857, 6: 43261, 7: 567584},
+    },
+    {
+        "name": "stalemate-and-checkmate-2",
+        "fen": "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+        "nodes": {1: 37, 2: 183, 3: 6559, 4: 23527},
+    },
+)
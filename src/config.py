@@ -1,2 +1,3 @@
 BASE_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
-PIECE_ASSET_PATH = "assets/pieces"
\ No newline at end of file
+PIECE_ASSET_PATH = "assets/pieces"
+CACHE_PATH = ".cache"
\ No newline at end of file
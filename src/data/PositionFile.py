@@ -0,0 +1,163 @@
+"""
+Binary position files: a 16 bytes header followed by fixed-width records of
+Game.to_bytes, so position i lives at HEADER_SIZE + i * POSITION_SIZE.
+Files are read through mmap: opening one does not load it, a lookup by
+index is one slice of the mapping, and every process reading the same file
+shares its pages in the OS page cache.
+"""
+import mmap
+import struct
+
+import numpy as np
+
+from src.data.fen_loader import iter_fen_chunks
+from src.game.Game import POSITION_SIZE, Game
+
+MAGIC = b"CHESSPOS"
+VERSION = 1
+# Magic, format version, record size
+HEADER_STRUCT = struct.Struct("<8sII")
+HEADER_SIZE = HEADER_STRUCT.size
+
+
+class PositionFile:
+    """
+    Read-only, memory-mapped access to a position file
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: str: path of a file written by write_positions or convert_fen_file
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"{path}: not a position file")
+            magic, version, record_size = HEADER_STRUCT.unpack(header)
+            if magic != MAGIC or version != VERSION or record_size != POSITION_SIZE:
+                raise ValueError(f"{path}: not a position file or unsupported version")
+            size = file.seek(0, 2)
+            if (size - HEADER_SIZE) % POSITION_SIZE:
+                raise ValueError(f"{path}: truncated position file")
+            self._count = (size - HEADER_SIZE) // POSITION_SIZE
+            # An empty file cannot be mapped
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self._count else b""
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, index: int) -> bytes:
+        """
+        Encoded record of a position
+        :param index: int: position index, negative values count from the end
+        :return: bytes: POSITION_SIZE bytes, see Game.to_bytes
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("position index out of range")
+        offset = HEADER_SIZE + index * POSITION_SIZE
+        return self._mmap[offset:offset + POSITION_SIZE]
+
+    def __getitem__(self, index: int) -> Game:
+        return Game.from_bytes(self.raw(index))
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def records(self) -> np.ndarray:
+        """
+        Every record at once, without copy
+        :return: (N, POSITION_SIZE) uint8 array view of the mapping
+        """
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=self._count * POSITION_SIZE,
+                             offset=HEADER_SIZE if self._count else 0).reshape(-1, POSITION_SIZE)
+
+    def close(self) -> None:
+        if self._count:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _write_header(file) -> None:
+    file.write(HEADER_STRUCT.pack(MAGIC, VERSION, POSITION_SIZE))
+
+
+def write_positions(path: str, games) -> int:
+    """
+    Write Game objects to a new position file
+    :param path: str: destination path
+    :param games: iterable of Game
+    :return: int: number of positions written
+    """
+    count = 0
+    with open(path, "wb") as file:
+        _write_header(file)
+        for game in games:
+            file.write(game.to_bytes())
+            count += 1
+    return count
+
+
+def pack_columns(columns: dict, count: int) -> np.ndarray:
+    """
+    Encode the first rows of position columns (see fen_loader) in the
+    Game.to_bytes layout, without building Game objects
+    :param columns: dict: column name -> numpy array
+    :param count: int: number of rows to encode
+    :return: (count, POSITION_SIZE) uint8 array
+    """
+    boards = columns["boards"][:count]
+    rows = np.arange(count)[:, None]
+    squares = np.arange(64, dtype=np.uint64)
+
+    # Piece index of every square, 12 for empty ones
+    mailbox = np.full((count, 64), 12, dtype=np.uint8)
+    for piece in range(12):
+        occupied = (boards[:, piece, None] >> squares) & np.uint64(1) == 1
+        mailbox[occupied] = piece
+    occupied = mailbox != 12
+    if (occupied.sum(axis=1) > 32).any():
+        raise ValueError("more than 32 pieces, position cannot be encoded")
+
+    # Nibble slot of each occupied square: its rank among the occupied
+    # squares of the position, lowest square first
+    slots = np.cumsum(occupied, axis=1) - 1
+    nibbles = np.zeros((count, 32), dtype=np.uint8)
+    nibbles[np.broadcast_to(rows, occupied.shape)[occupied], slots[occupied]] = mailbox[occupied]
+
+    records = np.zeros(count, dtype=[
+        ("occupied", "<u8"), ("nibbles", "u1", 16), ("state", "u1"), ("en_passant", "u1"),
+        ("halfmove_clock", "<u2"), ("fullmove_number", "<u2"), ("padding", "u1", 2),
+    ])
+    records["occupied"] = np.bitwise_or.reduce(boards, axis=1)
+    records["nibbles"] = nibbles[:, 0::2] | nibbles[:, 1::2] << 4
+    records["state"] = columns["turn"][:count] | columns["castling_rights"][:count] << 1
+    records["en_passant"] = columns["en_passant"][:count] + 1
+    records["halfmove_clock"] = columns["halfmove_clock"][:count]
+    records["fullmove_number"] = columns["fullmove_number"][:count]
+    return records.view(np.uint8).reshape(count, POSITION_SIZE)
+
+
+def convert_fen_file(fen_path: str, path: str, skip_invalid: bool = False) -> int:
+    """
+    Convert a FEN / EPD file to a position file, chunk by chunk
+    :param fen_path: str: source FEN / EPD file
+    :param path: str: destination path
+    :param skip_invalid: bool: skip malformed lines instead of raising ValueError
+    :return: int: number of positions written
+    """
+    total = 0
+    with open(path, "wb") as file:
+        _write_header(file)
+        for columns, count in iter_fen_chunks(fen_path, skip_invalid=skip_invalid):
+            file.write(pack_columns(columns, count).tobytes())
+            total += count
+    return total
@@ -0,0 +1,198 @@
+"""
+Streaming FEN / EPD reader filling NumPy columns, without Game objects.
+
+Each line holds one position: a FEN, or an EPD (4 fields followed by
+operations, "hmvc" and "fmvn" give the clocks). Positions are written into
+preallocated columns:
+
+    boards            (N, 12) uint64  piece bitboards, Game.PIECE_BITBOARDS order
+    turn              (N,) uint8      0 for white, 1 for black
+    castling_rights   (N,) uint8      KQkq bits as in Game.castling_rights
+    en_passant        (N,) int8       en passant square index, -1 for none
+    halfmove_clock    (N,) uint16
+    fullmove_number   (N,) uint16
+
+Board ranks are parsed once per distinct rank string and cached (up to
+RANK_CACHE_SIZE of them), as the same few thousand rank patterns cover
+most real positions.
+"""
+import functools
+
+import numpy as np
+
+from src.utils import constants
+
+COLUMN_DTYPES = {
+    "boards": (np.uint64, 12),
+    "turn": (np.uint8, None),
+    "castling_rights": (np.uint8, None),
+    "en_passant": (np.int8, None),
+    "halfmove_clock": (np.uint16, None),
+    "fullmove_number": (np.uint16, None),
+}
+DEFAULT_CHUNK_SIZE = 1 << 16
+RANK_CACHE_SIZE = 1 << 16
+
+_PIECE_INDEXES = {ord(symbol): index for index, symbol in enumerate(constants.PIECE_SYMBOLS)}
+_CASTLING_BITS = {
+    ord(constants.WHITE_KING): constants.WHITE_KINGSIDE_CASTLE,
+    ord(constants.WHITE_QUEEN): constants.WHITE_QUEENSIDE_CASTLE,
+    ord(constants.BLACK_KING): constants.BLACK_KINGSIDE_CASTLE,
+    ord(constants.BLACK_QUEEN): constants.BLACK_QUEENSIDE_CASTLE,
+}
+_castling_cache = {b"-": 0}
+
+
+def allocate_columns(size: int) -> dict:
+    """
+    Allocate empty position columns
+    :param size: int: number of rows
+    :return: dict: column name -> numpy array
+    """
+    return {
+        name: np.zeros((size, width) if width else size, dtype=dtype)
+        for name, (dtype, width) in COLUMN_DTYPES.items()
+    }
+
+
+@functools.lru_cache(maxsize=RANK_CACHE_SIZE)
+def _parse_rank(rank: bytes) -> tuple:
+    """
+    Decode one rank of a FEN board, cached by rank string
+    :return: tuple: (piece index, file bits) of each piece of the rank
+    """
+    file = 0
+    pieces = []
+    for char in rank:
+        if 49 <= char <= 56:  # Digits 1 to 8, empty squares
+            file += char - 48
+        else:
+            pieces.append((_PIECE_INDEXES[char], 1 << file))
+            file += 1
+    if file != 8:
+        raise ValueError(f"invalid FEN rank {rank!r}")
+    return tuple(pieces)
+
+
+def _parse_castling(field: bytes) -> int:
+    rights = _castling_cache.get(field)
+    if rights is None:
+        rights = 0
+        for char in field:
+            rights |= _CASTLING_BITS[char]
+        _castling_cache[field] = rights
+    return rights
+
+
+def parse_line(line: bytes, columns: dict, row: int) -> None:
+    """
+    Decode one FEN / EPD line into a row of the columns
+    :param line: bytes: position line
+    :param columns: dict: columns from allocate_columns
+    :param row: int: row to write
+    :return:
+    """
+    fields = line.split()
+    if len(fields) < 4:
+        raise ValueError(f"not a FEN / EPD position: {line!r}")
+    ranks = fields[0].split(b"/")
+    if len(ranks) != 8:
+        raise ValueError(f"invalid FEN board {fields[0]!r}")
+
+    bitboards = [0] * 12
+    shift = 56  # First rank of the FEN is the eighth
+    for rank in ranks:
+        for piece, bits in _parse_rank(rank):
+            bitboards[piece] |= bits << shift
+        shift -= 8
+    columns["boards"][row] = bitboards
+
+    turn = fields[1]
+    if turn == b"w":
+        columns["turn"][row] = 0
+    elif turn == b"b":
+        columns["turn"][row] = 1
+    else:
+        raise ValueError("turn value not valid for FEN position")
+    columns["castling_rights"][row] = _parse_castling(fields[2])
+    en_passant = fields[3]
+    columns["en_passant"][row] = (
+        -1 if en_passant == b"-" else (en_passant[0] - 97) + (en_passant[1] - 49) * 8
+    )
+
+    halfmove, fullmove = 0, 1
+    if len(fields) >= 6 and fields[4].isdigit():
+        # FEN clocks
+        halfmove, fullmove = int(fields[4]), int(fields[5])
+    elif len(fields) > 4:
+        # EPD operations, "opcode operand;" pairs
+        operations = fields[4:]
+        for opcode, operand in zip(operations, operations[1:]):
+            if opcode == b"hmvc":
+                halfmove = int(operand.rstrip(b";"))
+            elif opcode == b"fmvn":
+                fullmove = int(operand.rstrip(b";"))
+    if not (0 <= halfmove <= 0xFFFF and 0 <= fullmove <= 0xFFFF):
+        raise ValueError(f"move clocks {halfmove} {fullmove} out of the uint16 range")
+    columns["halfmove_clock"][row] = halfmove
+    columns["fullmove_number"][row] = fullmove
+
+
+def iter_fen_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, skip_invalid: bool = False):
+    """
+    Stream a FEN / EPD file chunk by chunk. The same column buffers are
+    reused for every chunk: copy what must outlive the next iteration.
+    :param path: str: path of the file
+    :param chunk_size: int: maximum number of positions per chunk
+    :param skip_invalid: bool: skip malformed lines instead of raising ValueError
+    :return: generator of (columns, count), the first count rows are valid
+    """
+    columns = allocate_columns(chunk_size)
+    count = 0
+    with open(path, "rb", buffering=1 << 20) as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip() or line.startswith(b"#"):
+                continue
+            try:
+                parse_line(line, columns, count)
+            except (ValueError, KeyError, IndexError) as error:
+                if skip_invalid:
+                    continue
+                raise ValueError(f"{path}:{line_number}: {error}") from error
+            count += 1
+            if count == chunk_size:
+                yield columns, count
+                count = 0
+    if count:
+        yield columns, count
+
+
+def count_lines(path: str) -> int:
+    """
+    Count the lines of a file reading it by large binary blocks
+    :param path: str: path of the file
+    :return: int: number of lines
+    """
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as file:
+        while block := file.read(1 << 24):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
+
+
+def load_fen_file(path: str, skip_invalid: bool = False) -> dict:
+    """
+    Load a whole FEN / EPD file into columns allocated once from its line count
+    :param path: str: path of the file
+    :param skip_invalid: bool: skip malformed lines instead of raising ValueError
+    :return: dict: column name -> numpy array, one row per position
+    """
+    columns = allocate_columns(count_lines(path))
+    total = 0
+    for chunk, count in iter_fen_chunks(path, skip_invalid=skip_invalid):
+        for name, column in columns.items():
+            column[total:total + count] = chunk[name][:count]
+        total += count
+    return {name: column[:total] for name, column in columns.items()}
@@ -0,0 +1,282 @@
+"""
+Streaming PGN reader.
+
+Games are read one at a time from a binary file, so archives of any size
+run in constant memory. Each game gives its tag pairs and its SAN moves,
+which are decoded against the legal moves of a Game replayed alongside
+into encoded moves (see utils.encode_move).
+
+Large files can be processed in parallel: split_file cuts a file into byte
+ranges that start on game boundaries, and parallel_map runs a worker on
+each range in a process pool.
+"""
+import multiprocessing
+import os
+import re
+from array import array
+
+from src import config
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.utils import constants
+
+_TAG_RE = re.compile(rb'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# Comments, NAGs, variation parentheses, move numbers and move / result tokens
+_TOKEN_RE = re.compile(rb"\{[^}]*\}|;[^\n]*|\$\d+|\(|\)|\d+\.+|[^\s{}();$.]+")
+_SAN_RE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+_PIECE_TYPES = {"N": constants.KNIGHT, "B": constants.BISHOP, "R": constants.ROOK,
+                "Q": constants.QUEEN, "K": constants.KING}
+# Promotion piece to the low bits of the promotion flags
+_PROMOTIONS = {"N": 0, "B": 1, "R": 2, "Q": 3}
+
+
+def parse_san(game: Game, san: str, generator: MoveGenerator = None) -> int:
+    """
+    Decode a move in standard algebraic notation
+    :param game: Game: position the move is played from
+    :param san: str: SAN move (e4, Nbd7, exd8=Q+, O-O, ...)
+    :param generator: MoveGenerator: move generator of game, created if not given
+    :return: int: encoded move
+    """
+    if generator is None:
+        generator = MoveGenerator(game)
+    text = san.rstrip("+#!?")
+    moves = generator.moves
+    count = generator.generate_legal_moves(moves)
+
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        flag = constants.KING_CASTLE if len(text) == 3 else constants.QUEEN_CASTLE
+        for i in range(count):
+            if moves[i] >> 12 == flag:
+                return moves[i]
+        raise ValueError(f"illegal move {san!r}")
+
+    match = _SAN_RE.match(text)
+    if match is None:
+        raise ValueError(f"invalid SAN move {san!r}")
+    piece, from_file, from_rank, to, promotion = match.groups()
+    piece_type = _PIECE_TYPES[piece] if piece else constants.PAWN
+    to_square = (ord(to[0]) - 97) + (ord(to[1]) - 49) * 8
+    board = game.board
+
+    found = None
+    for i in range(count):
+        move = moves[i]
+        from_square = move & 0x3F
+        if (
+            (move >> 6) & 0x3F != to_square
+            or board[from_square] % 6 != piece_type
+            or from_file and from_square & 7 != ord(from_file) - 97
+            or from_rank and from_square >> 3 != ord(from_rank) - 49
+        ):
+            continue
+        flag = move >> 12
+        if flag & constants.PROMOTION_FLAG:
+            # A promotion without piece is read as a queen promotion
+            if flag & 3 != _PROMOTIONS[promotion or "Q"]:
+                continue
+        elif promotion:
+            continue
+        if found is not None:
+            raise ValueError(f"ambiguous move {san!r}")
+        found = move
+    if found is None:
+        raise ValueError(f"illegal move {san!r}")
+    return found
+
+
+def _is_tag_line(line: bytes) -> bool:
+    # Wrapped movetext lines can start with a "[%clk ...]" comment command
+    return line.startswith(b"[") and not line.startswith(b"[%")
+
+
+def _parse_tags(lines: list) -> dict:
+    tags = {}
+    for line in lines:
+        match = _TAG_RE.match(line)
+        if match:
+            value = match.group(2).decode("utf-8", "replace")
+            tags[match.group(1).decode("ascii")] = value.replace('\\"', '"').replace("\\\\", "\\")
+    return tags
+
+
+def _parse_movetext(movetext: bytes) -> tuple:
+    """
+    Split movetext into mainline SAN moves, skipping comments, NAGs and variations
+    :return: tuple: (list of SAN moves, result or None)
+    """
+    sans = []
+    result = None
+    depth = 0
+    for token in _TOKEN_RE.findall(movetext):
+        first = token[:1]
+        if first == b"(":
+            depth += 1
+        elif first == b")":
+            depth = max(0, depth - 1)
+        elif depth or first in b"{;$" or first.isdigit() and token.endswith(b"."):
+            continue
+        else:
+            text = token.decode("ascii", "replace")
+            if text in RESULTS:
+                result = text
+            else:
+                sans.append(text)
+    return sans, result
+
+
+def iter_raw_games(path: str, start: int = 0, end: int = None):
+    """
+    Stream the games of a PGN file without decoding their moves
+    :param path: str: path of the PGN file
+    :param start: int: byte offset of the first game to read, must be a game boundary
+    :param end: int: stop before the first game starting at or after this offset
+    :return: generator of (byte offset, tags dict, SAN moves list, result or None)
+    """
+    with open(path, "rb", buffering=1 << 20) as file:
+        file.seek(start)
+        offset = start
+        game_offset = None
+        tag_lines = []
+        movetext = []
+        for line in file:
+            stripped = line.strip()
+            is_tag = _is_tag_line(stripped)
+            # A tag line after movetext starts the next game
+            if is_tag and (movetext or game_offset is None):
+                if game_offset is not None:
+                    yield (game_offset, _parse_tags(tag_lines), *_parse_movetext(b" ".join(movetext)))
+                if end is not None and offset >= end:
+                    return
+                game_offset = offset
+                tag_lines = []
+                movetext = []
+            if is_tag and not movetext:
+                tag_lines.append(stripped)
+            elif stripped and not stripped.startswith(b"%"):
+                if game_offset is None:
+                    # Movetext without tag pairs
+                    game_offset = offset
+                movetext.append(stripped)
+            offset += len(line)
+        if game_offset is not None:
+            yield (game_offset, _parse_tags(tag_lines), *_parse_movetext(b" ".join(movetext)))
+
+
+def decode_moves(tags: dict, sans: list) -> tuple:
+    """
+    Replay SAN moves from the starting position of a game
+    :param tags: dict: tag pairs, a FEN tag sets the starting position
+    :param sans: list: SAN moves of the mainline
+    :return: tuple: (Game after the last move, array("H") of encoded moves)
+    """
+    game = Game(fen=tags.get("FEN", config.BASE_FEN))
+    generator = MoveGenerator(game)
+    moves = array("H")
+    for san in sans:
+        move = parse_san(game, san, generator)
+        game.make_move(move)
+        moves.append(move)
+    return game, moves
+
+
+def iter_games(path: str, start: int = 0, end: int = None, skip_invalid: bool = False):
+    """
+    Stream the games of a PGN file with their moves decoded
+    :param path: str: path of the PGN file
+    :param start: int: byte offset of the first game to read, must be a game boundary
+    :param end: int: stop before the first game starting at or after this offset
+    :param skip_invalid: bool: skip games with an illegal move instead of raising ValueError
+    :return: generator of (tags dict, starting FEN, array("H") of encoded moves, result or None)
+    """
+    for offset, tags, sans, result in iter_raw_games(path, start, end):
+        try:
+            _, moves = decode_moves(tags, sans)
+        except (ValueError, IndexError) as error:
+            if skip_invalid:
+                continue
+            raise ValueError(f"{path}: game at byte {offset}: {error}") from error
+        yield tags, tags.get("FEN", config.BASE_FEN), moves, result
+
+
+def iter_positions(path: str, start: int = 0, end: int = None, skip_invalid: bool = False):
+    """
+    Stream every position of the games of a PGN file. The same Game object
+    is updated in place from one position of a game to the next: copy what
+    must outlive the iteration.
+    :param path: str: path of the PGN file
+    :param start: int: byte offset of the first game to read, must be a game boundary
+    :param end: int: stop before the first game starting at or after this offset
+    :param skip_invalid: bool: stop replaying a game at its first illegal move instead of raising ValueError
+    :return: generator of (tags dict, Game, next move or 0 after the last move)
+    """
+    for offset, tags, sans, _ in iter_raw_games(path, start, end):
+        game = Game(fen=tags.get("FEN", config.BASE_FEN))
+        generator = MoveGenerator(game)
+        for san in sans:
+            try:
+                move = parse_san(game, san, generator)
+            except ValueError as error:
+                if skip_invalid:
+                    break
+                raise ValueError(f"{path}: game at byte {offset}: {error}") from error
+            yield tags, game, move
+            game.make_move(move)
+        else:
+            yield tags, game, 0
+
+
+def _next_game_offset(file, offset: int) -> int:
+    """
+    Offset of the first game starting after offset: the first tag line
+    following a movetext line
+    """
+    file.seek(offset)
+    if offset:
+        offset += len(file.readline())  # Partial line
+    seen_movetext = False
+    for line in file:
+        stripped = line.strip()
+        if _is_tag_line(stripped):
+            if seen_movetext:
+                return offset
+        elif stripped:
+            seen_movetext = True
+        offset += len(line)
+    return offset
+
+
+def split_file(path: str, parts: int) -> list:
+    """
+    Cut a PGN file into byte ranges starting on game boundaries
+    :param path: str: path of the PGN file
+    :param parts: int: wanted number of ranges, fewer are returned for small files
+    :return: list of (start, end) byte offsets
+    """
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as file:
+        for part in range(1, parts):
+            offset = _next_game_offset(file, size * part // parts)
+            if offsets[-1] < offset < size:
+                offsets.append(offset)
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+def parallel_map(path: str, worker, processes: int = None) -> list:
+    """
+    Run worker(path, start, end) on ranges of a PGN file in a process pool,
+    typically a function iterating iter_games(path, start, end) and
+    returning an aggregate
+    :param path: str: path of the PGN file
+    :param worker: picklable function (module level) taking (path, start, end)
+    :param processes: int: number of processes, defaults to the number of CPUs
+    :return: list: results of worker, in file order
+    """
+    processes = processes or os.cpu_count() or 1
+    # A few ranges per process so uneven game sizes balance out
+    ranges = split_file(path, 4 * processes)
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(worker, [(path, start, end) for start, end in ranges])
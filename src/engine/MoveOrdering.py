@@ -0,0 +1,131 @@
+from array import array
+
+from src.engine.see import see
+from src.game.Game import Game
+from src.utils import constants
+
+# Score bands, a move's sort key is score << 16 | move
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+HISTORY_LIMIT = 1 << 20
+
+# Losing captures (negative exchange) go after the quiet moves, by exchange value
+LOSING_CAPTURE_SCORE = -(1 << 14)
+
+# Victim and attacker weights by piece type (pawn .. king)
+VICTIM_WEIGHTS = (1, 3, 3, 5, 9, 0)
+# A capture by a piece worth no more than its victim cannot lose material,
+# the exchange is only evaluated for the others (king captures are always safe)
+ATTACKER_WEIGHTS = (1, 3, 3, 5, 9, 0)
+PROMOTION_WEIGHTS = (3, 3, 5, 9)  # Knight, bishop, rook, queen
+
+
+class MoveOrderer:
+    """
+    Sort a generated move list before it is searched: hash move first, then
+    captures that do not lose material by MVV-LVA (most valuable victim,
+    least valuable attacker), killer moves of the ply, quiet moves by
+    history score, and last the captures losing material according to the
+    static exchange evaluation (see engine.see).
+    Every move gets an integer sort key score << 16 | move and the keys are
+    sorted in one list.sort call, no per-move key function is involved.
+    """
+
+    def __init__(self, max_ply: int):
+        # Two killer slots per ply
+        self.killers = array("H", [0]) * (2 * (max_ply + 1))
+        # Quiet move cutoffs, indexed by color * 4096 + from * 64 + to
+        self.history = array("l", [0]) * (2 * 64 * 64)
+
+    def new_search(self) -> None:
+        """
+        Forget the killers and age the history of the previous search
+        :return:
+        """
+        for i in range(len(self.killers)):
+            self.killers[i] = 0
+        history = self.history
+        for i in range(len(history)):
+            history[i] >>= 1
+
+    def order(
+        self, game: Game, moves: array, count: int, hash_move: int, ply: int,
+        tactical_only: bool = False,
+    ) -> int:
+        """
+        Sort moves in place, best candidates first
+        :param game: Game: position the moves were generated for
+        :param moves: array("H") of encoded moves
+        :param count: int: number of moves in the list
+        :param hash_move: int: transposition table move, 0 if none
+        :param ply: int: distance to the root, selects the killers
+        :param tactical_only: bool: drop quiet moves and losing captures (quiescence search)
+        :return: int: number of moves left in the list
+        """
+        board = game.board
+        history = self.history
+        history_base = game.turn << 12
+        killer_1 = self.killers[2 * ply]
+        killer_2 = self.killers[2 * ply + 1]
+        tactical = constants.CAPTURE_FLAG | constants.PROMOTION_FLAG
+        keys = []
+        for i in range(count):
+            move = moves[i]
+            flag = move >> 12
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif flag & tactical:
+                score = CAPTURE_SCORE
+                if flag & constants.CAPTURE_FLAG:
+                    victim = board[(move >> 6) & 0x3F]
+                    attacker = board[move & 0x3F] % 6
+                    # En passant lands on an empty square, the victim is a pawn
+                    victim_weight = VICTIM_WEIGHTS[victim % 6] if victim < 12 else 1
+                    if ATTACKER_WEIGHTS[attacker] > victim_weight:
+                        exchange = see(game, move)
+                        if exchange < 0:
+                            if tactical_only:
+                                continue
+                            score = LOSING_CAPTURE_SCORE + exchange
+                            keys.append(score << 16 | move)
+                            continue
+                    score += victim_weight * 16 - attacker
+                if flag & constants.PROMOTION_FLAG:
+                    score += PROMOTION_WEIGHTS[flag & 3] * 16
+            elif tactical_only:
+                continue
+            elif move == killer_1:
+                score = KILLER_SCORE + 1
+            elif move == killer_2:
+                score = KILLER_SCORE
+            else:
+                score = history[history_base | (move & 0xFFF)]
+            keys.append(score << 16 | move)
+
+        keys.sort(reverse=True)
+        for i, key in enumerate(keys):
+            moves[i] = key & 0xFFFF
+        return len(keys)
+
+    def update_cutoff(self, game: Game, move: int, ply: int, depth: int) -> None:
+        """
+        Record a quiet move that caused a beta cutoff
+        :param game: Game: position the move was played from
+        :param move: int: encoded move
+        :param ply: int: distance to the root
+        :param depth: int: remaining depth, deeper cutoffs weigh more
+        :return:
+        """
+        if move >> 12 & (constants.CAPTURE_FLAG | constants.PROMOTION_FLAG):
+            return
+        killers = self.killers
+        if killers[2 * ply] != move:
+            killers[2 * ply + 1] = killers[2 * ply]
+            killers[2 * ply] = move
+        history = self.history
+        index = game.turn << 12 | (move & 0xFFF)
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            for i in range(len(history)):
+                history[i] >>= 1
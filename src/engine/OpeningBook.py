@@ -0,0 +1,125 @@
+import mmap
+import random
+import struct
+
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.utils import constants
+from src.utils.polyglot import polyglot_key
+
+# Big-endian key, move, weight, learn
+ENTRY_STRUCT = struct.Struct(">QHHI")
+ENTRY_SIZE = ENTRY_STRUCT.size  # 16 bytes
+_KEY_STRUCT = struct.Struct(">Q")
+
+# Polyglot promotion piece (1 knight .. 4 queen) to the low bits of the promotion flags
+_PROMOTIONS = {1: 0, 2: 1, 3: 2, 4: 3}
+# Polyglot castling moves are written king takes own rook
+_CASTLING_TARGETS = {(4, 7): 6, (4, 0): 2, (60, 63): 62, (60, 56): 58}
+
+
+class OpeningBook:
+    """
+    Polyglot opening book (.bin) read through mmap. The entries are sorted
+    by Polyglot key, so a probe is a binary search over the mapping: nothing
+    is loaded in memory and every process using the same book shares its
+    pages in the OS page cache.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: str: path of the Polyglot book
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if size % ENTRY_SIZE:
+                raise ValueError(f"{path}: not a Polyglot book")
+            self.entry_count = size // ENTRY_SIZE
+            # An empty file cannot be mapped
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def _first_entry(self, key: int) -> int:
+        """
+        Index of the first entry whose key is not below key
+        """
+        data = self._mmap
+        low, high = 0, self.entry_count
+        unpack = _KEY_STRUCT.unpack_from
+        while low < high:
+            middle = (low + high) >> 1
+            if unpack(data, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, key: int) -> list:
+        """
+        Raw entries of a Polyglot key
+        :param key: int: Polyglot key (see utils.polyglot.polyglot_key)
+        :return: list of (Polyglot move, weight, learn)
+        """
+        data = self._mmap
+        found = []
+        for index in range(self._first_entry(key), self.entry_count):
+            entry_key, move, weight, learn = ENTRY_STRUCT.unpack_from(data, index * ENTRY_SIZE)
+            if entry_key != key:
+                break
+            found.append((move, weight, learn))
+        return found
+
+    def probe(self, game: Game) -> list:
+        """
+        Book moves of a position, decoded against its legal moves
+        :param game: Game: position to look up
+        :return: list of (encoded move, weight), heaviest first, empty when out of book
+        """
+        entries = self.entries(polyglot_key(game))
+        if not entries:
+            return []
+        generator = MoveGenerator(game)
+        moves = generator.moves
+        count = generator.generate_legal_moves(moves)
+        legal = {}
+        for i in range(count):
+            move = moves[i]
+            flag = move >> 12
+            promotion = flag & 3 if flag & constants.PROMOTION_FLAG else None
+            legal[(move & 0xFFF, promotion)] = move
+
+        candidates = []
+        for book_move, weight, _ in entries:
+            to_square = book_move & 0x3F
+            from_square = (book_move >> 6) & 0x3F
+            promotion = _PROMOTIONS.get((book_move >> 12) & 7)
+            if game.board[from_square] % 6 == constants.KING:
+                to_square = _CASTLING_TARGETS.get((from_square, to_square), to_square)
+            move = legal.get((from_square | to_square << 6, promotion))
+            if move is not None:
+                candidates.append((move, weight))
+        candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+        return candidates
+
+    def choose(self, game: Game, rng: random.Random = None) -> int:
+        """
+        Pick a book move at random, in proportion to the weights
+        :param game: Game: position to look up
+        :param rng: random.Random: random generator, defaults to the random module
+        :return: int: encoded move, 0 when out of book
+        """
+        candidates = [candidate for candidate in self.probe(game) if candidate[1]]
+        if not candidates:
+            return 0
+        moves, weights = zip(*candidates)
+        return (rng or random).choices(moves, weights)[0]
+
+    def close(self) -> None:
+        if self.entry_count:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,168 @@
+import multiprocessing
+import pickle
+import queue
+from multiprocessing.shared_memory import SharedMemory
+
+from src.engine.Search import Search
+from src.engine.TranspositionTable import TranspositionTable
+from src.game.Game import Game
+from src.tablebase.Tablebase import Tablebase
+
+# Seconds between two checks that the workers are still alive
+RESULT_POLL_INTERVAL = 0.5
+
+
+def _worker(index: int, shm_name: str, tasks, results, stop_event, tablebase_directory: str) -> None:
+    """
+    Search process: attach the shared transposition table once, then search
+    every position received until None is sent. A failed search answers
+    (index, exception) so the caller is never left waiting
+    """
+    shm = SharedMemory(name=shm_name)
+    tt = TranspositionTable(buffer=shm.buf)
+    try:
+        tablebase = Tablebase(tablebase_directory) if tablebase_directory else None
+        setup_error = None
+    except Exception as error:
+        tablebase, setup_error = None, error
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            game, depth, movetime, nodes = task
+            try:
+                if setup_error is not None:
+                    raise setup_error
+                search = Search(game, tt, stop_event=stop_event, tablebase=tablebase)
+                # Helpers start one ply deeper every other worker so they do not
+                # all search the same tree at the same time
+                move, score = search.search(
+                    depth=depth, movetime=movetime, nodes=nodes, start_depth=1 + index % 2
+                )
+            except Exception as error:
+                try:
+                    pickle.dumps(error)
+                except Exception:
+                    error = RuntimeError(repr(error))
+                results.put((index, error))
+                continue
+            results.put((index, move, score, search.completed_depth, search.nodes))
+    finally:
+        tt.table.release()
+        shm.close()
+
+
+class ParallelSearch:
+    """
+    Lazy SMP: N worker processes search the same root position at once and
+    share one transposition table in multiprocessing.shared_memory, so the
+    entries one worker writes cut the trees of the others.
+    Workers stay alive between searches and the table is kept warm.
+    The first worker to finish stops the others and the deepest completed
+    result is returned (the main worker wins ties).
+    """
+
+    def __init__(self, threads: int, hash_mb: int = 16, tablebase_directory: str = None):
+        """
+        :param threads: int: number of worker processes
+        :param hash_mb: int: size of the shared transposition table in MB
+        :param tablebase_directory: str: endgame tables directory, opened by every worker
+        """
+        self.threads = max(1, threads)
+        self._shm = SharedMemory(create=True, size=TranspositionTable.byte_size(hash_mb))
+        # Spawned rather than forked: forking copies the locks held by the
+        # other threads of the caller (a UCI stdin reader for instance)
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._results = context.Queue()
+        self._tasks = []
+        self._workers = []
+        for index in range(self.threads):
+            tasks = context.Queue()
+            worker = context.Process(
+                target=_worker,
+                args=(index, self._shm.name, tasks, self._results, self._stop_event,
+                      tablebase_directory),
+                daemon=True,
+            )
+            worker.start()
+            self._tasks.append(tasks)
+            self._workers.append(worker)
+        self.nodes = 0
+        self.completed_depth = 0
+
+    def stop(self) -> None:
+        """
+        Ask the running search to return as soon as possible
+        :return:
+        """
+        self._stop_event.set()
+
+    def search(self, game: Game, depth: int = 64, movetime: float = None, nodes: int = None) -> tuple:
+        """
+        Search a position on every worker. Once all of them answered, the
+        exception of a failed search is raised again here, RuntimeError if a
+        worker process died
+        :param game: Game: position to search, sent to the workers (not modified)
+        :param depth: int: maximum depth in plies
+        :param movetime: float: hard time limit in seconds
+        :param nodes: int: total node budget, split between the workers
+        :return: tuple: (best move, score)
+        """
+        self._stop_event.clear()
+        worker_nodes = None if nodes is None else max(1, nodes // self.threads)
+        for tasks in self._tasks:
+            tasks.put((game, depth, movetime, worker_nodes))
+
+        # Wait for every worker, the first answer stops the others. A worker
+        # process that died is noticed when the queue stays empty
+        pending = set(range(self.threads))
+        results = []
+        errors = []
+        while pending:
+            try:
+                answer = self._results.get(timeout=RESULT_POLL_INTERVAL)
+            except queue.Empty:
+                for index in sorted(pending):
+                    worker = self._workers[index]
+                    if not worker.is_alive():
+                        pending.discard(index)
+                        errors.append(RuntimeError(f"search worker {index} exited with code {worker.exitcode}"))
+                        self._stop_event.set()
+                continue
+            if answer[0] not in pending:
+                continue
+            pending.discard(answer[0])
+            self._stop_event.set()
+            if len(answer) == 2:
+                errors.append(answer[1])
+            else:
+                results.append(answer)
+        if errors:
+            raise errors[0]
+
+        self.nodes = sum(result[4] for result in results)
+        _, move, score, completed_depth, _ = max(
+            results, key=lambda result: (result[3], result[0] == 0)
+        )
+        self.completed_depth = completed_depth
+        return move, score
+
+    def close(self) -> None:
+        """
+        Stop the workers and free the shared table
+        :return:
+        """
+        for tasks in self._tasks:
+            tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,320 @@
+import time
+
+from src.engine.evaluation import PawnTable, evaluate
+from src.engine.MoveOrdering import MoveOrderer
+from src.engine.TranspositionTable import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.tablebase.Tablebase import Tablebase
+
+INFINITY = 32000
+MATE_SCORE = 31000
+# Scores beyond this are mates, stored relative to the node in the TT
+MATE_BOUND = MATE_SCORE - 1000
+MAX_PLY = 128
+MAX_DEPTH = 64
+
+ASPIRATION_WINDOW = 50
+# The time and stop flag are checked every CHECK_INTERVAL + 1 nodes, the
+# node budget at every node
+CHECK_INTERVAL = 255
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside the tree when the deadline, node budget or stop request is hit
+    """
+
+
+class Search:
+    """
+    Negamax alpha-beta search with iterative deepening, aspiration windows,
+    quiescence search on captures and a transposition table.
+    The search is bounded by a depth, a hard wall-clock deadline and/or a
+    node budget; when a limit is hit the best move of the last completed
+    iteration is returned.
+    """
+
+    def __init__(
+        self, game: Game, tt: TranspositionTable = None, stop_event=None, tablebase: Tablebase = None,
+    ):
+        """
+        :param game: Game: position to search, played on in place
+        :param tt: TranspositionTable: table to use, a private 16 MB one by default
+        :param stop_event: optional event (threading / multiprocessing) stopping the search once set
+        :param tablebase: Tablebase: endgame tables probed below the root, none by default
+        """
+        self.game = game
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.generator = MoveGenerator(game)
+        self.move_lists = [MoveGenerator.new_move_list() for _ in range(MAX_PLY + 1)]
+        self.orderer = MoveOrderer(MAX_PLY)
+        self.pawn_table = PawnTable()
+        self.nodes = 0
+        self.completed_depth = 0
+        self.stop_requested = False
+        self.stop_event = stop_event
+        self.tablebase = tablebase
+        self.tablebase_hits = 0
+        self._deadline = None
+        self._node_limit = None
+        self._root_best_move = 0
+
+    def stop(self) -> None:
+        """
+        Ask a running search to return as soon as possible (thread safe)
+        :return:
+        """
+        self.stop_requested = True
+
+    def search(
+        self, depth: int = MAX_DEPTH, movetime: float = None, nodes: int = None, info=None,
+        start_depth: int = 1,
+    ) -> tuple:
+        """
+        Search the current position
+        :param depth: int: maximum depth in plies
+        :param movetime: float: hard time limit in seconds
+        :param nodes: int: node budget
+        :param info: callable(depth, score, nodes, elapsed, pv) called after each iteration
+        :param start_depth: int: first iteration depth (parallel helpers skip ahead)
+        :return: tuple: (best move, score), best move is 0 when there is no legal move
+        """
+        game = self.game
+        start = time.perf_counter()
+        self._deadline = start + movetime if movetime is not None else None
+        self._node_limit = nodes
+        self.nodes = 0
+        self.tablebase_hits = 0
+        self.completed_depth = 0
+        self.stop_requested = False
+        self.tt.new_search()
+        self.orderer.new_search()
+        root_ply = len(game.undo_stack)
+
+        # Fallback if not even the first iteration completes
+        root_moves = self.move_lists[MAX_PLY]
+        count = self.generator.generate_legal_moves(root_moves)
+        if not count:
+            return 0, -MATE_SCORE if self.generator.checkers else 0
+        best_move, best_score = root_moves[0], 0
+
+        for current_depth in range(min(start_depth, depth), max(depth, 1) + 1):
+            try:
+                score = self._aspiration(current_depth, best_score)
+            except SearchStopped:
+                # Take back the moves of the interrupted branch
+                while len(game.undo_stack) > root_ply:
+                    game.unmake_move()
+                break
+            best_move, best_score = self._root_best_move, score
+            self.completed_depth = current_depth
+            elapsed = time.perf_counter() - start
+            if info is not None:
+                info(current_depth, score, self.nodes, elapsed, self.principal_variation(current_depth))
+            if abs(score) >= MATE_BOUND and MATE_SCORE - abs(score) <= current_depth:
+                break  # Shortest mate found
+            # An iteration takes longer than all the previous ones together,
+            # do not start one that cannot complete
+            if self._deadline is not None and time.perf_counter() + elapsed > self._deadline:
+                break
+
+        return best_move, best_score
+
+    def principal_variation(self, depth: int) -> list:
+        """
+        Follow the transposition table best moves from the current position
+        :param depth: int: maximum length of the variation
+        :return: list: encoded moves
+        """
+        game = self.game
+        moves = self.move_lists[MAX_PLY]
+        variation = []
+        for _ in range(depth):
+            entry = self.tt.probe(game.zobrist_key)
+            if entry is None or not entry[0]:
+                break
+            count = self.generator.generate_legal_moves(moves)
+            if entry[0] not in moves[:count]:
+                break
+            variation.append(entry[0])
+            game.make_move(entry[0])
+            if game.is_repetition():
+                break
+        for _ in variation:
+            game.unmake_move()
+        return variation
+
+    def _aspiration(self, depth: int, previous_score: int) -> int:
+        """
+        Search the root in a narrow window around the previous score,
+        widening it on fail low / fail high
+        :return: int: exact score of the root
+        """
+        if depth < 4 or abs(previous_score) >= MATE_BOUND:
+            return self._negamax(depth, -INFINITY, INFINITY, 0)
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous_score - delta, previous_score + delta
+        while True:
+            score = self._negamax(depth, alpha, beta, 0)
+            if score <= alpha:
+                alpha = max(score - delta, -INFINITY)
+            elif score >= beta:
+                beta = min(score + delta, INFINITY)
+            else:
+                return score
+            delta *= 2
+
+    def _check_limits(self) -> None:
+        if (
+            self.stop_requested
+            or (self.stop_event is not None and self.stop_event.is_set())
+            or (self._node_limit is not None and self.nodes >= self._node_limit)
+            or (self._deadline is not None and time.perf_counter() >= self._deadline)
+        ):
+            raise SearchStopped
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Fail-soft alpha-beta
+        :return: int: score from the side to move point of view
+        """
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+
+        self.nodes += 1
+        if not self.nodes & CHECK_INTERVAL:
+            self._check_limits()
+        elif self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchStopped
+
+        game = self.game
+        if ply:
+            if game.halfmove_clock >= 100 or game.is_repetition():
+                return 0
+            if ply >= MAX_PLY - 1:
+                return evaluate(game, self.pawn_table)
+            tablebase = self.tablebase
+            if (
+                tablebase is not None
+                and (game.white_pieces | game.black_pieces).bit_count() <= tablebase.max_pieces
+            ):
+                result = tablebase.probe(game)
+                if result is not None:
+                    self.tablebase_hits += 1
+                    outcome, distance = result
+                    if outcome > 0:
+                        return MATE_SCORE - ply - distance
+                    if outcome < 0:
+                        return -MATE_SCORE + ply + distance
+                    return 0
+
+        key = game.zobrist_key
+        tt = self.tt
+        entry = tt.probe(key)
+        tt_move = 0
+        if entry is not None:
+            tt_move, tt_depth, tt_score, tt_bound = entry
+            if ply and tt_depth >= depth:
+                if tt_score >= MATE_BOUND:
+                    tt_score -= ply
+                elif tt_score <= -MATE_BOUND:
+                    tt_score += ply
+                if (
+                    tt_bound == EXACT
+                    or (tt_bound == LOWER_BOUND and tt_score >= beta)
+                    or (tt_bound == UPPER_BOUND and tt_score <= alpha)
+                ):
+                    return tt_score
+
+        moves = self.move_lists[ply]
+        count = self.generator.generate_legal_moves(moves)
+        if not count:
+            return -MATE_SCORE + ply if self.generator.checkers else 0
+        if self.generator.checkers:
+            depth += 1  # Check extension
+
+        self.orderer.order(game, moves, count, tt_move, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        for i in range(count):
+            move = moves[i]
+            game.make_move(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        self.orderer.update_cutoff(game, move, ply, depth)
+                        break
+
+        if ply == 0:
+            self._root_best_move = best_move
+        if best_score >= beta:
+            bound = LOWER_BOUND
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+        stored_score = best_score
+        if stored_score >= MATE_BOUND:
+            stored_score += ply
+        elif stored_score <= -MATE_BOUND:
+            stored_score -= ply
+        tt.store(key, depth, stored_score, bound, best_move)
+        return best_score
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        Search captures and promotions only until the position is quiet,
+        captures losing material by static exchange evaluation are pruned
+        (see MoveOrderer.order), every evasion is searched when in check
+        :return: int: score from the side to move point of view
+        """
+        self.nodes += 1
+        if not self.nodes & CHECK_INTERVAL:
+            self._check_limits()
+        elif self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchStopped
+
+        game = self.game
+        moves = self.move_lists[ply]
+        count = self.generator.generate_legal_moves(moves)
+        in_check = self.generator.checkers
+        if not count:
+            return -MATE_SCORE + ply if in_check else 0
+        if ply >= MAX_PLY - 1:
+            return evaluate(game, self.pawn_table)
+
+        if in_check:
+            best_score = -INFINITY
+        else:
+            best_score = evaluate(game, self.pawn_table)  # Stand pat
+            if best_score >= beta:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+
+        count = self.orderer.order(game, moves, count, 0, ply, tactical_only=not in_check)
+        for i in range(count):
+            move = moves[i]
+            game.make_move(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            game.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        break
+        return best_score
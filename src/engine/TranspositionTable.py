@@ -0,0 +1,145 @@
+from array import array
+
+# Bound of a stored score, 0 marks an empty slot
+EXACT = 1
+LOWER_BOUND = 2  # Fail high, score is at least the stored one
+UPPER_BOUND = 3  # Fail low, score is at most the stored one
+
+ENTRY_SIZE = 16  # Bytes per entry: 64 bits key + 64 bits packed data
+MAX_GENERATION = 0x3F
+SCORE_OFFSET = 0x8000
+BOUND_MASK = 0x3 << 24  # Bound bits of the packed word, zero for empty slots
+
+
+class TranspositionTable:
+    """
+    Fixed size hash table of search results keyed by Zobrist key.
+    Entries are two uint64 in one preallocated array("Q"): the full key and
+    a packed word (move 16 bits | depth 8 | bound 2 | generation 6 | score 16).
+    A slot is overwritten by a deeper or equal search, or when it was written
+    during an older search (see new_search), so memory never grows.
+
+    The table can live in an external buffer (e.g. shared memory) written by
+    several processes without locks: the key is stored XORed with the data
+    word, so an entry torn by concurrent writes no longer matches its key and
+    reads as a miss.
+    """
+
+    def __init__(self, size_mb: int = 16, buffer=None):
+        """
+        :param size_mb: int: memory budget in MB, rounded down to a power of two entries
+        :param buffer: writable buffer of byte_size(size_mb) bytes to use as storage
+        """
+        if buffer is None:
+            entries = self.entry_count(size_mb)
+            self.table = array("Q", [0]) * (2 * entries)
+        else:
+            self.table = memoryview(buffer).cast("Q")
+            entries = len(self.table) // 2
+        self.size = entries
+        self.mask = entries - 1
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    @staticmethod
+    def entry_count(size_mb: int) -> int:
+        """
+        Number of entries fitting in a memory budget
+        :param size_mb: int: memory budget in MB
+        :return: int: largest power of two entries within the budget
+        """
+        entries = max(1, size_mb * 1024 * 1024 // ENTRY_SIZE)
+        return 1 << (entries.bit_length() - 1)
+
+    @classmethod
+    def byte_size(cls, size_mb: int) -> int:
+        """
+        Size of the storage buffer for a memory budget
+        :param size_mb: int: memory budget in MB
+        :return: int: size in bytes
+        """
+        return cls.entry_count(size_mb) * ENTRY_SIZE
+
+    def clear(self) -> None:
+        """
+        Empty the table and reset the counters
+        :return:
+        """
+        self.table[:] = array("Q", [0]) * (2 * self.size)
+        self.generation = 0
+        self.hits = self.misses = self.overwrites = 0
+
+    def new_search(self) -> None:
+        """
+        Start a new search: entries of older searches become replaceable
+        :return:
+        """
+        self.generation = (self.generation + 1) & MAX_GENERATION
+
+    def probe(self, key: int):
+        """
+        Look up a position
+        :param key: int: Zobrist key of the position
+        :return: tuple: (move, depth, score, bound) or None when not stored
+        """
+        index = (key & self.mask) << 1
+        table = self.table
+        data = table[index + 1]
+        if table[index] ^ data != key or not data & BOUND_MASK:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return (
+            data & 0xFFFF,
+            (data >> 16) & 0xFF,
+            (data >> 32) - SCORE_OFFSET,
+            (data >> 24) & 0x3,
+        )
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int) -> None:
+        """
+        Store a search result, unless the slot holds a deeper result of the
+        current search for another position
+        :param key: int: Zobrist key of the position
+        :param depth: int: remaining depth of the search, 0 to 255
+        :param score: int: score, within +/- 32767
+        :param bound: int: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: int: best move found, 0 if none
+        :return:
+        """
+        index = (key & self.mask) << 1
+        table = self.table
+        data = table[index + 1]
+        if data & BOUND_MASK:  # Slot in use
+            if table[index] ^ data == key:
+                if not move:
+                    move = data & 0xFFFF  # Keep the known best move
+            elif (data >> 26) & MAX_GENERATION == self.generation and (data >> 16) & 0xFF > depth:
+                return
+            else:
+                self.overwrites += 1
+        data = (
+            move
+            | depth << 16
+            | bound << 24
+            | self.generation << 26
+            | (score + SCORE_OFFSET) << 32
+        )
+        table[index] = key ^ data
+        table[index + 1] = data
+
+    def hashfull(self) -> int:
+        """
+        Estimate the table usage from its first 1000 slots
+        :return: int: per mille of slots written during the current search
+        """
+        table = self.table
+        sample = min(1000, self.size)
+        used = 0
+        for index in range(0, 2 * sample, 2):
+            data = table[index + 1]
+            if data & BOUND_MASK and (data >> 26) & MAX_GENERATION == self.generation:
+                used += 1
+        return used * 1000 // sample
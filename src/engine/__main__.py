@@ -0,0 +1,76 @@
+"""
+Search a position from the command line.
+
+    python -m src.engine --fen FEN [--depth N] [--movetime SECONDS] [--nodes N]
+                         [--threads N] [--hash MB] [--book BOOK.bin]
+                         [--tablebase DIR]
+"""
+import argparse
+import sys
+import time
+
+from src import config
+from src.engine.OpeningBook import OpeningBook
+from src.engine.ParallelSearch import ParallelSearch
+from src.engine.Search import Search
+from src.engine.TranspositionTable import TranspositionTable
+from src.game.Game import Game
+from src.tablebase.Tablebase import Tablebase
+from src.utils.utils import move_to_uci
+
+
+def _print_info(depth: int, score: int, nodes: int, elapsed: float, pv: list) -> None:
+    nps = int(nodes / elapsed) if elapsed else 0
+    print(
+        f"depth {depth} score {score} nodes {nodes} nps {nps} time {elapsed:.2f}s "
+        f"pv {' '.join(move_to_uci(move) for move in pv)}"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.engine", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fen", default=config.BASE_FEN)
+    parser.add_argument("--depth", type=int, default=64)
+    parser.add_argument("--movetime", type=float, help="time limit in seconds")
+    parser.add_argument("--nodes", type=int, help="node budget")
+    parser.add_argument("--threads", type=int, default=1, help="worker processes (Lazy SMP)")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size in MB")
+    parser.add_argument("--book", help="Polyglot opening book, played before searching")
+    parser.add_argument("--tablebase", metavar="DIR", help="endgame tables (see python -m src.tablebase)")
+    args = parser.parse_args(argv)
+    if args.movetime is None and args.nodes is None and args.depth == 64:
+        args.movetime = 5.0
+
+    game = Game(fen=args.fen)
+    if args.book:
+        with OpeningBook(args.book) as book:
+            move = book.choose(game)
+        if move:
+            print(f"bestmove {move_to_uci(move)}")
+            return 0
+
+    start = time.perf_counter()
+    if args.threads > 1:
+        with ParallelSearch(args.threads, args.hash, args.tablebase) as searcher:
+            move, score = searcher.search(
+                game, depth=args.depth, movetime=args.movetime, nodes=args.nodes
+            )
+            depth, nodes = searcher.completed_depth, searcher.nodes
+    else:
+        tablebase = Tablebase(args.tablebase) if args.tablebase else None
+        searcher = Search(game, TranspositionTable(args.hash), tablebase=tablebase)
+        move, score = searcher.search(
+            depth=args.depth, movetime=args.movetime, nodes=args.nodes, info=_print_info
+        )
+        depth, nodes = searcher.completed_depth, searcher.nodes
+    elapsed = time.perf_counter() - start
+
+    nps = int(nodes / elapsed) if elapsed else 0
+    print(f"depth {depth} score {score} nodes {nodes} nps {nps} time {elapsed:.2f}s")
+    print(f"bestmove {move_to_uci(move) if move else '0000'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
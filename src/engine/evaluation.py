@@ -0,0 +1,191 @@
+from array import array
+
+from src.game.Game import BLACK_PIECES, WHITE_PIECES, Game
+from src.utils import constants
+from src.utils.attacks import KNIGHT_ATTACKS
+from src.utils.magic import bishop_attacks, rook_attacks
+from src.utils.psqt import PIECE_VALUES, TOTAL_PHASE, eg_score, make_score, mg_score
+
+PAWN_VALUE = PIECE_VALUES[constants.PAWN][0]
+KNIGHT_VALUE = PIECE_VALUES[constants.KNIGHT][0]
+BISHOP_VALUE = PIECE_VALUES[constants.BISHOP][0]
+ROOK_VALUE = PIECE_VALUES[constants.ROOK][0]
+QUEEN_VALUE = PIECE_VALUES[constants.QUEEN][0]
+
+# Packed (middlegame, endgame) weights, see utils.psqt
+DOUBLED_PAWN = make_score(-10, -20)
+ISOLATED_PAWN = make_score(-10, -15)
+# Passed pawn bonus by rank, from the pawn's side
+PASSED_PAWN = tuple(
+    make_score(mg, eg) for mg, eg in
+    ((0, 0), (5, 10), (10, 15), (15, 25), (25, 45), (40, 75), (60, 120), (0, 0))
+)
+# Mobility bonus per reachable square, by piece type
+KNIGHT_MOBILITY = make_score(4, 4)
+BISHOP_MOBILITY = make_score(5, 5)
+ROOK_MOBILITY = make_score(2, 4)
+QUEEN_MOBILITY = make_score(1, 2)
+
+FILE_MASKS = tuple(0x0101010101010101 << file for file in range(8))
+ADJACENT_FILE_MASKS = tuple(
+    (FILE_MASKS[file - 1] if file > 0 else 0) | (FILE_MASKS[file + 1] if file < 7 else 0)
+    for file in range(8)
+)
+
+
+def _passed_mask(color: int, square: int) -> bin:
+    """
+    Squares in front of a pawn, on its file and the adjacent ones, that
+    must be free of enemy pawns for it to be passed
+    """
+    files = FILE_MASKS[square & 7] | ADJACENT_FILE_MASKS[square & 7]
+    rank = square >> 3
+    if color == 0:
+        return files & (constants.BOARD_MASK << (8 * (rank + 1))) & constants.BOARD_MASK
+    return files & ((1 << (8 * rank)) - 1)
+
+
+# Indexed by color then square: PASSED_MASKS[color][square]
+PASSED_MASKS = tuple(tuple(_passed_mask(color, square) for square in range(64)) for color in (0, 1))
+
+
+def pawn_structure(white_pawns: bin, black_pawns: bin) -> int:
+    """
+    Score the doubled, isolated and passed pawns of both sides
+    :param white_pawns: bin: bitboard of the white pawns
+    :param black_pawns: bin: bitboard of the black pawns
+    :return: int: packed score from white's point of view
+    """
+    score = 0
+    for color, pawns, enemy_pawns, sign in (
+        (0, white_pawns, black_pawns, 1), (1, black_pawns, white_pawns, -1),
+    ):
+        side_score = 0
+        for file in range(8):
+            count = (pawns & FILE_MASKS[file]).bit_count()
+            if count:
+                if count > 1:
+                    side_score += DOUBLED_PAWN * (count - 1)
+                if not pawns & ADJACENT_FILE_MASKS[file]:
+                    side_score += ISOLATED_PAWN * count
+        passed_masks = PASSED_MASKS[color]
+        remaining = pawns
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            square = bit.bit_length() - 1
+            if not passed_masks[square] & enemy_pawns:
+                side_score += PASSED_PAWN[square >> 3 if color == 0 else 7 - (square >> 3)]
+        score += sign * side_score
+    return score
+
+
+class PawnTable:
+    """
+    Cache of pawn structure scores indexed by the pawn-only Zobrist key
+    (Game.pawn_key). Pawn structures change rarely along a search, so most
+    evaluations find their pawn score here.
+    """
+
+    def __init__(self, size: int = 1 << 14):
+        """
+        :param size: int: number of entries, rounded down to a power of two
+        """
+        size = 1 << (max(size, 1).bit_length() - 1)
+        self.mask = size - 1
+        self.keys = array("Q", bytes(8 * size))
+        # Empty entries have key 0 and score 0, the (correct) pawnless entry
+        self.scores = array("q", bytes(8 * size))
+        self.hits = 0
+        self.probes = 0
+
+    def score(self, game: Game) -> int:
+        """
+        Pawn structure score of a position, computed on a miss
+        :param game: Game: position to score
+        :return: int: packed score from white's point of view
+        """
+        key = game.pawn_key
+        index = key & self.mask
+        self.probes += 1
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.scores[index]
+        score = pawn_structure(game.white_pawns, game.black_pawns)
+        self.keys[index] = key
+        self.scores[index] = score
+        return score
+
+
+def mobility(game: Game) -> int:
+    """
+    Mobility of the knights, bishops, rooks and queens of both sides: the
+    squares each piece attacks, looked up per square in the knight table
+    and the magic slider tables, that are not occupied by its own side nor
+    attacked by enemy pawns. The lookups are done per piece on purpose:
+    get_possible_moves unions a whole piece type, counting once the squares
+    two pieces share, and is slower
+    :param game: Game: position to score
+    :return: int: packed score from white's point of view
+    """
+    bitboards = game.bitboards
+    occupied = bitboards[WHITE_PIECES] | bitboards[BLACK_PIECES]
+    white_pawns = bitboards[constants.PAWN]
+    black_pawns = bitboards[6 + constants.PAWN]
+    white_pawn_attacks = (
+        (white_pawns << 7) & constants.H_FILE_MASK | (white_pawns << 9) & constants.A_FILE_MASK
+    )
+    black_pawn_attacks = (
+        (black_pawns >> 9) & constants.H_FILE_MASK | (black_pawns >> 7) & constants.A_FILE_MASK
+    )
+    score = 0
+    for sign, area, base in (
+        (1, ~(bitboards[WHITE_PIECES] | black_pawn_attacks), 0),
+        (-1, ~(bitboards[BLACK_PIECES] | white_pawn_attacks), 6),
+    ):
+        knights = bitboards[base + constants.KNIGHT]
+        bishops = bitboards[base + constants.BISHOP]
+        rooks = bitboards[base + constants.ROOK]
+        queens = bitboards[base + constants.QUEEN]
+        side_score = 0
+        while knights:
+            bit = knights & -knights
+            knights ^= bit
+            side_score += KNIGHT_MOBILITY * (KNIGHT_ATTACKS[bit.bit_length() - 1] & area).bit_count()
+        while bishops:
+            bit = bishops & -bishops
+            bishops ^= bit
+            side_score += BISHOP_MOBILITY * (bishop_attacks(bit.bit_length() - 1, occupied) & area).bit_count()
+        while rooks:
+            bit = rooks & -rooks
+            rooks ^= bit
+            side_score += ROOK_MOBILITY * (rook_attacks(bit.bit_length() - 1, occupied) & area).bit_count()
+        while queens:
+            bit = queens & -queens
+            queens ^= bit
+            square = bit.bit_length() - 1
+            side_score += QUEEN_MOBILITY * (
+                (rook_attacks(square, occupied) | bishop_attacks(square, occupied)) & area
+            ).bit_count()
+        score += sign * side_score
+    return score
+
+
+def evaluate(game: Game, pawn_table: PawnTable = None) -> int:
+    """
+    Static evaluation of a position: material and piece-square tables
+    (kept up to date by make_move), pawn structure and mobility, blended
+    between middlegame and endgame values by the game phase
+    :param game: Game: position to evaluate
+    :param pawn_table: PawnTable: pawn structure cache, the structure is scored from scratch without one
+    :return: int: score in centipawns from the side to move point of view
+    """
+    if pawn_table is not None:
+        pawns = pawn_table.score(game)
+    else:
+        pawns = pawn_structure(game.white_pawns, game.black_pawns)
+    score = game.psq_score + pawns + mobility(game)
+    phase = min(game.phase, TOTAL_PHASE)
+    score = mg_score(score) * phase + eg_score(score) * (TOTAL_PHASE - phase)
+    # Negated before the division so that mirrored positions score the same
+    return (-score if game.turn else score) // TOTAL_PHASE
@@ -0,0 +1,121 @@
+"""
+Static exchange evaluation: the material outcome of the capture sequence
+started by a move on its target square, both sides recapturing with their
+least valuable attacker and free to stop when continuing loses material.
+
+No move is played: the attackers of the square are found once with the
+attack tables and the magic slider lookups, and every time a bishop, rook,
+queen or pawn leaves the occupancy the sliders are looked up again to
+reveal the x-ray attackers standing behind it. Pins are ignored.
+"""
+from src.game.Game import BLACK_PIECES, WHITE_PIECES, Game
+from src.utils import constants
+from src.utils.attacks import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS
+from src.utils.magic import bishop_attacks, rook_attacks
+from src.utils.psqt import PIECE_VALUES
+
+# Exchange value by piece type, the king outweighs any exchange
+SEE_VALUES = tuple(mg for mg, _ in PIECE_VALUES[:5]) + (20000,)
+
+
+def attackers_to(game: Game, square: int, occupied: bin) -> bin:
+    """
+    Pieces of both sides attacking a square, sliders seeing through the
+    squares missing from occupied
+    :param game: Game: position
+    :param square: int: target square
+    :param occupied: bin: occupancy used for the slider rays
+    :return: bin: bitboard of the attackers, both colors
+    """
+    bitboards = game.bitboards
+    diagonal = (
+        bitboards[constants.BISHOP] | bitboards[constants.QUEEN]
+        | bitboards[6 + constants.BISHOP] | bitboards[6 + constants.QUEEN]
+    )
+    straight = (
+        bitboards[constants.ROOK] | bitboards[constants.QUEEN]
+        | bitboards[6 + constants.ROOK] | bitboards[6 + constants.QUEEN]
+    )
+    return (
+        PAWN_ATTACKS[1][square] & bitboards[constants.PAWN]
+        | PAWN_ATTACKS[0][square] & bitboards[6 + constants.PAWN]
+        | KNIGHT_ATTACKS[square] & (bitboards[constants.KNIGHT] | bitboards[6 + constants.KNIGHT])
+        | KING_ATTACKS[square] & (bitboards[constants.KING] | bitboards[6 + constants.KING])
+        | bishop_attacks(square, occupied) & diagonal
+        | rook_attacks(square, occupied) & straight
+    ) & occupied
+
+
+def see(game: Game, move: int) -> int:
+    """
+    Static exchange evaluation of a move
+    :param game: Game: position the move is played from
+    :param move: int: encoded move, captures and promotions are evaluated, other moves score 0
+    :return: int: material won (negative when lost) by the side to move, in centipawns
+    """
+    flag = move >> 12
+    if not flag & (constants.CAPTURE_FLAG | constants.PROMOTION_FLAG):
+        return 0
+    from_square = move & 0x3F
+    to_square = (move >> 6) & 0x3F
+    bitboards = game.bitboards
+    board = game.board
+    occupied = bitboards[WHITE_PIECES] | bitboards[BLACK_PIECES]
+
+    if flag == constants.EN_PASSANT_CAPTURE:
+        gain = SEE_VALUES[constants.PAWN]
+        # The captured pawn leaves the board, it may have been hiding a slider
+        occupied ^= 1 << (to_square - 8 if game.turn == 0 else to_square + 8)
+    elif flag & constants.CAPTURE_FLAG:
+        gain = SEE_VALUES[board[to_square] % 6]
+    else:
+        gain = 0
+    # Value of the piece left on the target square, exposed to the recapture
+    if flag & constants.PROMOTION_FLAG:
+        on_square = SEE_VALUES[constants.KNIGHT + (flag & 3)]
+        gain += on_square - SEE_VALUES[constants.PAWN]
+    else:
+        on_square = SEE_VALUES[board[from_square] % 6]
+
+    diagonal = (
+        bitboards[constants.BISHOP] | bitboards[constants.QUEEN]
+        | bitboards[6 + constants.BISHOP] | bitboards[6 + constants.QUEEN]
+    )
+    straight = (
+        bitboards[constants.ROOK] | bitboards[constants.QUEEN]
+        | bitboards[6 + constants.ROOK] | bitboards[6 + constants.QUEEN]
+    )
+    occupied ^= 1 << from_square
+    attackers = attackers_to(game, to_square, occupied)
+    gains = [gain]
+    color = game.turn ^ 1
+    while True:
+        side_attackers = attackers & bitboards[WHITE_PIECES + color]
+        if not side_attackers:
+            break
+        # Least valuable attacker of the side to capture
+        base = 6 * color
+        for piece_type in range(6):
+            candidates = side_attackers & bitboards[base + piece_type]
+            if candidates:
+                break
+        attacker = candidates & -candidates
+        # Speculative score if the capture is made and answered
+        gains.append(on_square - gains[-1])
+        if piece_type == constants.KING and attackers & bitboards[WHITE_PIECES + (color ^ 1)]:
+            gains.pop()  # The king cannot capture a defended piece
+            break
+        on_square = SEE_VALUES[piece_type]
+        occupied ^= attacker
+        # Reveal the sliders behind the piece that just captured
+        if piece_type in (constants.PAWN, constants.BISHOP, constants.QUEEN):
+            attackers |= bishop_attacks(to_square, occupied) & diagonal
+        if piece_type in (constants.ROOK, constants.QUEEN):
+            attackers |= rook_attacks(to_square, occupied) & straight
+        attackers &= occupied
+        color ^= 1
+
+    # Each side may stand pat instead of recapturing
+    for index in range(len(gains) - 1, 0, -1):
+        gains[index - 1] = -max(-gains[index - 1], gains[index])
+    return gains[0]
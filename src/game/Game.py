@@ -1,24 +1,68 @@
+import struct
+
 from src.utils import constants
+from src.utils.attacks import BETWEEN, KNIGHT_ATTACKS, PAWN_ATTACKS, attacked_squares
+from src.utils.magic import bishop_attacks, rook_attacks
+from src.utils.psqt import PIECE_PHASES, PSQT, compute_scores
 from src.utils.utils import move_to_index
+from src.utils.zobrist import (
+    CASTLING_KEYS,
+    EN_PASSANT_KEYS,
+    PIECE_KEYS,
+    SIDE_KEY,
+    compute_key,
+    compute_pawn_key,
+)
+
+
+# Castling rights kept when a piece leaves or lands on each square
+CASTLING_RIGHTS_MASKS = [0b1111] * 64
+CASTLING_RIGHTS_MASKS[0] &= ~constants.WHITE_QUEENSIDE_CASTLE  # a1
+CASTLING_RIGHTS_MASKS[4] &= ~(constants.WHITE_KINGSIDE_CASTLE | constants.WHITE_QUEENSIDE_CASTLE)  # e1
+CASTLING_RIGHTS_MASKS[7] &= ~constants.WHITE_KINGSIDE_CASTLE  # h1
+CASTLING_RIGHTS_MASKS[56] &= ~constants.BLACK_QUEENSIDE_CASTLE  # a8
+CASTLING_RIGHTS_MASKS[60] &= ~(constants.BLACK_KINGSIDE_CASTLE | constants.BLACK_QUEENSIDE_CASTLE)  # e8
+CASTLING_RIGHTS_MASKS[63] &= ~constants.BLACK_KINGSIDE_CASTLE  # h8
+
+# Binary position (see Game.to_bytes): occupancy, piece nibbles, turn and
+# castling rights, en passant square + 1 (0 for none), halfmove clock,
+# fullmove number, 2 padding bytes
+POSITION_STRUCT = struct.Struct("<Q16sBBHH2x")
+POSITION_SIZE = POSITION_STRUCT.size  # 32 bytes
+
+# Index of the occupancy bitboard of each color in Game.bitboards, after
+# the 12 piece bitboards
+WHITE_PIECES = 12
+BLACK_PIECES = 13
+
+
+# Piece index of each FEN symbol
+PIECE_INDEXES = {symbol: index for index, symbol in enumerate(constants.PIECE_SYMBOLS)}
 
 
 class Game:
+    # Bitboard attribute of each piece index (see constants.PIECE_SYMBOLS)
+    PIECE_BITBOARDS = (
+        "white_pawns", "white_knights", "white_bishops",
+        "white_rooks", "white_queens", "white_king",
+        "black_pawns", "black_knights", "black_bishops",
+        "black_rooks", "black_queens", "black_king",
+    )
+    COLOR_BITBOARDS = ("white_pieces", "black_pieces")
+
+    # No per-instance __dict__: a position is a handful of slots, so
+    # millions of them fit in memory and copy() is a few list copies
+    __slots__ = (
+        "bitboards", "turn", "castling_rights", "en_passant_square", "halfmove_clock",
+        "fullmove_number", "board", "undo_stack", "zobrist_key", "pawn_key", "psq_score", "phase",
+        "_attack_maps", "_king_safety",
+    )
+
     def __init__(self, *, fen: str = None):
-        self.white_pawns: bin = 0
-        self.white_knights: bin = 0
-        self.white_bishops: bin = 0
-        self.white_rooks: bin = 0
-        self.white_queens: bin = 0
-        self.white_king: bin = 0
-        self.white_pieces: bin = 0
-
-        self.black_pawns: bin = 0
-        self.black_knights: bin = 0
-        self.black_bishops: bin = 0
-        self.black_rooks: bin = 0
-        self.black_queens: bin = 0
-        self.black_king: bin = 0
-        self.black_pieces: bin = 0
+        # Piece bitboards indexed by piece index (see PIECE_BITBOARDS), then
+        # the white and black occupancy (WHITE_PIECES, BLACK_PIECES). Each
+        # one is also readable and writable by name, e.g. game.white_pawns
+        self.bitboards: list = [0] * 14
 
         self.turn: bin = 0  # 0 for white, 1 for black
         self.castling_rights: bin = 0  # 4 bits for each castling right (KQkq)
@@ -28,6 +72,23 @@ class Game:
         )
         self.fullmove_number: int = 1  # Starts at 1, incremented after black's move
 
+        # Piece index of each square, constants.NO_PIECE when empty
+        self.board: list = [constants.NO_PIECE] * 64
+        # One packed undo record per move played (see make_move)
+        self.undo_stack: list = []
+        # Zobrist key of the position, updated incrementally by make_move
+        self.zobrist_key: int = 0
+        # Zobrist key of the pawns only, updated incrementally by make_move
+        self.pawn_key: int = 0
+        # Material + piece-square sum (packed, see utils.psqt) and game
+        # phase, updated incrementally by make_move / unmake_move
+        self.psq_score: int = 0
+        self.phase: int = 0
+        # Attack maps of each color and king safety of the side to move,
+        # computed on first use and dropped by make_move / unmake_move
+        self._attack_maps: list = [None, None]
+        self._king_safety: tuple = None
+
         if fen:
             self._fen_to_bitboard(fen)
 
@@ -35,10 +96,10 @@ class Game:
         if castle == "-":
             return  # No castling rights
         castle_map = {
-            constants.WHITE_KING: 1 << 3,
-            constants.WHITE_QUEEN: 1 << 2,
-            constants.BLACK_KING: 1 << 1,
-            constants.BLACK_QUEEN: 1 << 0,
+            constants.WHITE_KING: constants.WHITE_KINGSIDE_CASTLE,
+            constants.WHITE_QUEEN: constants.WHITE_QUEENSIDE_CASTLE,
+            constants.BLACK_KING: constants.BLACK_KINGSIDE_CASTLE,
+            constants.BLACK_QUEEN: constants.BLACK_QUEENSIDE_CASTLE,
         }
         for char in castle:
             self.castling_rights |= castle_map.get(char, 0)
@@ -74,49 +135,458 @@ class Game:
         self.set_turn(turn)
         self.set_castle_rights(castle_rights)
         self.set_en_passant(en_passant)
+        if len(split_fen) > 5:
+            self.halfmove_clock = int(split_fen[4])
+            self.fullmove_number = int(split_fen[5])
 
-        square_index = 63  # Start from the top-left corner (a8)
-
-        # Map FEN symbols to corresponding piece bitboards
-        piece_to_bitboard = {
-            constants.WHITE_PAWN: "white_pawns",
-            constants.WHITE_KNIGHT: "white_knights",
-            constants.WHITE_BISHOP: "white_bishops",
-            constants.WHITE_ROOK: "white_rooks",
-            constants.WHITE_QUEEN: "white_queens",
-            constants.WHITE_KING: "white_king",
-            constants.BLACK_PAWN: "black_pawns",
-            constants.BLACK_KNIGHT: "black_knights",
-            constants.BLACK_BISHOP: "black_bishops",
-            constants.BLACK_ROOK: "black_rooks",
-            constants.BLACK_QUEEN: "black_queens",
-            constants.BLACK_KING: "black_king",
-        }
+        square_index = 56  # Start from the top-left corner (a8)
+
+        bitboards = self.bitboards
 
         # Loop through each character in the board layout section of FEN
         for char in board_layout:
             if char.isdigit():  # Skip empty squares
-                square_index -= int(
+                square_index += int(
                     char
                 )  # Move to the next filled square or end of rank
-            elif char == "/":  # Move to the next rank
-                continue
+            elif char == "/":  # Move to the start of the next rank down
+                square_index -= 16
             else:  # Place a piece on the board
                 # Set the bit for the piece on the corresponding bitboard
-                bitboard_name = piece_to_bitboard.get(char)
-                if bitboard_name:
-                    setattr(
-                        self,
-                        bitboard_name,
-                        getattr(self, bitboard_name) | (1 << square_index),
-                    )
-                square_index -= 1  # Move to the next square
+                piece = PIECE_INDEXES.get(char)
+                if piece is not None:
+                    bitboards[piece] |= 1 << square_index
+                    self.board[square_index] = piece
+                square_index += 1  # Move to the next square
+
+        self.update_occupancy()
+        self.zobrist_key = compute_key(self)
+        self.pawn_key = compute_pawn_key(self)
+        self.psq_score, self.phase = compute_scores(self)
+
+    def update_occupancy(self) -> None:
+        """
+        Recompute the color occupancy bitboards from the piece bitboards,
+        after the piece bitboards were set directly; the cached attack maps
+        are dropped
+        :return:
+        """
+        self._attack_maps = [None, None]
+        self._king_safety = None
+        bitboards = self.bitboards
+        bitboards[WHITE_PIECES] = (
+            bitboards[0] | bitboards[1] | bitboards[2] | bitboards[3] | bitboards[4] | bitboards[5]
+        )
+        bitboards[BLACK_PIECES] = (
+            bitboards[6] | bitboards[7] | bitboards[8] | bitboards[9] | bitboards[10] | bitboards[11]
+        )
+
+    def copy(self) -> "Game":
+        """
+        Independent copy of the position, move history included
+        :return: Game: copy
+        """
+        game = Game.__new__(Game)
+        game.bitboards = self.bitboards[:]
+        game.turn = self.turn
+        game.castling_rights = self.castling_rights
+        game.en_passant_square = self.en_passant_square
+        game.halfmove_clock = self.halfmove_clock
+        game.fullmove_number = self.fullmove_number
+        game.board = self.board[:]
+        game.undo_stack = self.undo_stack[:]
+        game.zobrist_key = self.zobrist_key
+        game.pawn_key = self.pawn_key
+        game.psq_score = self.psq_score
+        game.phase = self.phase
+        game._attack_maps = self._attack_maps[:]
+        game._king_safety = self._king_safety
+        return game
+
+    def attacked_squares(self, color: int) -> bin:
+        """
+        Squares attacked by one side, computed once per position
+        :param color: int: attacking side, 0 for white, 1 for black
+        :return: bin: bitboard of attacked squares
+        """
+        attacks = self._attack_maps[color]
+        if attacks is None:
+            bitboards = self.bitboards
+            base = 6 * color
+            attacks = self._attack_maps[color] = attacked_squares(
+                color,
+                bitboards[base + constants.PAWN],
+                bitboards[base + constants.KNIGHT],
+                bitboards[base + constants.BISHOP] | bitboards[base + constants.QUEEN],
+                bitboards[base + constants.ROOK] | bitboards[base + constants.QUEEN],
+                bitboards[base + constants.KING],
+                bitboards[WHITE_PIECES] | bitboards[BLACK_PIECES],
+            )
+        return attacks
+
+    def king_safety(self) -> tuple:
+        """
+        Checks and pins of the side to move, computed once per position:
+        checkers, the enemy pieces giving check; pinned, the own pieces
+        alone between the king and an enemy slider; pin_rays, the squares
+        each pinned piece may still move to (the ray up to the pinner
+        included) by square; danger, the squares attacked by the enemy
+        with the king removed, as sliders see through the king it cannot
+        step back along a check ray
+        :return: tuple: (checkers, pinned, pin_rays dict, danger)
+        """
+        safety = self._king_safety
+        if safety is not None:
+            return safety
+        color = self.turn
+        bitboards = self.bitboards
+        enemy_base = 6 - 6 * color
+        king = bitboards[6 * color + constants.KING]
+        enemy = bitboards[BLACK_PIECES - color]
+        enemy_diagonal = bitboards[enemy_base + constants.BISHOP] | bitboards[enemy_base + constants.QUEEN]
+        enemy_straight = bitboards[enemy_base + constants.ROOK] | bitboards[enemy_base + constants.QUEEN]
+        occupied = bitboards[WHITE_PIECES] | bitboards[BLACK_PIECES]
+        king_square = king.bit_length() - 1
+
+        danger = attacked_squares(
+            color ^ 1,
+            bitboards[enemy_base + constants.PAWN],
+            bitboards[enemy_base + constants.KNIGHT],
+            enemy_diagonal,
+            enemy_straight,
+            bitboards[enemy_base + constants.KING],
+            occupied ^ king,
+        )
+        checkers = (
+            KNIGHT_ATTACKS[king_square] & bitboards[enemy_base + constants.KNIGHT]
+            | PAWN_ATTACKS[color][king_square] & bitboards[enemy_base + constants.PAWN]
+            | rook_attacks(king_square, occupied) & enemy_straight
+            | bishop_attacks(king_square, occupied) & enemy_diagonal
+        )
+        pinned = 0
+        pin_rays = {}
+        if not checkers & (checkers - 1):  # Only the king moves in double check
+            snipers = (
+                rook_attacks(king_square, enemy) & enemy_straight
+                | bishop_attacks(king_square, enemy) & enemy_diagonal
+            )
+            while snipers:
+                sniper = snipers & -snipers
+                snipers ^= sniper
+                ray = BETWEEN[king_square][sniper.bit_length() - 1]
+                blockers = ray & occupied
+                if blockers and not blockers & (blockers - 1):
+                    pinned |= blockers
+                    pin_rays[blockers.bit_length() - 1] = ray | sniper
+        safety = self._king_safety = (checkers, pinned, pin_rays, danger)
+        return safety
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the position on POSITION_SIZE (32) bytes: the occupancy
+        bitboard, then the piece index of every occupied square, lowest
+        square first, one nibble each (32 pieces at most), then the state
+        :return: bytes: encoded position
+        """
+        occupied = self.white_pieces | self.black_pieces
+        board = self.board
+        nibbles = 0
+        shift = 0
+        squares = occupied
+        while squares:
+            square = (squares & -squares).bit_length() - 1
+            nibbles |= board[square] << shift
+            shift += 4
+            squares &= squares - 1
+        if shift > 128:
+            raise ValueError("more than 32 pieces, position cannot be encoded")
+        return POSITION_STRUCT.pack(
+            occupied,
+            nibbles.to_bytes(16, "little"),
+            self.turn | self.castling_rights << 1,
+            self.en_passant_square.bit_length(),
+            self.halfmove_clock,
+            self.fullmove_number,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Game":
+        """
+        Decode a position encoded by to_bytes
+        :param data: bytes-like object of POSITION_SIZE bytes
+        :return: Game: decoded position, with an empty move history
+        """
+        occupied, nibbles, state, en_passant, halfmove, fullmove = POSITION_STRUCT.unpack(data)
+        game = cls()
+        nibbles = int.from_bytes(nibbles, "little")
+        board = game.board
+        bitboards = game.bitboards
+        while occupied:
+            bit = occupied & -occupied
+            piece = nibbles & 0xF
+            if piece >= 12:
+                raise ValueError(f"invalid piece index {piece} in position data")
+            bitboards[piece] |= bit
+            board[bit.bit_length() - 1] = piece
+            nibbles >>= 4
+            occupied ^= bit
+        game.update_occupancy()
+        game.turn = state & 1
+        game.castling_rights = (state >> 1) & 0xF
+        game.en_passant_square = 1 << (en_passant - 1) if en_passant else 0
+        game.halfmove_clock = halfmove
+        game.fullmove_number = fullmove
+        game.zobrist_key = compute_key(game)
+        game.pawn_key = compute_pawn_key(game)
+        game.psq_score, game.phase = compute_scores(game)
+        return game
+
+    def make_move(self, move: int) -> None:
+        """
+        Play a legal move in place and push its undo record
+        :param move: int: encoded move (see utils.encode_move)
+        :return:
+        """
+        from_square = move & 0x3F
+        to_square = (move >> 6) & 0x3F
+        flag = move >> 12
+        attack_maps = self._attack_maps
+        attack_maps[0] = attack_maps[1] = self._king_safety = None
+        board = self.board
+        piece = board[from_square]
+        captured = board[to_square]
+        color = self.turn
+        bitboards = self.bitboards
+        own = WHITE_PIECES + color
+        enemy = BLACK_PIECES - color
+
+        castling_rights = self.castling_rights
+        en_passant_square = self.en_passant_square
+        key = self.zobrist_key
+        pawn_key = self.pawn_key
+        phase = self.phase
+
+        # Undo record: move, captured piece, castling rights, en passant
+        # square (index + 1, 0 for none), halfmove clock (16 bits) and
+        # Zobrist key in one int
+        self.undo_stack.append(
+            move
+            | captured << 16
+            | castling_rights << 20
+            | en_passant_square.bit_length() << 24
+            | (self.halfmove_clock & 0xFFFF) << 31
+            | key << 47
+        )
+
+        from_to = (1 << from_square) | (1 << to_square)
+        bitboards[piece] ^= from_to
+        bitboards[own] ^= from_to
+        board[from_square] = constants.NO_PIECE
+        board[to_square] = piece
+        piece_keys = PIECE_KEYS[piece]
+        key ^= piece_keys[from_square] ^ piece_keys[to_square] ^ SIDE_KEY
+        is_pawn = piece % 6 == constants.PAWN
+        if is_pawn:
+            pawn_key ^= piece_keys[from_square] ^ piece_keys[to_square]
+        psqt = PSQT[piece]
+        psq_score = self.psq_score + psqt[to_square] - psqt[from_square]
+
+        if flag == constants.EN_PASSANT_CAPTURE:
+            captured_square = to_square - 8 if color == 0 else to_square + 8
+            captured_bit = 1 << captured_square
+            captured_pawn = board[captured_square]
+            bitboards[captured_pawn] ^= captured_bit
+            bitboards[enemy] ^= captured_bit
+            key ^= PIECE_KEYS[captured_pawn][captured_square]
+            pawn_key ^= PIECE_KEYS[captured_pawn][captured_square]
+            psq_score -= PSQT[captured_pawn][captured_square]
+            board[captured_square] = constants.NO_PIECE
+        elif captured != constants.NO_PIECE:
+            to_bit = 1 << to_square
+            bitboards[captured] ^= to_bit
+            bitboards[enemy] ^= to_bit
+            key ^= PIECE_KEYS[captured][to_square]
+            if captured % 6 == constants.PAWN:
+                pawn_key ^= PIECE_KEYS[captured][to_square]
+            psq_score -= PSQT[captured][to_square]
+            phase -= PIECE_PHASES[captured]
+
+        if flag & constants.PROMOTION_FLAG:
+            to_bit = 1 << to_square
+            promoted = piece + constants.KNIGHT + (flag & 3)
+            bitboards[piece] ^= to_bit
+            bitboards[promoted] ^= to_bit
+            board[to_square] = promoted
+            key ^= piece_keys[to_square] ^ PIECE_KEYS[promoted][to_square]
+            pawn_key ^= piece_keys[to_square]
+            psq_score += PSQT[promoted][to_square] - psqt[to_square]
+            phase += PIECE_PHASES[promoted]
+        elif flag == constants.KING_CASTLE or flag == constants.QUEEN_CASTLE:
+            if flag == constants.KING_CASTLE:
+                rook_from, rook_to = to_square + 1, to_square - 1
+            else:
+                rook_from, rook_to = to_square - 2, to_square + 1
+            rook_from_to = (1 << rook_from) | (1 << rook_to)
+            rook = board[rook_from]
+            bitboards[rook] ^= rook_from_to
+            bitboards[own] ^= rook_from_to
+            board[rook_from] = constants.NO_PIECE
+            board[rook_to] = rook
+            key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+            psq_score += PSQT[rook][rook_to] - PSQT[rook][rook_from]
+
+        new_castling_rights = castling_rights & (
+            CASTLING_RIGHTS_MASKS[from_square] & CASTLING_RIGHTS_MASKS[to_square]
+        )
+        if new_castling_rights != castling_rights:
+            key ^= CASTLING_KEYS[castling_rights] ^ CASTLING_KEYS[new_castling_rights]
+            self.castling_rights = new_castling_rights
+        if en_passant_square:
+            key ^= EN_PASSANT_KEYS[(en_passant_square.bit_length() - 1) & 7]
+        if flag == constants.DOUBLE_PAWN_PUSH:
+            self.en_passant_square = 1 << ((from_square + to_square) >> 1)
+            key ^= EN_PASSANT_KEYS[from_square & 7]
+        else:
+            self.en_passant_square = 0
+        self.zobrist_key = key
+        self.pawn_key = pawn_key
+        self.psq_score = psq_score
+        self.phase = phase
+        if is_pawn or captured != constants.NO_PIECE:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if color == 1:
+            self.fullmove_number += 1
+        self.turn = color ^ 1
+
+    def unmake_move(self) -> None:
+        """
+        Take back the last move played with make_move
+        :return:
+        """
+        record = self.undo_stack.pop()
+        attack_maps = self._attack_maps
+        attack_maps[0] = attack_maps[1] = self._king_safety = None
+        from_square = record & 0x3F
+        to_square = (record >> 6) & 0x3F
+        flag = (record >> 12) & 0xF
+        captured = (record >> 16) & 0xF
+        en_passant = (record >> 24) & 0x7F
+        self.castling_rights = (record >> 20) & 0xF
+        self.en_passant_square = 1 << (en_passant - 1) if en_passant else 0
+        self.halfmove_clock = (record >> 31) & 0xFFFF
+        self.zobrist_key = record >> 47
+
+        color = self.turn ^ 1
+        self.turn = color
+        if color == 1:
+            self.fullmove_number -= 1
+        board = self.board
+        bitboards = self.bitboards
+        own = WHITE_PIECES + color
+        enemy = BLACK_PIECES - color
+        piece = board[to_square]
+        # The piece-square sum, phase and pawn key take the move deltas back
+        psq_score = self.psq_score
+        pawn_key = self.pawn_key
+
+        if flag & constants.PROMOTION_FLAG:
+            to_bit = 1 << to_square
+            bitboards[piece] ^= to_bit
+            psq_score -= PSQT[piece][to_square]
+            self.phase -= PIECE_PHASES[piece]
+            piece = color * 6 + constants.PAWN
+            bitboards[piece] ^= to_bit
+            psq_score += PSQT[piece][to_square]
+            pawn_key ^= PIECE_KEYS[piece][to_square]
+        elif flag == constants.KING_CASTLE or flag == constants.QUEEN_CASTLE:
+            if flag == constants.KING_CASTLE:
+                rook_from, rook_to = to_square + 1, to_square - 1
+            else:
+                rook_from, rook_to = to_square - 2, to_square + 1
+            rook_from_to = (1 << rook_from) | (1 << rook_to)
+            rook = board[rook_to]
+            bitboards[rook] ^= rook_from_to
+            bitboards[own] ^= rook_from_to
+            board[rook_to] = constants.NO_PIECE
+            board[rook_from] = rook
+            psq_score += PSQT[rook][rook_from] - PSQT[rook][rook_to]
+
+        from_to = (1 << from_square) | (1 << to_square)
+        bitboards[piece] ^= from_to
+        bitboards[own] ^= from_to
+        board[from_square] = piece
+        board[to_square] = captured
+        psqt = PSQT[piece]
+        psq_score += psqt[from_square] - psqt[to_square]
+        if piece % 6 == constants.PAWN:
+            piece_keys = PIECE_KEYS[piece]
+            pawn_key ^= piece_keys[from_square] ^ piece_keys[to_square]
+
+        if flag == constants.EN_PASSANT_CAPTURE:
+            captured_square = to_square - 8 if color == 0 else to_square + 8
+            captured_bit = 1 << captured_square
+            captured = (color ^ 1) * 6 + constants.PAWN
+            bitboards[captured] ^= captured_bit
+            bitboards[enemy] ^= captured_bit
+            board[captured_square] = captured
+            psq_score += PSQT[captured][captured_square]
+            pawn_key ^= PIECE_KEYS[captured][captured_square]
+        elif captured != constants.NO_PIECE:
+            to_bit = 1 << to_square
+            bitboards[captured] ^= to_bit
+            bitboards[enemy] ^= to_bit
+            psq_score += PSQT[captured][to_square]
+            self.phase += PIECE_PHASES[captured]
+            if captured % 6 == constants.PAWN:
+                pawn_key ^= PIECE_KEYS[captured][to_square]
+        self.psq_score = psq_score
+        self.pawn_key = pawn_key
+
+    def is_repetition(self) -> bool:
+        """
+        Check if the position already occurred since the last capture or pawn
+        move, using the keys stored in the undo records
+        :return: bool: True if the current position is a repetition
+        """
+        key = self.zobrist_key
+        stack = self.undo_stack
+        oldest = max(len(stack) - self.halfmove_clock, 0)
+        # Same side to move every other record
+        for index in range(len(stack) - 2, oldest - 1, -2):
+            if stack[index] >> 47 == key:
+                return True
+        return False
 
     def display_bitboards(self):
         # Helper to visualize each bitboard
-        for attr, value in self.__dict__.items():
-            if isinstance(value, int):
-                print(f"{attr}: {value:064b}")
+        for name, value in zip(self.PIECE_BITBOARDS + self.COLOR_BITBOARDS, self.bitboards):
+            print(f"{name}: {value:064b}")
+        for name in ("turn", "castling_rights", "en_passant_square"):
+            print(f"{name}: {getattr(self, name):064b}")
+
+
+def _bitboard_property(index: int) -> property:
+    """
+    Named access to one entry of Game.bitboards, setting it drops the
+    cached attack maps and king safety
+    """
+
+    def getter(game: Game) -> bin:
+        return game.bitboards[index]
+
+    def setter(game: Game, value: bin) -> None:
+        game.bitboards[index] = value
+        game._attack_maps = [None, None]
+        game._king_safety = None
+
+    return property(getter, setter)
+
+
+for _index, _name in enumerate(Game.PIECE_BITBOARDS + Game.COLOR_BITBOARDS):
+    setattr(Game, _name, _bitboard_property(_index))
+del _index, _name
 
 
 if __name__ == "__main__":
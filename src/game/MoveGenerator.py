@@ -0,0 +1,225 @@
+from array import array
+
+from src.game.Game import BLACK_PIECES, WHITE_PIECES, Game
+from src.utils import constants
+from src.utils.attacks import BETWEEN, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS
+from src.utils.magic import bishop_attacks, rook_attacks
+
+THIRD_RANK = 0x0000000000FF0000
+SIXTH_RANK = 0x0000FF0000000000
+PROMOTION_RANKS = constants.FIRST_RANK | constants.EIGHTH_RANK
+
+# Squares that must be empty / not attacked to castle,
+# per color: (rights bit, rook square, king target, flag, empty squares, safe squares)
+CASTLES = (
+    (
+        (constants.WHITE_KINGSIDE_CASTLE, 7, 6, constants.KING_CASTLE, 0x60, 0x60),
+        (constants.WHITE_QUEENSIDE_CASTLE, 0, 2, constants.QUEEN_CASTLE, 0x0E, 0x0C),
+    ),
+    (
+        (constants.BLACK_KINGSIDE_CASTLE, 63, 62, constants.KING_CASTLE, 0x60 << 56, 0x60 << 56),
+        (constants.BLACK_QUEENSIDE_CASTLE, 56, 58, constants.QUEEN_CASTLE, 0x0E << 56, 0x0C << 56),
+    ),
+)
+KING_START_SQUARES = (4, 60)
+
+
+class MoveGenerator:
+    """
+    Legal move generator for a Game position.
+    Moves are packed on 16 bits (see utils.encode_move) and written into a
+    preallocated array("H"), the check and pin masks are computed once per
+    position so no move has to be played to be validated.
+    """
+
+    MAX_MOVES = 256
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.moves = self.new_move_list()
+        # Pin ray (between squares and pinner) by pinned piece square
+        self.pin_rays = {}
+        self.checkers: bin = 0
+        self.pinned: bin = 0
+
+    @classmethod
+    def new_move_list(cls) -> array:
+        """
+        Allocate a move list large enough for any position
+        :return: array: zeroed array("H") of MAX_MOVES moves
+        """
+        return array("H", bytes(2 * cls.MAX_MOVES))
+
+    def generate_legal_moves(self, moves: array = None) -> int:
+        """
+        Write every legal move of the side to move into moves
+        :param moves: array("H") to fill, defaults to self.moves
+        :return: int: number of moves written
+        """
+        game = self.game
+        if moves is None:
+            moves = self.moves
+        color = game.turn
+        bitboards = game.bitboards
+        base = 6 * color
+        enemy_base = 6 - base
+        pawns = bitboards[base + constants.PAWN]
+        knights = bitboards[base + constants.KNIGHT]
+        king = bitboards[base + constants.KING]
+        diagonal = bitboards[base + constants.BISHOP] | bitboards[base + constants.QUEEN]
+        straight = bitboards[base + constants.ROOK] | bitboards[base + constants.QUEEN]
+        own = bitboards[WHITE_PIECES + color]
+        enemy = bitboards[BLACK_PIECES - color]
+        enemy_diagonal = bitboards[enemy_base + constants.BISHOP] | bitboards[enemy_base + constants.QUEEN]
+        enemy_straight = bitboards[enemy_base + constants.ROOK] | bitboards[enemy_base + constants.QUEEN]
+        occupied = own | enemy
+        king_square = king.bit_length() - 1
+
+        # Shared with every other query on this position (see Game.king_safety)
+        checkers, pinned, pin_rays, danger = game.king_safety()
+        self.checkers = checkers
+        self.pinned = pinned
+        self.pin_rays = pin_rays
+
+        count = self._add_moves(
+            moves, 0, king_square, KING_ATTACKS[king_square] & ~own & ~danger, enemy
+        )
+        if checkers & (checkers - 1):
+            return count  # Double check, only the king can move
+
+        if checkers:
+            # Capture the checker or block its ray
+            check_mask = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+        else:
+            check_mask = constants.BOARD_MASK
+
+        targets = ~own & check_mask
+        # Pinned knights can never move
+        free_knights = knights & ~pinned
+        while free_knights:
+            knight = free_knights & -free_knights
+            free_knights ^= knight
+            square = knight.bit_length() - 1
+            count = self._add_moves(moves, count, square, KNIGHT_ATTACKS[square] & targets, enemy)
+        while diagonal:
+            slider = diagonal & -diagonal
+            diagonal ^= slider
+            square = slider.bit_length() - 1
+            slider_targets = bishop_attacks(square, occupied) & targets
+            if slider & pinned:
+                slider_targets &= pin_rays[square]
+            count = self._add_moves(moves, count, square, slider_targets, enemy)
+        while straight:
+            slider = straight & -straight
+            straight ^= slider
+            square = slider.bit_length() - 1
+            slider_targets = rook_attacks(square, occupied) & targets
+            if slider & pinned:
+                slider_targets &= pin_rays[square]
+            count = self._add_moves(moves, count, square, slider_targets, enemy)
+
+        count = self._add_pawn_moves(
+            moves, count, color, pawns, occupied, enemy, check_mask, pinned
+        )
+
+        en_passant = game.en_passant_square
+        if en_passant:
+            en_passant_index = en_passant.bit_length() - 1
+            captured = en_passant >> 8 if color == 0 else en_passant << 8
+            # Legal only if it removes the checker or blocks the check
+            if not checkers or checkers & captured or en_passant & check_mask:
+                attackers = PAWN_ATTACKS[1 - color][en_passant_index] & pawns
+                while attackers:
+                    pawn = attackers & -attackers
+                    attackers ^= pawn
+                    # Both pawns leave their squares at once, test for a discovered check
+                    after = occupied ^ pawn ^ captured | en_passant
+                    if (
+                        rook_attacks(king_square, after) & enemy_straight
+                        or bishop_attacks(king_square, after) & enemy_diagonal
+                    ):
+                        continue
+                    moves[count] = (
+                        (pawn.bit_length() - 1)
+                        | en_passant_index << 6
+                        | constants.EN_PASSANT_CAPTURE << 12
+                    )
+                    count += 1
+
+        if not checkers and king_square == KING_START_SQUARES[color]:
+            rooks = bitboards[base + constants.ROOK]
+            for right, rook_square, target, flag, empty, safe in CASTLES[color]:
+                if (
+                    game.castling_rights & right
+                    and rooks >> rook_square & 1
+                    and not occupied & empty
+                    and not danger & safe
+                ):
+                    moves[count] = king_square | target << 6 | flag << 12
+                    count += 1
+
+        return count
+
+    def _add_moves(self, moves: array, count: int, from_square: int, targets: bin, enemy: bin) -> int:
+        """
+        Write one move per target square of a piece
+        :return: int: new number of moves
+        """
+        base = from_square
+        capture = base | constants.CAPTURE << 12
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            to_shift = (target.bit_length() - 1) << 6
+            moves[count] = (capture if target & enemy else base) | to_shift
+            count += 1
+        return count
+
+    def _add_pawn_moves(
+        self, moves: array, count: int, color: int, pawns: bin, occupied: bin, enemy: bin,
+        check_mask: bin, pinned: bin,
+    ) -> int:
+        """
+        Write the pushes, captures and promotions of all pawns, computed set-wise
+        :return: int: new number of moves
+        """
+        empty = ~occupied & constants.BOARD_MASK
+        if color == 0:
+            single = (pawns << 8) & empty
+            double = ((single & THIRD_RANK) << 8) & empty
+            left = (pawns << 7) & constants.H_FILE_MASK & enemy
+            right = (pawns << 9) & constants.A_FILE_MASK & enemy
+            offsets = (8, 16, 7, 9)
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & SIXTH_RANK) >> 8) & empty
+            left = (pawns >> 9) & constants.H_FILE_MASK & enemy
+            right = (pawns >> 7) & constants.A_FILE_MASK & enemy
+            offsets = (-8, -16, -9, -7)
+
+        pin_rays = self.pin_rays
+        for targets, offset, flag in (
+            (single, offsets[0], constants.QUIET_MOVE),
+            (double, offsets[1], constants.DOUBLE_PAWN_PUSH),
+            (left, offsets[2], constants.CAPTURE),
+            (right, offsets[3], constants.CAPTURE),
+        ):
+            targets &= check_mask
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                to_square = target.bit_length() - 1
+                from_square = to_square - offset
+                if pinned >> from_square & 1 and not pin_rays[from_square] & target:
+                    continue
+                move = from_square | to_square << 6
+                if target & PROMOTION_RANKS:
+                    promotion = (flag | constants.PROMOTION_FLAG) << 12
+                    # Knight, bishop, rook then queen promotion
+                    for piece in range(4):
+                        moves[count] = move | promotion | piece << 12
+                        count += 1
+                else:
+                    moves[count] = move | flag << 12
+                    count += 1
+        return count
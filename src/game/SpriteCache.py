@@ -0,0 +1,84 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from src import config
+
+# Resolved against the project root, like the magic tables cache, so the
+# sprites are shared whatever the working directory
+DEFAULT_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    config.CACHE_PATH,
+    "sprites",
+)
+
+
+class SpriteCache:
+    """
+    PNG renders of SVG images, kept on disk under a name made of the SVG
+    content hash and the output size, and in a small in-memory LRU.
+    A render is only computed (and cairosvg only imported) when neither
+    has it, so a restart or a resize back to an earlier size costs a file
+    read at most. Editing an SVG changes its hash, stale files are never
+    read.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, memory_size: int = 64):
+        """
+        :param directory: str: directory of the PNG files
+        :param memory_size: int: number of renders kept in memory
+        """
+        self.directory = directory
+        self.memory_size = memory_size
+        self._renders = OrderedDict()
+        # SVG path -> (modification time, content hash)
+        self._digests = {}
+
+    def _digest(self, svg_path: str) -> str:
+        """
+        Content hash of an SVG file, recomputed when the file changes
+        """
+        mtime = os.stat(svg_path).st_mtime_ns
+        cached = self._digests.get(svg_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(svg_path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()[:32]
+        self._digests[svg_path] = (mtime, digest)
+        return digest
+
+    def png(self, svg_path: str, size: int) -> bytes:
+        """
+        PNG render of an SVG file
+        :param svg_path: str: path of the SVG image
+        :param size: int: width and height of the render in pixels
+        :return: bytes: PNG data
+        """
+        key = (self._digest(svg_path), size)
+        data = self._renders.get(key)
+        if data is not None:
+            self._renders.move_to_end(key)
+            return data
+
+        path = os.path.join(self.directory, f"{key[0]}-{size}.png")
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            # Imported here: only a cache miss needs the SVG renderer
+            import cairosvg
+
+            data = cairosvg.svg2png(url=svg_path, output_width=size, output_height=size)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # Read-only checkout, rendered again next time
+
+        self._renders[key] = data
+        if len(self._renders) > self.memory_size:
+            self._renders.popitem(last=False)
+        return data
@@ -1,18 +1,18 @@
+import base64
 import tkinter as tk
-from PIL import Image, ImageTk
 import os
-import cairosvg
-import io
 
 from src import config
 from src.game.Game import Game
+from src.game.SpriteCache import SpriteCache
 from src.utils import constants
 
 
 class ChessGUI:
-    def __init__(self, master, game: Game):
+    def __init__(self, master, game: Game, sprite_cache: SpriteCache = None):
         self.master = master
         self.game = game
+        self.sprite_cache = sprite_cache if sprite_cache is not None else SpriteCache()
         self.square_size = 100
         self.board_size = self.square_size * 8
 
@@ -28,6 +28,11 @@ class ChessGUI:
         self.piece_images = {}
         self.load_piece_images()
 
+        # Canvas item of each occupied square and the piece bitboards it
+        # shows, so that a redraw only touches the squares that changed
+        self.square_items = {}
+        self.drawn_bitboards = [0] * 12
+
         # Draw initial board
         self.draw_board()
         self.draw_pieces()
@@ -57,23 +62,28 @@ class ChessGUI:
             # Load and resize image
             image_path = os.path.join(assets_path, filename)
             try:
-                # Convert SVG to PNG in memory with the desired size
-                png_data = cairosvg.svg2png(
-                    url=image_path,
-                    output_width=self.square_size - 10,
-                    output_height=self.square_size - 10
-                )
-
-                # Convert PNG data to PIL Image
-                img = Image.open(io.BytesIO(png_data))
+                # PNG of the desired size, rendered from the SVG on a cache miss only
+                png_data = self.sprite_cache.png(image_path, self.square_size - 10)
 
-                # Convert to PhotoImage for Tkinter
-                self.piece_images[piece] = ImageTk.PhotoImage(img)
+                # Tk decodes PNG itself, no image library is needed
+                self.piece_images[piece] = tk.PhotoImage(
+                    data=base64.b64encode(png_data), format="png"
+                )
             except Exception as e:
                 print(f"Error loading {filename}: {e}")
                 # Fallback to text if image loading fails
                 self.piece_images[piece] = None
 
+    def set_square_size(self, square_size: int):
+        """Resize the board, renders of earlier sizes are reused"""
+        self.square_size = square_size
+        self.board_size = square_size * 8
+        self.canvas.config(width=self.board_size, height=self.board_size)
+        self.canvas.delete("all")
+        self.load_piece_images()
+        self.draw_board()
+        self.draw_pieces()
+
     def draw_board(self):
         """Draw the chess board squares"""
         for row in range(8):
@@ -93,65 +103,80 @@ class ChessGUI:
                 )
 
     def draw_pieces(self):
-        """Draw pieces based on bitboard positions"""
-        # Clear existing pieces
+        """Draw every piece from scratch"""
         self.canvas.delete("piece")
+        self.square_items = {}
+        self.drawn_bitboards = [0] * 12
+        self.update_display()
+
+    def _square_center(self, square: int) -> tuple:
+        row = 7 - (square >> 3)  # Flip row for correct orientation
+        col = square & 7
+        return (
+            col * self.square_size + self.square_size // 2,
+            row * self.square_size + self.square_size // 2,
+        )
 
-        def get_set_bits(bitboard: bin):
-            positions = []
-            for i in range(64):
-                if bitboard & (1 << i):
-                    positions.append(i)
-            return positions
-
-        # Map bitboards to piece characters
-        piece_mappings = [
-            (self.game.white_pawns, constants.WHITE_PAWN),
-            (self.game.white_knights, constants.WHITE_KNIGHT),
-            (self.game.white_bishops, constants.WHITE_BISHOP),
-            (self.game.white_rooks, constants.WHITE_ROOK),
-            (self.game.white_queens, constants.WHITE_QUEEN),
-            (self.game.white_king, constants.WHITE_KING),
-            (self.game.black_pawns, constants.BLACK_PAWN),
-            (self.game.black_knights, constants.BLACK_KNIGHT),
-            (self.game.black_bishops, constants.BLACK_BISHOP),
-            (self.game.black_rooks, constants.BLACK_ROOK),
-            (self.game.black_queens, constants.BLACK_QUEEN),
-            (self.game.black_king, constants.BLACK_KING),
-        ]
-
-        for bitboard, piece_char in piece_mappings:
-            positions = get_set_bits(bitboard)
-            for pos in positions:
-                row = 7 - (pos // 8)  # Flip row for correct orientation
-                col = pos % 8
-                x = col * self.square_size + self.square_size // 2
-                y = row * self.square_size + self.square_size // 2
-
-                if self.piece_images[piece_char]:
-                    # Calculate position to center the image
-                    img = self.piece_images[piece_char]
-                    img_x = x - img.width() // 2
-                    img_y = y - img.height() // 2
-                    self.canvas.create_image(
-                        img_x, img_y,
-                        image=img,
-                        anchor='nw',
-                        tags="piece"
-                    )
-                else:
-                    # Fallback to Unicode characters if image loading fails
-                    self.canvas.create_text(
-                        x, y,
-                        text=piece_char,
-                        font=("Arial", 36),
-                        fill="black" if piece_char.isupper() else "dark gray",
-                        tags="piece"
-                    )
+    def _create_piece(self, square: int, piece_char: str) -> int:
+        """Create the canvas item of a piece, return its id"""
+        x, y = self._square_center(square)
+        if self.piece_images[piece_char]:
+            return self.canvas.create_image(
+                x, y,
+                image=self.piece_images[piece_char],
+                anchor='center',
+                tags="piece"
+            )
+        # Fallback to Unicode characters if image loading fails
+        return self.canvas.create_text(
+            x, y,
+            text=piece_char,
+            font=("Arial", 36),
+            fill="black" if piece_char.isupper() else "dark gray",
+            tags="piece"
+        )
 
     def update_display(self):
-        """Update the board display"""
-        self.draw_pieces()
+        """
+        Update the board display: only the squares whose content changed
+        since the last call are touched. The changed squares of each piece
+        bitboard are old ^ new; an item leaving a square is moved to a
+        square the same piece arrives on, and the remaining ones are
+        created or deleted.
+        """
+        square_items = self.square_items
+        drawn = self.drawn_bitboards
+        arrivals = []
+        # Items of the pieces that left their square, by piece index
+        leaving = {}
+        for piece, name in enumerate(Game.PIECE_BITBOARDS):
+            bitboard = getattr(self.game, name)
+            changed = drawn[piece] ^ bitboard
+            if not changed:
+                continue
+            drawn[piece] = bitboard
+            removed = changed & ~bitboard
+            while removed:
+                bit = removed & -removed
+                removed ^= bit
+                leaving.setdefault(piece, []).append(square_items.pop(bit.bit_length() - 1))
+            added = changed & bitboard
+            while added:
+                bit = added & -added
+                added ^= bit
+                arrivals.append((piece, bit.bit_length() - 1))
+
+        for piece, square in arrivals:
+            items = leaving.get(piece)
+            if items:
+                item = items.pop()
+                self.canvas.coords(item, *self._square_center(square))
+            else:
+                item = self._create_piece(square, constants.PIECE_SYMBOLS[piece])
+            square_items[square] = item
+        for items in leaving.values():
+            for item in items:
+                self.canvas.delete(item)
 
 
 def create_chess_gui(game: Game):
@@ -1,5 +1,5 @@
 from src.pieces.Piece import Piece
-from src.utils import constants
+from src.utils.attacks import KING_ATTACKS
 
 class King(Piece):
     @staticmethod
@@ -10,28 +10,7 @@ class King(Piece):
         :param occupied: bitboard of all occupied squares
         :return: bitboard of all possible moves for the king
         """
-        # Define the 8 possible moves for a king (left, right, up, down, and 4 diagonals)
-        moves = 0
-        position = king_position
-
-        # Move up
-        moves |= (position << 8) & ~occupied
-        # Move down
-        moves |= (position >> 8) & ~occupied
-        # Move left
-        moves |= (position >> 1) & constants.NOT_A_FILE & ~occupied
-        # Move right
-        moves |= (position << 1) & constants.NOT_H_FILE & ~occupied
-        # Move up-left diagonal
-        moves |= (position << 7) & constants.NOT_H_FILE & ~occupied
-        # Move up-right diagonal
-        moves |= (position << 9) & constants.NOT_A_FILE & ~occupied
-        # Move down-left diagonal
-        moves |= (position >> 9) & constants.NOT_H_FILE & ~occupied
-        # Move down-right diagonal
-        moves |= (position >> 7) & constants.NOT_A_FILE & ~occupied
-
-        return moves
+        return KING_ATTACKS[king_position.bit_length() - 1] & ~occupied
 
     @classmethod
     def get_possible_moves(cls, kings: bin, occupied: bin) -> bin:
@@ -41,16 +20,16 @@ class King(Piece):
         :param occupied: bitboard of all occupied squares
         :return: bitboard of all possible moves for kings
         """
+        if not kings & (kings - 1):
+            # Single king, no need to iterate over the bitboard
+            return KING_ATTACKS[kings.bit_length() - 1] & ~occupied if kings else 0
+
         all_moves = 0
         # Iterate over each king position in the bitboard
         while kings:
             king_position = kings & -kings  # Isolate the lowest bit representing a king
-            kings &= kings - 1  # Clear the lowest bit
-
-            # Calculate moves for the isolated king position
-            king_moves = cls._get_king_moves(king_position, occupied)
+            kings ^= king_position  # Clear the lowest bit
 
-            # Combine all moves
-            all_moves |= king_moves
+            all_moves |= KING_ATTACKS[king_position.bit_length() - 1]
 
-        return all_moves
+        return all_moves & ~occupied
@@ -1,5 +1,5 @@
 from src.pieces.Piece import Piece
-from src.utils import constants
+from src.utils.attacks import KNIGHT_ATTACKS
 
 class Knight(Piece):
     @staticmethod
@@ -10,36 +10,14 @@ class Knight(Piece):
         :param occupied: bitboard of all occupied squares
         :return: bitboard of possible knight moves
         """
-        # Masks to prevent wraparound from file A and file H
-        a_file_mask = constants.A_FILE_MASK
-        ab_file_mask = constants.AB_FILE_MASK  # For two leftward moves
-        h_file_mask = constants.H_FILE_MASK
-        gh_file_mask = constants.GH_FILE_MASK  # For two rightward moves
+        all_moves = 0
+        # Iterate over each knight position in the bitboard
+        while knights:
+            knight_position = knights & -knights  # Isolate the lowest bit representing a knight
+            knights ^= knight_position  # Clear the lowest bit
 
-        # Calculate knight moves by shifting the knight's bitboard
-        # Eight possible moves for each knight
-
-        # Two up, one left
-        moves_up_left = (knights << 15) & ~a_file_mask
-        # Two up, one right
-        moves_up_right = (knights << 17) & ~h_file_mask
-        # One up, two left
-        moves_left_up = (knights << 6) & ~ab_file_mask
-        # One up, two right
-        moves_right_up = (knights << 10) & ~gh_file_mask
-
-        # Two down, one left
-        moves_down_left = (knights >> 17) & ~a_file_mask
-        # Two down, one right
-        moves_down_right = (knights >> 15) & ~h_file_mask
-        # One down, two left
-        moves_left_down = (knights >> 10) & ~ab_file_mask
-        # One down, two right
-        moves_right_down = (knights >> 6) & ~gh_file_mask
-
-        # Combine all moves
-        all_moves = (moves_up_left | moves_up_right | moves_left_up | moves_right_up |
-                     moves_down_left | moves_down_right | moves_left_down | moves_right_down)
+            # Look up the moves of the isolated knight position
+            all_moves |= KNIGHT_ATTACKS[knight_position.bit_length() - 1]
 
         # Mask out occupied squares
         return all_moves & ~occupied
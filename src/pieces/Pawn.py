@@ -1,5 +1,6 @@
 from src.pieces.Piece import Piece
 from src.utils import constants
+from src.utils.attacks import PAWN_ATTACKS
 
 
 class Pawn(Piece):
@@ -46,6 +47,8 @@ class Pawn(Piece):
         :param pieces: bitboard of the other color pieces
         :return:
         """
+        # The whole pawn set is shifted at once, two shifts are cheaper than
+        # one PAWN_ATTACKS lookup per pawn
         a_file_mask = constants.A_FILE_MASK
         h_file_mask = constants.H_FILE_MASK
         if color == 0:
@@ -68,16 +71,14 @@ class Pawn(Piece):
         :param en_passant_square: bitboard of the en passant square
         :return:
         """
-        if color == 0:
-            en_passant_left = (pawns << 7) & en_passant_square
-            en_passant_right = (pawns << 9) & en_passant_square
-            return en_passant_left | en_passant_right
-        elif color == 1:
-            en_passant_left = (pawns >> 9) & en_passant_square
-            en_passant_right = (pawns >> 7) & en_passant_square
-            return en_passant_left | en_passant_right
-        else:
+        if color not in (0, 1):
             raise ValueError("color value not valid")
+        if not en_passant_square:
+            return 0
+        # The pawns able to take en passant are the ones an opposite color pawn
+        # standing on the en passant square would attack
+        attackers = PAWN_ATTACKS[1 - color][en_passant_square.bit_length() - 1]
+        return en_passant_square if attackers & pawns else 0
 
     @classmethod
     def get_possibles_moves(
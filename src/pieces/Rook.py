@@ -1,5 +1,5 @@
 from src.pieces.Piece import Piece
-from src.utils import constants
+from src.utils.magic import rook_attacks
 
 class Rook(Piece):
     @staticmethod
@@ -8,56 +8,26 @@ class Rook(Piece):
         Get all the possible moves for a rook.
         :param rook_position: bitboard of the rook's position
         :param occupied: bitboard of all occupied squares
-        :return: bitboard of all possible moves for the rook
+        :return: bitboard of all possible moves for the rook, blockers included
         """
-        # Define the horizontal and vertical directions
-        moves = 0
-        position = rook_position
-
-        # Move up (vertical)
-        up = position
-        while up:
-            up = (up << 8) & ~occupied  # Move up
-            moves |= up
-
-        # Move down (vertical)
-        down = position
-        while down:
-            down = (down >> 8) & ~occupied  # Move down
-            moves |= down
-
-        # Move left (horizontal)
-        left = position
-        while left:
-            left = (left >> 1) & constants.NOT_A_FILE & ~occupied  # Move left
-            moves |= left
-
-        # Move right (horizontal)
-        right = position
-        while right:
-            right = (right << 1) & constants.NOT_H_FILE & ~occupied  # Move right
-            moves |= right
-
-        return moves
+        return rook_attacks(rook_position.bit_length() - 1, occupied)
 
     @classmethod
-    def get_possible_moves(cls, rooks: bin, occupied: bin) -> bin:
+    def get_possible_moves(cls, rooks: bin, occupied: bin, own_pieces: bin = 0) -> bin:
         """
         Get all possible moves for rooks.
         :param rooks: bitboard of rook positions
         :param occupied: bitboard of all occupied squares
-        :return: bitboard of all possible moves for rooks
+        :param own_pieces: bitboard of the rooks' color pieces, removed from the moves
+        :return: bitboard of all possible moves for rooks, captures included
         """
         all_moves = 0
         # Iterate over each rook position in the bitboard
         while rooks:
             rook_position = rooks & -rooks  # Isolate the lowest bit representing a rook
-            rooks &= rooks - 1  # Clear the lowest bit
-
-            # Calculate moves for the isolated rook position
-            rook_moves = cls._get_rook_moves(rook_position, occupied)
+            rooks ^= rook_position  # Clear the lowest bit
 
-            # Combine all moves
-            all_moves |= rook_moves
+            # Look up the moves of the isolated rook position
+            all_moves |= cls._get_rook_moves(rook_position, occupied)
 
-        return all_moves
+        return all_moves & ~own_pieces
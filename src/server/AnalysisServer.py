@@ -0,0 +1,273 @@
+import asyncio
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+from src.engine.Search import MAX_DEPTH, Search
+from src.engine.TranspositionTable import TranspositionTable
+from src.game.Game import Game
+from src.utils.utils import move_to_uci
+
+# Time limit of a job that gives no depth, node or time limit, in seconds
+DEFAULT_MOVETIME = 1.0
+
+
+def _worker(index: int, hash_mb: int, tasks, results) -> None:
+    """
+    Engine process: keeps one transposition table warm across jobs and
+    searches every task received until None is sent
+    """
+    tt = TranspositionTable(hash_mb)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        fen, depth, movetime, nodes = task
+        start = time.perf_counter()
+        try:
+            game = Game(fen=fen)
+            if game.white_king.bit_count() != 1 or game.black_king.bit_count() != 1:
+                raise ValueError("each side needs exactly one king")
+            search = Search(game, tt)
+            move, score = search.search(depth=depth, movetime=movetime, nodes=nodes)
+            result = {
+                "bestmove": move_to_uci(move) if move else None,
+                "score": score,
+                "depth": search.completed_depth,
+                "nodes": search.nodes,
+                "pv": [move_to_uci(pv_move) for pv_move in search.principal_variation(search.completed_depth)],
+                "time": round(time.perf_counter() - start, 3),
+            }
+        except (ValueError, IndexError, KeyError) as error:
+            result = {"error": f"invalid position: {error}"}
+        except Exception as error:  # The process must survive any job
+            result = {"error": f"analysis failed: {error!r}"}
+        results.put((index, result))
+
+
+class AnalysisServer:
+    """
+    Position analysis service speaking JSON lines over TCP or a Unix socket.
+
+    A request is one JSON object per line:
+        {"id": 1, "fen": "...", "depth": 8, "movetime": 2.5, "nodes": 100000,
+         "priority": 0, "deadline": 10}
+    fen is required, depth / movetime (seconds) / nodes limit the search,
+    lower priorities are served first, and deadline (seconds from the
+    request) drops the job if it has not started by then and caps its
+    search time otherwise. Each request gets one JSON line back, in
+    completion order, with the same id:
+        {"id": 1, "bestmove": "e2e4", "score": 35, "depth": 8, "nodes": ..., "pv": [...], "time": ...}
+    or {"id": 1, "error": "..."}.
+
+    Jobs are searched by a pool of engine processes started once, each
+    keeping its transposition table between jobs.
+    """
+
+    def __init__(self, workers: int = None, hash_mb: int = 16):
+        """
+        :param workers: int: number of engine processes, defaults to the number of CPUs
+        :param hash_mb: int: transposition table size of each process in MB
+        """
+        self.worker_count = max(1, workers or os.cpu_count() or 1)
+        self.hash_mb = hash_mb
+        self._queue = []
+        self._sequence = itertools.count()
+        self._running = {}
+        self._processes = []
+        self._tasks = []
+        self._results = None
+        self._idle = None
+        self._wakeup = None
+        self._background = []
+        self._servers = []
+
+    async def start(self) -> None:
+        """
+        Start the engine processes and the dispatching tasks
+        :return:
+        """
+        # Spawned rather than forked: the event loop threads must not be copied
+        context = multiprocessing.get_context("spawn")
+        self._results = context.Queue()
+        self._idle = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        for index in range(self.worker_count):
+            tasks = context.Queue()
+            process = context.Process(
+                target=_worker, args=(index, self.hash_mb, tasks, self._results), daemon=True
+            )
+            process.start()
+            self._tasks.append(tasks)
+            self._processes.append(process)
+            self._idle.put_nowait(index)
+        self._background = [
+            asyncio.create_task(self._dispatch()),
+            asyncio.create_task(self._collect()),
+        ]
+
+    async def listen_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Accept clients on a TCP port
+        :param host: str: interface to bind, local only by default
+        :param port: int: port, 0 picks a free one
+        :return: int: port listened on
+        """
+        server = await asyncio.start_server(self._handle_client, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def listen_unix(self, path: str) -> None:
+        """
+        Accept clients on a Unix socket
+        :param path: str: socket path
+        :return:
+        """
+        self._servers.append(await asyncio.start_unix_server(self._handle_client, path))
+
+    async def submit(self, request: dict) -> dict:
+        """
+        Queue one analysis job and wait for its result
+        :param request: dict: job, see the class documentation
+        :return: dict: result or error
+        """
+        job_id = request.get("id")
+        fen = request.get("fen")
+        if not isinstance(fen, str):
+            raise ValueError("fen is required")
+        depth = int(request.get("depth", MAX_DEPTH))
+        nodes = request.get("nodes")
+        movetime = request.get("movetime")
+        if movetime is None and nodes is None and "depth" not in request:
+            movetime = DEFAULT_MOVETIME
+        deadline = request.get("deadline")
+        job = {
+            "id": job_id,
+            "fen": fen,
+            "depth": max(1, depth),
+            "movetime": None if movetime is None else float(movetime),
+            "nodes": None if nodes is None else int(nodes),
+            "expires": None if deadline is None else time.monotonic() + float(deadline),
+            "future": asyncio.get_running_loop().create_future(),
+        }
+        heapq.heappush(self._queue, (int(request.get("priority", 0)), next(self._sequence), job))
+        self._wakeup.set()
+        return {"id": job_id, **await job["future"]}
+
+    async def _dispatch(self) -> None:
+        """
+        Give the most urgent job to each idle engine process
+        """
+        while True:
+            index = await self._idle.get()
+            job = None
+            while job is None:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, _, job = heapq.heappop(self._queue)
+                if job["future"].done():
+                    job = None  # Client gone
+                elif job["expires"] is not None and job["expires"] <= time.monotonic():
+                    job["future"].set_result({"error": "deadline expired before the job started"})
+                    job = None
+
+            movetime = job["movetime"]
+            if job["expires"] is not None:
+                remaining = job["expires"] - time.monotonic()
+                movetime = remaining if movetime is None else min(movetime, remaining)
+            self._running[index] = job
+            self._tasks[index].put((job["fen"], job["depth"], movetime, job["nodes"]))
+
+    async def _collect(self) -> None:
+        """
+        Hand the results of the engine processes to the waiting jobs
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, self._results.get)
+            if item is None:
+                return
+            index, result = item
+            job = self._running.pop(index)
+            if not job["future"].done():
+                job["future"].set_result(result)
+            self._idle.put_nowait(index)
+
+    def stats(self) -> dict:
+        """
+        :return: dict: queued and running job counts
+        """
+        return {"queued": len(self._queue), "running": len(self._running), "workers": self.worker_count}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve one connection: every request line becomes a job, answers are
+        written as they complete. Jobs still queued when the connection
+        breaks are dropped.
+        """
+        pending = set()
+
+        async def answer(request):
+            try:
+                if request.get("stats"):
+                    response = self.stats()
+                else:
+                    response = await self.submit(request)
+            except (ValueError, TypeError) as error:
+                response = {"id": request.get("id"), "error": str(error)}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("a request must be a JSON object")
+                except ValueError as error:
+                    writer.write(json.dumps({"error": f"invalid request: {error}"}).encode() + b"\n")
+                    continue
+                task = asyncio.create_task(answer(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def close(self) -> None:
+        """
+        Stop listening, stop the engine processes and the dispatching tasks
+        :return:
+        """
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for task in self._background[:1]:
+            task.cancel()
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            await asyncio.get_running_loop().run_in_executor(None, process.join)
+        self._results.put(None)
+        await self._background[1]
+        for _, _, job in self._queue:
+            if not job["future"].done():
+                job["future"].cancel()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,42 @@
+"""
+Run the analysis server (JSON lines, see AnalysisServer).
+
+    python -m src.server [--host HOST] [--port PORT] [--unix PATH]
+                         [--workers N] [--hash MB]
+"""
+import argparse
+import asyncio
+import sys
+
+from src.server.AnalysisServer import AnalysisServer
+
+
+async def serve(args) -> None:
+    async with AnalysisServer(args.workers, args.hash) as server:
+        if args.unix:
+            await server.listen_unix(args.unix)
+            print(f"listening on {args.unix}", flush=True)
+        else:
+            port = await server.listen_tcp(args.host, args.port)
+            print(f"listening on {args.host}:{port}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.server", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="engine processes, all CPUs by default")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size per process in MB")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
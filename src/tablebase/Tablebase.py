@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+
+from src import config
+from src.game.Game import Game
+from src.tablebase.indexing import TableLayout, normalize
+from src.utils.attacks import PAWN_ATTACKS
+
+MAGIC = b"CHESSTB\0"
+VERSION = 1
+# Magic, version, bits per entry, material name, entry count
+HEADER_STRUCT = struct.Struct("<8sHH12sQ")
+HEADER_SIZE = HEADER_STRUCT.size
+EXTENSION = ".tb"
+DEFAULT_DIRECTORY = os.path.join(config.CACHE_PATH, "tablebases")
+
+# Entry values: 0 for a draw, otherwise the distance to mate in plies + 1.
+# An odd distance is a win for the side to move, an even one a loss.
+DRAW = 0
+
+
+class Table:
+    """
+    One table file mapped read-only, entries are packed on a fixed number of bits
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, bits, name, size = HEADER_STRUCT.unpack(file.read(HEADER_SIZE))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path}: not a tablebase file or unsupported version")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.bits = bits
+        self.layout = TableLayout(name.rstrip(b"\0").decode("ascii"))
+        if size != self.layout.size or len(self._mmap) < HEADER_SIZE + (size * bits + 7) // 8:
+            raise ValueError(f"{path}: truncated tablebase file")
+        self._mask = (1 << bits) - 1
+
+    def value(self, index: int) -> int:
+        """
+        Entry of an index (see DRAW)
+        """
+        if not self.bits:
+            return DRAW
+        bit = index * self.bits
+        offset = HEADER_SIZE + (bit >> 3)
+        # An entry spans 2 bytes at most (bits <= 8)
+        return (int.from_bytes(self._mmap[offset:offset + 2], "little") >> (bit & 7)) & self._mask
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class Tablebase:
+    """
+    Set of endgame tables of a directory, opened on first use.
+    A probe normalizes the position, computes its index and reads one
+    entry, whatever the table size.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY):
+        """
+        :param directory: str: directory of the .tb files (see src.tablebase.generator)
+        """
+        self.directory = directory
+        self.tables = {}
+        self.max_pieces = 0
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.endswith(EXTENSION):
+                    name = filename[:-len(EXTENSION)]
+                    self.tables[name] = None
+                    self.max_pieces = max(self.max_pieces, len(name) - 1)
+
+    def table(self, name: str) -> Table:
+        """
+        Table of a material signature
+        :return: Table or None if the directory does not have it
+        """
+        table = self.tables.get(name)
+        if table is None and name in self.tables:
+            table = self.tables[name] = Table(os.path.join(self.directory, name + EXTENSION))
+        return table
+
+    def probe_pieces(self, pieces, turn: int) -> int:
+        """
+        Entry of a position given as a piece list
+        :param pieces: iterable of (piece index, square)
+        :param turn: int: side to move, 0 for white, 1 for black
+        :return: int: entry (see DRAW), None if no table covers the position
+        """
+        name, squares, turn = normalize(pieces, turn)
+        if name == "KvK":
+            return DRAW
+        table = self.table(name)
+        if table is None:
+            return None
+        return table.value(table.layout.index(squares, turn))
+
+    def probe(self, game: Game) -> tuple:
+        """
+        Look up a position. Castling rights and en passant captures are not
+        part of the tables, positions where they are possible are not probed.
+        :param game: Game: position to look up
+        :return: tuple: (result, distance to mate in plies), result is 1 for
+            a win of the side to move, 0 for a draw, -1 for a loss; None if
+            no table covers the position
+        """
+        occupied = game.white_pieces | game.black_pieces
+        if occupied.bit_count() > self.max_pieces or game.castling_rights:
+            return None
+        en_passant = game.en_passant_square
+        if en_passant:
+            pawns = game.white_pawns if game.turn == 0 else game.black_pawns
+            if PAWN_ATTACKS[game.turn ^ 1][en_passant.bit_length() - 1] & pawns:
+                return None
+        board = game.board
+        pieces = []
+        while occupied:
+            square = (occupied & -occupied).bit_length() - 1
+            pieces.append((board[square], square))
+            occupied &= occupied - 1
+        value = self.probe_pieces(pieces, game.turn)
+        if value is None:
+            return None
+        if value == DRAW:
+            return 0, 0
+        distance = value - 1
+        return (1 if distance & 1 else -1), distance
+
+    def close(self) -> None:
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = dict.fromkeys(self.tables)
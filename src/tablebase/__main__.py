@@ -0,0 +1,43 @@
+"""
+Generate endgame tables.
+
+    python -m src.tablebase KQvK KRvK KPvK [--directory DIR] [--processes N]
+    python -m src.tablebase --all 4 [--directory DIR] [--processes N]
+
+Missing tables reached by captures and promotions are generated first.
+"""
+import argparse
+import sys
+import time
+
+from src.tablebase.generator import all_materials, generate
+from src.tablebase.Tablebase import DEFAULT_DIRECTORY
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.tablebase", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("materials", nargs="*", help="material signatures, e.g. KQvKR")
+    parser.add_argument("--all", type=int, metavar="PIECES", help="every table up to PIECES pieces")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    parser.add_argument("--processes", type=int, help="worker processes, all CPUs by default")
+    args = parser.parse_args(argv)
+    names = list(args.materials)
+    if args.all:
+        names += all_materials(args.all)
+    if not names:
+        parser.error("no table to generate")
+
+    start = time.perf_counter()
+    try:
+        paths = generate(names, args.directory, args.processes, info=print)
+    except ValueError as error:
+        parser.error(str(error))
+    for path in paths:
+        print(f"wrote {path}")
+    print(f"time {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""
+Retrograde generation of endgame tables.
+
+Every position of a table is first scanned once (checkmates, stalemates,
+illegal positions, and the moves leaving the table, captures and
+promotions, which are looked up in the smaller tables). Then positions are
+resolved by increasing distance to mate, one layer per ply:
+- odd layers are wins: a position with a move to a loss of the previous
+  layer wins,
+- even layers are losses: a position whose moves all reach wins, the
+  longest one in the previous layer, loses.
+Only the predecessors of the positions resolved in the previous layer,
+found by playing moves backwards, are examined. What is never resolved is
+a draw.
+
+The table values live in shared memory and every step is split between
+the processes of a multiprocessing pool.
+"""
+import itertools
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.tablebase.indexing import PIECE_LETTERS, TableLayout, material_name, parse_material, side_name
+from src.tablebase.Tablebase import (
+    DEFAULT_DIRECTORY,
+    EXTENSION,
+    HEADER_STRUCT,
+    MAGIC,
+    VERSION,
+    Tablebase,
+)
+from src.utils import constants
+from src.utils.attacks import KING_ATTACKS, KNIGHT_ATTACKS
+from src.utils.magic import bishop_attacks, rook_attacks
+
+# Generation values, besides the final entries (distance to mate + 1)
+UNKNOWN = 0
+INVALID = 255
+
+_TACTICAL = constants.CAPTURE_FLAG | constants.PROMOTION_FLAG
+_PAWN_RANKS = constants.FIRST_RANK | constants.EIGHTH_RANK
+
+# Table being generated in a pool process
+_worker = None
+
+
+class _Worker:
+    """
+    Per process generation state: the shared values, a Game reused for
+    every position and the smaller tables for the moves leaving the table
+    """
+
+    def __init__(self, name: str, shm_name: str, directory: str):
+        self.layout = TableLayout(name)
+        self.pieces = self.layout.pieces
+        self.shm = SharedMemory(name=shm_name)
+        self.values = self.shm.buf
+        self.tablebase = Tablebase(directory)
+        self.game = Game()
+        self.generator = MoveGenerator(self.game)
+        self.moves = self.generator.moves
+        self.pawn_slots = [
+            slot for slot, piece in enumerate(self.pieces) if piece % 6 == constants.PAWN
+        ]
+
+    def set_position(self, squares: list, turn: int) -> bool:
+        """
+        Set up a position on the Game
+        :return: bool: False if the position is illegal (the side not to move is in check)
+        """
+        game = self.game
+        board = game.board
+        for square in range(64):
+            board[square] = constants.NO_PIECE
+        bitboards = game.bitboards
+        bitboards[:12] = [0] * 12
+        for piece, square in zip(self.pieces, squares):
+            bitboards[piece] |= 1 << square
+            board[square] = piece
+        game.update_occupancy()
+        game.turn = turn
+        return not game.attacked_squares(turn) & bitboards[6 * (turn ^ 1) + constants.KING]
+
+    def child_value(self, squares: list, turn: int, move: int) -> int:
+        """
+        Value of the position reached by a move, from the table being
+        generated or from a smaller table for captures and promotions
+        """
+        from_square = move & 0x3F
+        to_square = (move >> 6) & 0x3F
+        flag = move >> 12
+        if not flag & _TACTICAL:
+            child = list(squares)
+            child[squares.index(from_square)] = to_square
+            return self.values[self.layout.index(child, turn ^ 1)]
+
+        pieces = []
+        for piece, square in zip(self.pieces, squares):
+            if square == to_square:
+                continue  # Captured
+            if square == from_square:
+                if flag & constants.PROMOTION_FLAG:
+                    piece = 6 * turn + constants.KNIGHT + (flag & 3)
+                square = to_square
+            pieces.append((piece, square))
+        value = self.tablebase.probe_pieces(pieces, turn ^ 1)
+        if value is None:
+            raise ValueError(f"{self.layout.name}: missing table for {pieces}")
+        return value
+
+    def predecessors(self, index: int) -> set:
+        """
+        Indexes of the positions from which a move of the side that just
+        moved reaches the position (captures and promotions excluded, they
+        come from other tables)
+        """
+        layout = self.layout
+        squares, turn = layout.decode(index)
+        mover = turn ^ 1
+        occupied = 0
+        for square in squares:
+            occupied |= 1 << square
+        empty = ~occupied & constants.BOARD_MASK
+        found = set()
+        for slot, piece in enumerate(self.pieces):
+            if piece // 6 != mover:
+                continue
+            square = squares[slot]
+            kind = piece % 6
+            if kind == constants.PAWN:
+                back = 8 if mover == 0 else -8
+                sources = 1 << (square - back) & empty & ~_PAWN_RANKS
+                # Double push back to the second / seventh rank
+                if sources and square >> 3 == (3 if mover == 0 else 4):
+                    sources |= 1 << (square - 2 * back) & empty
+            elif kind == constants.KNIGHT:
+                sources = KNIGHT_ATTACKS[square] & empty
+            elif kind == constants.BISHOP:
+                sources = bishop_attacks(square, occupied) & empty
+            elif kind == constants.ROOK:
+                sources = rook_attacks(square, occupied) & empty
+            elif kind == constants.QUEEN:
+                sources = (bishop_attacks(square, occupied) | rook_attacks(square, occupied)) & empty
+            else:
+                sources = KING_ATTACKS[square] & empty
+            while sources:
+                source = sources & -sources
+                sources ^= source
+                previous = list(squares)
+                previous[slot] = source.bit_length() - 1
+                found.add(layout.index(previous, mover))
+        return found
+
+    def is_loss(self, index: int, layer: int) -> bool:
+        """
+        Check if every move of a position reaches a win of the opponent,
+        the longest one resolved in the previous layer
+        """
+        squares, turn = self.layout.decode(index)
+        self.set_position(squares, turn)
+        moves = self.moves
+        count = self.generator.generate_legal_moves(moves)
+        longest = -1
+        for i in range(count):
+            value = self.child_value(squares, turn, moves[i])
+            # Odd distances are wins of the side to move of the child
+            if value == UNKNOWN or value == INVALID or not (value - 1) & 1:
+                return False
+            longest = max(longest, value - 1)
+        return longest + 1 == layer
+
+
+def _init_worker(name: str, shm_name: str, directory: str) -> None:
+    global _worker
+    _worker = _Worker(name, shm_name, directory)
+
+
+def _scan(start: int, end: int) -> tuple:
+    """
+    First pass over a range of indexes: mark illegal positions and
+    checkmates, and schedule the positions whose moves leave the table
+    :return: tuple: (checkmate indexes, list of (layer, index))
+    """
+    worker = _worker
+    layout = worker.layout
+    values = worker.values
+    moves = worker.moves
+    generator = worker.generator
+    piece_count = layout.piece_count
+    checkmates = []
+    events = []
+    for index in range(start, end):
+        squares, turn = layout.decode(index)
+        if (
+            len(set(squares)) != piece_count
+            or any(1 << squares[slot] & _PAWN_RANKS for slot in worker.pawn_slots)
+            or layout.index(squares, turn) != index
+            or not worker.set_position(squares, turn)
+        ):
+            values[index] = INVALID
+            continue
+        count = generator.generate_legal_moves(moves)
+        if not count:
+            if generator.checkers:
+                values[index] = 1  # Mated, distance 0
+                checkmates.append(index)
+            continue  # Stalemates stay draws
+
+        win_layer = 0
+        loss_layer = 0
+        for i in range(count):
+            move = moves[i]
+            if move >> 12 & _TACTICAL:
+                value = worker.child_value(squares, turn, move)
+                if value == UNKNOWN:
+                    continue
+                distance = value - 1
+                if distance & 1:
+                    loss_layer = max(loss_layer, distance + 1)
+                elif not win_layer or distance + 1 < win_layer:
+                    win_layer = distance + 1
+        if win_layer:
+            events.append((win_layer, index))
+        elif loss_layer:
+            events.append((loss_layer, index))
+    return checkmates, events
+
+
+def _resolve_layer(frontier: list, candidates: list, layer: int) -> list:
+    """
+    Resolve the positions of a layer among the predecessors of the
+    previous layer positions and the scheduled candidates
+    :return: list: indexes resolved in this layer
+    """
+    worker = _worker
+    values = worker.values
+    found = set(candidates)
+    for index in frontier:
+        found |= worker.predecessors(index)
+    resolved = []
+    for index in found:
+        if values[index] != UNKNOWN:
+            continue
+        if layer & 1 or worker.is_loss(index, layer):
+            values[index] = layer + 1
+            resolved.append(index)
+    return resolved
+
+
+def _split(items: list, parts: int) -> list:
+    return [items[part::parts] for part in range(parts)]
+
+
+def _write_table(path: str, name: str, values: np.ndarray) -> None:
+    """
+    Bit-pack the entries of a table and write its file
+    """
+    bits = int(values.max(initial=0)).bit_length()
+    if bits:
+        planes = (values[:, None] >> np.arange(bits, dtype=np.uint8)) & 1
+        data = np.packbits(planes.ravel(), bitorder="little").tobytes() + b"\0"
+    else:
+        data = b""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER_STRUCT.pack(MAGIC, VERSION, bits, name.encode("ascii"), len(values)))
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def dependencies(name: str) -> list:
+    """
+    Tables reached by one capture and / or promotion from a table
+    :param name: str: material signature
+    :return: list: material signatures
+    """
+    pieces = parse_material(name)
+    found = set()
+    others = [None] + list(range(2, len(pieces)))
+    for promoted in others:
+        if promoted is not None and pieces[promoted] % 6 != constants.PAWN:
+            continue
+        for captured in others:
+            if captured is not None and (
+                captured == promoted
+                or promoted is not None and pieces[captured] // 6 == pieces[promoted] // 6
+            ):
+                continue
+            if promoted is None and captured is None:
+                continue
+            for promotion in (range(constants.KNIGHT, constants.KING) if promoted is not None else (None,)):
+                result = list(pieces)
+                if promoted is not None:
+                    result[promoted] = pieces[promoted] // 6 * 6 + promotion
+                if captured is not None:
+                    del result[captured]
+                child, _ = material_name(
+                    side_name(piece for piece in result if piece < 6),
+                    side_name(piece for piece in result if piece >= 6),
+                )
+                if child != "KvK":
+                    found.add(child)
+    return sorted(found)
+
+
+def all_materials(max_pieces: int) -> list:
+    """
+    Every material signature of 3 to max_pieces pieces
+    :param max_pieces: int: largest piece count
+    :return: list: material signatures, smallest tables first
+    """
+    names = set()
+    for extra in range(1, max_pieces - 1):
+        for pieces in itertools.combinations_with_replacement("QRBNP", extra):
+            for white_count in range(extra + 1):
+                for white in itertools.combinations(range(extra), white_count):
+                    white_letters = "K" + "".join(pieces[i] for i in white)
+                    black_letters = "K" + "".join(
+                        pieces[i] for i in range(extra) if i not in white
+                    )
+                    names.add(material_name(
+                        side_name(PIECE_LETTERS.index(letter) for letter in white_letters),
+                        side_name(PIECE_LETTERS.index(letter) for letter in black_letters),
+                    )[0])
+    return sorted(names, key=lambda name: (len(name), name))
+
+
+def generate_table(name: str, directory: str = DEFAULT_DIRECTORY, processes: int = None, info=None) -> str:
+    """
+    Generate one table, its dependencies must already be in directory
+    :param name: str: material signature, e.g. "KQvKR"
+    :param directory: str: directory of the table files
+    :param processes: int: number of processes, defaults to the number of CPUs
+    :param info: callable(message) receiving progress messages
+    :return: str: path of the table file
+    """
+    layout = TableLayout(name)
+    name = layout.name
+    processes = processes or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+    shm = SharedMemory(create=True, size=layout.size)
+    try:
+        shm.buf[:layout.size] = bytes(layout.size)
+        with multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=(name, shm.name, directory)
+        ) as pool:
+            step = -(-layout.size // (8 * processes))
+            scans = pool.starmap(
+                _scan, [(start, min(start + step, layout.size)) for start in range(0, layout.size, step)]
+            )
+            frontier = []
+            events = {}
+            for checkmates, scheduled in scans:
+                frontier.extend(checkmates)
+                for layer, index in scheduled:
+                    events.setdefault(layer, []).append(index)
+            if info is not None:
+                info(f"{name}: {layout.size} positions, {len(frontier)} checkmates")
+
+            layer = 1
+            while frontier or events:
+                candidates = events.pop(layer, [])
+                resolved = set()
+                for indexes in pool.starmap(
+                    _resolve_layer,
+                    zip(_split(frontier, 4 * processes), _split(candidates, 4 * processes),
+                        [layer] * (4 * processes)),
+                ):
+                    resolved.update(indexes)
+                frontier = sorted(resolved)
+                if info is not None and frontier:
+                    info(f"{name}: {'wins' if layer & 1 else 'losses'} in {layer}: {len(frontier)}")
+                layer += 1
+
+        values = np.frombuffer(shm.buf, dtype=np.uint8, count=layout.size).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    values[values == INVALID] = 0
+    path = os.path.join(directory, name + EXTENSION)
+    _write_table(path, name, values)
+    return path
+
+
+def generate(names, directory: str = DEFAULT_DIRECTORY, processes: int = None, info=None) -> list:
+    """
+    Generate tables and, first, the tables they depend on that are missing
+    :param names: iterable of material signatures
+    :param directory: str: directory of the table files
+    :param processes: int: number of processes, defaults to the number of CPUs
+    :param info: callable(message) receiving progress messages
+    :return: list: paths of the generated tables
+    """
+    paths = []
+    done = set()
+
+    def visit(name):
+        if name in done:
+            return
+        done.add(name)
+        for dependency in dependencies(name):
+            if not os.path.exists(os.path.join(directory, dependency + EXTENSION)):
+                visit(dependency)
+        paths.append(generate_table(name, directory, processes, info))
+
+    for name in names:
+        visit(TableLayout(name).name)
+    return paths
@@ -0,0 +1,177 @@
+"""
+Position indexing of the endgame tables.
+
+A table covers one material signature such as "KQvKR", white holding the
+stronger side. Its pieces are kept in a fixed order: white king, black
+king, then the other white pieces and the other black pieces, strongest
+first. A position is the square of each piece plus the side to move.
+
+Symmetry reduction: without pawns the board has 8 symmetries and the white
+king is brought into the a1-d1-d4 triangle (10 squares); with pawns only
+the left-right mirror applies and the white king is brought to files a-d
+(32 squares). Among the symmetric images still allowed, identical pieces
+sorted, the lowest index is the canonical one.
+"""
+from src.utils import constants
+
+PIECE_LETTERS = "PNBRQK"
+# Letters of a side, strongest first
+_LETTER_ORDER = "KQRBNP"
+
+TRIANGLE_SQUARES = (0, 1, 2, 3, 9, 10, 11, 18, 19, 27)  # a1 b1 c1 d1 b2 c2 d2 c3 d3 d4
+HALF_BOARD_SQUARES = tuple(square for square in range(64) if square & 7 < 4)
+
+
+def _transform(square: int, flip_file: bool, flip_rank: bool, flip_diagonal: bool) -> int:
+    if flip_diagonal:
+        square = (square & 7) << 3 | square >> 3
+    if flip_file:
+        square ^= 7
+    if flip_rank:
+        square ^= 56
+    return square
+
+
+# Square mapping of each symmetry, the identity first
+SYMMETRIES = tuple(
+    tuple(_transform(square, flip_file, flip_rank, flip_diagonal) for square in range(64))
+    for flip_diagonal in (False, True)
+    for flip_rank in (False, True)
+    for flip_file in (False, True)
+)
+MIRROR_SYMMETRIES = SYMMETRIES[:2]  # Identity and left-right mirror
+
+
+def side_name(pieces) -> str:
+    """
+    Letters of the pieces of one side, strongest first
+    :param pieces: iterable of piece indexes of one color
+    :return: str: e.g. "KRP"
+    """
+    return "".join(sorted((PIECE_LETTERS[piece % 6] for piece in pieces), key=_LETTER_ORDER.index))
+
+
+def _side_strength(name: str) -> tuple:
+    return len(name), [-_LETTER_ORDER.index(letter) for letter in name]
+
+
+def material_name(white: str, black: str) -> tuple:
+    """
+    Table name of a material distribution
+    :param white: str: letters of the white pieces (see side_name)
+    :param black: str: letters of the black pieces
+    :return: tuple: (table name, True if the colors must be swapped to use it)
+    """
+    if _side_strength(black) > _side_strength(white):
+        return f"{black}v{white}", True
+    return f"{white}v{black}", False
+
+
+def parse_material(name: str) -> tuple:
+    """
+    Piece indexes of a table in the table order
+    :param name: str: material signature, e.g. "KQvKR"
+    :return: tuple: piece indexes
+    """
+    try:
+        white, black = name.upper().split("V")
+        white_pieces = sorted((PIECE_LETTERS.index(letter) for letter in white), reverse=True)
+        black_pieces = sorted((PIECE_LETTERS.index(letter) + 6 for letter in black), reverse=True)
+    except ValueError:
+        raise ValueError(f"invalid material {name!r}") from None
+    if white_pieces.count(constants.KING) != 1 or black_pieces.count(6 + constants.KING) != 1:
+        raise ValueError(f"invalid material {name!r}: one king per side")
+    if material_name(white, black)[1]:
+        raise ValueError(f"invalid material {name!r}: the stronger side must be white")
+    white_pieces.remove(constants.KING)
+    black_pieces.remove(6 + constants.KING)
+    return (constants.KING, 6 + constants.KING, *white_pieces, *black_pieces)
+
+
+class TableLayout:
+    """
+    Index <-> position mapping of one material signature
+    """
+
+    def __init__(self, name: str):
+        """
+        :param name: str: material signature, e.g. "KQvKR"
+        """
+        self.name = name
+        self.pieces = parse_material(name)
+        self.piece_count = len(self.pieces)
+        self.has_pawns = any(piece % 6 == constants.PAWN for piece in self.pieces)
+        self.king_squares = HALF_BOARD_SQUARES if self.has_pawns else TRIANGLE_SQUARES
+        self.king_indexes = [-1] * 64
+        for index, square in enumerate(self.king_squares):
+            self.king_indexes[square] = index
+        # Symmetries bringing a white king square into the allowed region
+        symmetries = MIRROR_SYMMETRIES if self.has_pawns else SYMMETRIES
+        self.king_symmetries = tuple(
+            tuple({symmetry for symmetry in symmetries if symmetry[square] in self.king_squares})
+            for square in range(64)
+        )
+        # Slices of identical pieces (after the kings)
+        self.groups = []
+        start = 2
+        for index in range(3, self.piece_count + 1):
+            if index == self.piece_count or self.pieces[index] != self.pieces[start]:
+                if index - start > 1:
+                    self.groups.append((start, index))
+                start = index
+        self.turn_stride = len(self.king_squares) * 64 ** (self.piece_count - 1)
+        self.size = 2 * self.turn_stride
+
+    def index(self, squares, turn: int) -> int:
+        """
+        Canonical index of a position
+        :param squares: sequence of the square of each piece, in table order
+        :param turn: int: side to move, 0 for white, 1 for black
+        :return: int: index in the table
+        """
+        best = None
+        for symmetry in self.king_symmetries[squares[0]]:
+            mapped = [symmetry[square] for square in squares]
+            for start, end in self.groups:
+                mapped[start:end] = sorted(mapped[start:end])
+            index = self.king_indexes[mapped[0]]
+            for square in mapped[1:]:
+                index = index << 6 | square
+            if best is None or index < best:
+                best = index
+        return turn * self.turn_stride + best
+
+    def decode(self, index: int) -> tuple:
+        """
+        Position of an index
+        :param index: int: index in the table
+        :return: tuple: (list of squares in table order, side to move)
+        """
+        turn, index = divmod(index, self.turn_stride)
+        squares = [0] * self.piece_count
+        for slot in range(self.piece_count - 1, 0, -1):
+            squares[slot] = index & 0x3F
+            index >>= 6
+        squares[0] = self.king_squares[index]
+        return squares, turn
+
+
+def normalize(pieces, turn: int) -> tuple:
+    """
+    Table name and table order squares of a position, swapping colors
+    (and mirroring ranks) when black holds the stronger side
+    :param pieces: iterable of (piece index, square)
+    :param turn: int: side to move, 0 for white, 1 for black
+    :return: tuple: (table name, squares in table order, side to move in the table)
+    """
+    pieces = list(pieces)
+    name, swap = material_name(
+        side_name(piece for piece, _ in pieces if piece < 6),
+        side_name(piece for piece, _ in pieces if piece >= 6),
+    )
+    if swap:
+        pieces = [((piece + 6) % 12, square ^ 56) for piece, square in pieces]
+        turn ^= 1
+    # Table order: kings, then strongest pieces first, white before black
+    pieces.sort(key=lambda item: (item[0] % 6 != constants.KING, item[0] >= 6, -item[0]))
+    return name, [square for _, square in pieces], turn
@@ -0,0 +1,282 @@
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import signal
+import sys
+
+from src import config
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.tournament import stats
+from src.tournament.players import create_player
+from src.utils.utils import move_to_uci
+
+# Default adjudication rules
+ADJUDICATION = {
+    "max_plies": 400,  # Draw after this many plies
+    "draw_move": 40,  # Draw adjudication starts at this move number...
+    "draw_score": 10,  # ...when both engines report |score| <= draw_score...
+    "draw_plies": 8,  # ...for this many consecutive plies
+    "resign_score": 1000,  # Win when both engines agree on |score| >= resign_score...
+    "resign_plies": 6,  # ...for this many consecutive plies
+}
+
+RESULTS = ("1-0", "1/2-1/2", "0-1")
+
+
+def load_openings(path: str) -> list:
+    """
+    Read an opening suite, one FEN or EPD per line (EPD operations are
+    dropped), blank and "#" lines skipped
+    :param path: str: FEN / EPD file
+    :return: list: FEN strings
+    """
+    openings = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+                fen = " ".join(fields[:6])
+            else:
+                fen = " ".join(fields[:4]) + " 0 1"
+            Game(fen=fen)  # Raises on a malformed line
+            openings.append(fen)
+    if not openings:
+        raise ValueError(f"{path}: no opening position")
+    return openings
+
+
+def _repetitions(game: Game) -> int:
+    """
+    Number of earlier occurrences of the current position
+    """
+    key = game.zobrist_key
+    stack = game.undo_stack
+    oldest = max(len(stack) - game.halfmove_clock, 0)
+    return sum(1 for index in range(len(stack) - 2, oldest - 1, -2) if stack[index] >> 47 == key)
+
+
+def _insufficient_material(game: Game) -> bool:
+    """
+    True with bare kings or a single minor piece left
+    """
+    if game.white_pawns | game.black_pawns | game.white_rooks | game.black_rooks:
+        return False
+    if game.white_queens | game.black_queens:
+        return False
+    minors = game.white_knights | game.white_bishops | game.black_knights | game.black_bishops
+    return minors.bit_count() <= 1
+
+
+def play_game(players: tuple, fen: str, adjudication: dict = None) -> dict:
+    """
+    Play one game to its end or adjudication
+    :param players: tuple: (white player, black player), see src.tournament.players
+    :param fen: str: starting position
+    :param adjudication: dict: rules, see ADJUDICATION
+    :return: dict: {"result": "1-0" / "1/2-1/2" / "0-1", "reason": str, "moves": [UCI moves]}
+    """
+    rules = {**ADJUDICATION, **(adjudication or {})}
+    game = Game(fen=fen)
+    generator = MoveGenerator(game)
+    for player in players:
+        player.new_game()
+    moves = []
+    draw_streak = 0
+    win_streak = 0  # Plies in a row with both engines agreeing, sign gives the side
+    while True:
+        if not generator.generate_legal_moves(generator.moves):
+            if generator.checkers:
+                return _outcome(game.turn ^ 1, "checkmate", moves)
+            return _outcome(None, "stalemate", moves)
+        if game.halfmove_clock >= 100:
+            return _outcome(None, "fifty moves", moves)
+        if _repetitions(game) >= 2:
+            return _outcome(None, "threefold repetition", moves)
+        if _insufficient_material(game):
+            return _outcome(None, "insufficient material", moves)
+        if len(moves) >= rules["max_plies"]:
+            return _outcome(None, "move limit", moves)
+
+        move, score = players[game.turn].play(game, fen, moves)
+        white_score = -score if game.turn else score
+        if game.fullmove_number >= rules["draw_move"] and abs(score) <= rules["draw_score"]:
+            draw_streak += 1
+        else:
+            draw_streak = 0
+        if abs(score) >= rules["resign_score"]:
+            sign = 1 if white_score > 0 else -1
+            win_streak = win_streak + sign if win_streak * sign >= 0 else sign
+        else:
+            win_streak = 0
+        moves.append(move_to_uci(move))
+        game.make_move(move)
+        if draw_streak >= rules["draw_plies"]:
+            return _outcome(None, "adjudicated draw", moves)
+        if abs(win_streak) >= rules["resign_plies"]:
+            return _outcome(0 if win_streak > 0 else 1, "adjudicated win", moves)
+
+
+def _outcome(winner: int, reason: str, moves: list) -> dict:
+    """
+    :param winner: int: 0 for white, 1 for black, None for a draw
+    """
+    result = RESULTS[1] if winner is None else RESULTS[2 * winner]
+    return {"result": result, "reason": reason, "moves": moves}
+
+
+# Players of a pool process, created once by _init_worker
+_players = None
+
+
+def _init_worker(engines: tuple) -> None:
+    global _players
+    _players = tuple(create_player(options) for options in engines)
+    # Pool.terminate() sends SIGTERM: exit through SystemExit instead so that
+    # the finalizers run and the UCI engines are told to quit
+    signal.signal(signal.SIGTERM, _exit_worker)
+    multiprocessing.util.Finalize(None, _close_players, exitpriority=10)
+
+
+def _exit_worker(signum: int, frame) -> None:
+    sys.exit(0)
+
+
+def _close_players() -> None:
+    for player in _players:
+        player.close()
+
+
+def _play_task(task: tuple) -> dict:
+    index, opening_index, fen, first_white, adjudication = task
+    white, black = (_players[0], _players[1]) if first_white else (_players[1], _players[0])
+    record = {"game": index, "opening": opening_index, "fen": fen, "white": 0 if first_white else 1}
+    record.update(play_game((white, black), fen, adjudication))
+    return record
+
+
+class Tournament:
+    """
+    Match between two engines over an opening suite. Every opening is played
+    twice with colors reversed; games run in parallel in a process pool
+    where each process keeps its two players (and their UCI subprocesses)
+    for all its games. Each finished game is appended to a JSONL file, a
+    run started again on the same file skips the games already recorded.
+    With SPRT bounds the match stops as soon as a hypothesis is accepted.
+    """
+
+    def __init__(
+        self, engines: tuple, output: str, openings: list = None, games: int = 100, processes: int = None,
+        adjudication: dict = None, sprt: tuple = None,
+    ):
+        """
+        :param engines: tuple: options of the two engines (see players.parse_engine)
+        :param output: str: JSONL file of the game records, resumed if it exists
+        :param openings: list: starting FENs, the initial position by default
+        :param games: int: number of games
+        :param processes: int: worker processes, the number of CPUs by default
+        :param adjudication: dict: rules overriding ADJUDICATION
+        :param sprt: tuple: (elo0, elo1, alpha, beta) to stop early, None to play every game
+        """
+        self.engines = tuple(engines)
+        self.output = output
+        self.openings = openings or [config.BASE_FEN]
+        self.games = games
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.adjudication = adjudication
+        self.sprt = sprt
+        self.wins = self.draws = self.losses = 0
+        self.decision = None
+
+    def _count(self, record: dict) -> None:
+        """
+        Add a game to the score of the first engine
+        """
+        result = record["result"]
+        if result == RESULTS[1]:
+            self.draws += 1
+        elif (result == RESULTS[0]) == (record["white"] == 0):
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def _read_records(self) -> set:
+        """
+        Load the games of an interrupted run
+        :return: set: indexes of the games already played
+        """
+        done = set()
+        if not os.path.exists(self.output):
+            return done
+        with open(self.output, "rb+") as file:
+            size = 0  # Length of the complete lines
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Line cut by the interruption
+                size += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record["game"] not in done:
+                    done.add(record["game"])
+                    self._count(record)
+            # Drop the cut line, the next record would be appended to it
+            file.truncate(size)
+        return done
+
+    def status(self) -> dict:
+        """
+        :return: dict: score, Elo with error bar and SPRT state of the first engine
+        """
+        elo, error = stats.elo(self.wins, self.draws, self.losses)
+        status = {
+            "games": self.wins + self.draws + self.losses,
+            "wins": self.wins, "draws": self.draws, "losses": self.losses,
+            "elo": elo, "error": error,
+        }
+        if self.sprt is not None:
+            elo0, elo1, alpha, beta = self.sprt
+            status["llr"], self.decision = stats.sprt(
+                self.wins, self.draws, self.losses, elo0, elo1, alpha, beta
+            )
+            status["bounds"] = stats.sprt_bounds(alpha, beta)
+            status["decision"] = self.decision
+        return status
+
+    def run(self, info=None) -> dict:
+        """
+        Play the remaining games
+        :param info: callable(status dict) called after every game
+        :return: dict: final status (see status)
+        """
+        done = self._read_records()
+        if self.status().get("decision"):
+            return self.status()
+        tasks = [
+            (index, (index // 2) % len(self.openings), self.openings[(index // 2) % len(self.openings)],
+             index % 2 == 0, self.adjudication)
+            for index in range(self.games) if index not in done
+        ]
+        if not tasks:
+            return self.status()
+
+        # Spawned rather than forked, like the search processes
+        context = multiprocessing.get_context("spawn")
+        with open(self.output, "a") as output, context.Pool(
+            min(self.processes, len(tasks)), initializer=_init_worker, initargs=(self.engines,)
+        ) as pool:
+            for record in pool.imap_unordered(_play_task, tasks):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                self._count(record)
+                status = self.status()
+                if info is not None:
+                    info(status)
+                if self.decision:
+                    pool.terminate()
+                    break
+        return self.status()
@@ -0,0 +1,62 @@
+"""
+Play a match between two engines and report the Elo difference of the first.
+
+    python -m src.tournament ENGINE1 ENGINE2 --output games.jsonl [--games N]
+                             [--openings FILE] [--processes N]
+                             [--sprt ELO0 ELO1] [--alpha A] [--beta B]
+
+Engines are specifications such as "nodes=20000" or
+"uci=python -m src.uci,movetime=0.1" (see src.tournament.players).
+Running again with the same --output resumes the match.
+"""
+import argparse
+import sys
+
+from src.tournament.players import parse_engine
+from src.tournament.Tournament import Tournament, load_openings
+
+
+def _format(status: dict) -> str:
+    line = (
+        f"games {status['games']}  +{status['wins']} ={status['draws']} -{status['losses']}"
+        f"  elo {status['elo']:.1f} +/- {status['error']:.1f}"
+    )
+    if "llr" in status:
+        lower, upper = status["bounds"]
+        line += f"  llr {status['llr']:.2f} ({lower:.2f}, {upper:.2f})"
+    return line
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.tournament", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("engine1", help="engine under test")
+    parser.add_argument("engine2", help="reference engine")
+    parser.add_argument("--output", required=True, help="JSONL file of the games, resumed if it exists")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--openings", help="FEN / EPD file, each opening is played with both colors")
+    parser.add_argument("--processes", type=int, help="games played at once, all CPUs by default")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"),
+                        help="stop once one hypothesis is accepted")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    try:
+        engines = (parse_engine(args.engine1), parse_engine(args.engine2))
+        openings = load_openings(args.openings) if args.openings else None
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    tournament = Tournament(
+        engines, args.output, openings, args.games, args.processes,
+        sprt=(*args.sprt, args.alpha, args.beta) if args.sprt else None,
+    )
+    status = tournament.run(info=lambda status: print(_format(status), flush=True))
+    print(_format(status))
+    if status.get("decision"):
+        print(f"SPRT: {status['decision']} accepted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
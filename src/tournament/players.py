@@ -0,0 +1,164 @@
+"""
+Tournament players: the engine of this repository searched in-process, or
+any UCI engine run as a subprocess.
+
+A player is described by an engine specification, comma separated
+key=value pairs:
+
+    depth=6                       in-process, fixed depth
+    nodes=20000,hash=8            in-process, node budget, 8 MB table
+    uci=python -m src.uci,movetime=0.1
+
+Limits: depth, nodes, movetime (seconds); hash (MB) for the in-process
+engine; uci gives the command line of an external engine.
+"""
+import shlex
+import subprocess
+
+from src.engine.Search import MATE_SCORE, MAX_DEPTH, Search
+from src.engine.TranspositionTable import TranspositionTable
+from src.game.Game import Game
+from src.uci.UciEngine import parse_uci_move
+
+_INTEGER_OPTIONS = ("depth", "nodes", "hash")
+
+
+def parse_engine(spec: str) -> dict:
+    """
+    Parse an engine specification (see the module documentation)
+    :param spec: str: specification
+    :return: dict: options
+    """
+    options = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, separator, value = item.partition("=")
+        key = key.strip()
+        if not separator or key not in (*_INTEGER_OPTIONS, "movetime", "uci"):
+            raise ValueError(f"invalid engine option {item!r}")
+        if key in _INTEGER_OPTIONS:
+            options[key] = int(value)
+        elif key == "movetime":
+            options[key] = float(value)
+        else:
+            options[key] = value.strip()
+    if not any(key in options for key in ("depth", "nodes", "movetime")):
+        raise ValueError(f"engine {spec!r} has no depth, nodes or movetime limit")
+    return options
+
+
+def create_player(options: dict):
+    """
+    Player of parsed engine options
+    :param options: dict: see parse_engine
+    :return: SearchPlayer or UciPlayer
+    """
+    if "uci" in options:
+        return UciPlayer(options["uci"], options.get("depth"), options.get("movetime"), options.get("nodes"))
+    return SearchPlayer(
+        options.get("depth", MAX_DEPTH), options.get("movetime"), options.get("nodes"), options.get("hash", 16)
+    )
+
+
+class SearchPlayer:
+    """
+    The engine of this repository, searched in the calling process
+    """
+
+    def __init__(self, depth: int = MAX_DEPTH, movetime: float = None, nodes: int = None, hash_mb: int = 16):
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+        self.tt = TranspositionTable(hash_mb)
+
+    def new_game(self) -> None:
+        self.tt.clear()
+
+    def play(self, game: Game, start_fen: str, moves: list) -> tuple:
+        """
+        Choose a move
+        :param game: Game: current position, left unchanged
+        :param start_fen: str: starting position of the game
+        :param moves: list: moves played since, in UCI notation
+        :return: tuple: (encoded move, score from the side to move point of view)
+        """
+        search = Search(game, self.tt)
+        return search.search(depth=self.depth, movetime=self.movetime, nodes=self.nodes)
+
+    def close(self) -> None:
+        pass
+
+
+class UciPlayer:
+    """
+    External engine speaking UCI on its stdin / stdout
+    """
+
+    def __init__(self, command: str, depth: int = None, movetime: float = None, nodes: int = None):
+        self.command = command
+        go = ["go"]
+        if depth is not None:
+            go += ["depth", str(depth)]
+        if nodes is not None:
+            go += ["nodes", str(nodes)]
+        if movetime is not None:
+            go += ["movetime", str(max(1, round(movetime * 1000)))]
+        self._go = " ".join(go)
+        self.process = subprocess.Popen(
+            shlex.split(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1,
+        )
+        self._send("uci")
+        self._wait_for("uciok")
+
+    def _send(self, line: str) -> None:
+        self.process.stdin.write(line + "\n")
+        self.process.stdin.flush()
+
+    def _wait_for(self, token: str) -> list:
+        """
+        Read lines until one starts with token
+        :return: list: lines read, the token line last
+        """
+        lines = []
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"engine {self.command!r} exited")
+            lines.append(line.strip())
+            if lines[-1].startswith(token):
+                return lines
+
+    def new_game(self) -> None:
+        self._send("ucinewgame")
+        self._send("isready")
+        self._wait_for("readyok")
+
+    def play(self, game: Game, start_fen: str, moves: list) -> tuple:
+        """
+        Choose a move, see SearchPlayer.play
+        """
+        position = f"position fen {start_fen}"
+        if moves:
+            position += " moves " + " ".join(moves)
+        self._send(position)
+        self._send(self._go)
+        lines = self._wait_for("bestmove")
+        score = 0
+        for line in lines:
+            tokens = line.split()
+            if tokens[:1] == ["info"] and "score" in tokens:
+                index = tokens.index("score")
+                kind, value = tokens[index + 1], int(tokens[index + 2])
+                if kind == "cp":
+                    score = value
+                elif kind == "mate":
+                    score = MATE_SCORE - 2 * value + 1 if value > 0 else -MATE_SCORE - 2 * value
+        bestmove = lines[-1].split()[1]
+        return parse_uci_move(game, bestmove), score
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            try:
+                self._send("quit")
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
@@ -0,0 +1,101 @@
+"""
+Match statistics: Elo difference with its 95% error bar and the sequential
+probability ratio test (SPRT) deciding between two Elo hypotheses.
+
+Results are counted from the first engine's point of view as wins, draws
+and losses. The SPRT uses the normal approximation of the log-likelihood
+ratio on the game scores (as in the usual engine testing frameworks).
+"""
+import math
+
+# Two-sided 95% quantile of the normal distribution
+Z_95 = 1.959963984540054
+
+
+def expected_score(elo: float) -> float:
+    """
+    Expected score of an Elo difference
+    :param elo: float: rating difference
+    :return: float: score between 0 and 1
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(score: float) -> float:
+    """
+    Elo difference of an expected score, infinite at 0 and 1
+    :param score: float: score between 0 and 1
+    :return: float: rating difference
+    """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def _score_and_variance(wins: int, draws: int, losses: int) -> tuple:
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (
+        wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2
+    ) / games
+    return score, variance
+
+
+def elo(wins: int, draws: int, losses: int) -> tuple:
+    """
+    Elo difference and its 95% error bar
+    :return: tuple: (elo, error), (0, inf) without games
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0, math.inf
+    score, variance = _score_and_variance(wins, draws, losses)
+    if not variance:
+        return elo_difference(score), math.inf  # Identical results, no spread to measure
+    margin = Z_95 * math.sqrt(variance / games)
+    high = elo_difference(min(score + margin, 1))
+    low = elo_difference(max(score - margin, 0))
+    return elo_difference(score), (high - low) / 2
+
+
+def sprt_bounds(alpha: float = 0.05, beta: float = 0.05) -> tuple:
+    """
+    Log-likelihood ratio bounds of the SPRT
+    :param alpha: float: false positive rate (accepting H1 when H0 holds)
+    :param beta: float: false negative rate
+    :return: tuple: (lower bound, upper bound)
+    """
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """
+    Log-likelihood ratio of H1 (elo = elo1) against H0 (elo = elo0)
+    :return: float: ratio, 0 while it cannot be estimated
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0
+    score, variance = _score_and_variance(wins, draws, losses)
+    if variance == 0:
+        return 0.0
+    score0 = expected_score(elo0)
+    score1 = expected_score(elo1)
+    return games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+
+def sprt(wins: int, draws: int, losses: int, elo0: float = 0, elo1: float = 5,
+         alpha: float = 0.05, beta: float = 0.05) -> tuple:
+    """
+    Sequential test of elo1 against elo0
+    :return: tuple: (log-likelihood ratio, "H1" or "H0" once accepted, None while undecided)
+    """
+    llr = sprt_llr(wins, draws, losses, elo0, elo1)
+    lower, upper = sprt_bounds(alpha, beta)
+    if llr >= upper:
+        return llr, "H1"
+    if llr <= lower:
+        return llr, "H0"
+    return llr, None
@@ -0,0 +1,392 @@
+import asyncio
+import sys
+import threading
+import time
+
+from src import config
+from src.engine.OpeningBook import OpeningBook
+from src.engine.ParallelSearch import ParallelSearch
+from src.engine.Search import MATE_BOUND, MATE_SCORE, MAX_DEPTH, Search
+from src.engine.TranspositionTable import TranspositionTable
+from src.game.Game import Game
+from src.game.MoveGenerator import MoveGenerator
+from src.tablebase.Tablebase import Tablebase
+from src.utils.utils import move_to_uci
+
+ENGINE_NAME = "chess"
+ENGINE_AUTHOR = "Clément Coutet"
+# Seconds between two "info nodes ..." lines while searching
+INFO_INTERVAL = 1.0
+# Moves left assumed when the GUI does not send movestogo
+DEFAULT_MOVES_TO_GO = 30
+# Time kept aside for the communication with the GUI, in seconds
+MOVE_OVERHEAD = 0.05
+
+
+def parse_uci_move(game: Game, text: str, generator: MoveGenerator = None) -> int:
+    """
+    Decode a move in UCI notation (e2e4, e7e8q, ...)
+    :param game: Game: position the move is played from
+    :param text: str: move in UCI notation
+    :param generator: MoveGenerator: move generator of game, created if not given
+    :return: int: encoded move
+    """
+    if generator is None:
+        generator = MoveGenerator(game)
+    moves = generator.moves
+    count = generator.generate_legal_moves(moves)
+    for i in range(count):
+        if move_to_uci(moves[i]) == text:
+            return moves[i]
+    raise ValueError(f"illegal move {text!r}")
+
+
+def format_score(score: int) -> str:
+    """
+    UCI score of a search score: centipawns or mate in moves
+    """
+    if abs(score) >= MATE_BOUND:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+class UciEngine:
+    """
+    UCI front-end. Commands are read from stdin by an asyncio loop while
+    the search runs in a worker thread (or in the Lazy SMP processes with
+    Threads > 1), so "stop", "isready" and "ponderhit" are answered during
+    the search.
+    The position is kept between commands: when "position" repeats the
+    previous moves, only the new ones are played, and a shorter move list
+    takes moves back.
+    """
+
+    def __init__(self, output=None):
+        """
+        :param output: text stream the responses are written to, stdout by default
+        """
+        self.output = output if output is not None else sys.stdout
+        self._output_lock = threading.Lock()
+        self.hash_mb = 16
+        self.threads = 1
+        self.book_path = None
+        self.tablebase_path = None
+        self.tt = TranspositionTable(self.hash_mb)
+        self._parallel = None
+        self._book = None
+        self._tablebase = None
+
+        self.game = None
+        self.search = None
+        self._base_fen = None
+        self._played = []
+        self._set_position(config.BASE_FEN, [])
+
+        self._search_task = None
+        self._searcher = None
+        self._hold_bestmove = False
+        self._release = None
+        self._ponder_budget = None
+        self._ponder_timer = None
+
+    def send(self, line: str) -> None:
+        """
+        Write one response line, callable from the search thread
+        :return:
+        """
+        with self._output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    async def run(self, lines=None) -> None:
+        """
+        Process commands until "quit" or the end of input
+        :param lines: async iterator of command lines, stdin by default
+        :return:
+        """
+        lines = lines if lines is not None else self._stdin_lines()
+        async for line in lines:
+            if not await self.handle(line.strip()):
+                break
+        await self._stop_search()
+        if self._parallel is not None:
+            self._parallel.close()
+
+    @staticmethod
+    async def _stdin_lines():
+        """
+        Lines of stdin, read by a daemon thread so a blocked read never
+        delays the exit
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def read():
+            try:
+                for line in sys.stdin:
+                    loop.call_soon_threadsafe(queue.put_nowait, line)
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except RuntimeError:
+                pass  # Event loop closed
+
+        threading.Thread(target=read, daemon=True).start()
+        while (line := await queue.get()) is not None:
+            yield line
+
+    async def handle(self, line: str) -> bool:
+        """
+        Execute one command
+        :param line: str: command line
+        :return: bool: False once "quit" is received
+        """
+        command, _, arguments = line.partition(" ")
+        try:
+            return await self._dispatch(command, arguments)
+        except (ValueError, OSError) as error:
+            self.send(f"info string {error}")
+            return True
+
+    async def _dispatch(self, command: str, arguments: str) -> bool:
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send("option name Hash type spin default 16 min 1 max 4096")
+            self.send("option name Threads type spin default 1 min 1 max 64")
+            self.send("option name BookFile type string default <empty>")
+            self.send("option name TablebasePath type string default <empty>")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            await self._stop_search()
+            self._set_option(arguments)
+        elif command == "ucinewgame":
+            await self._stop_search()
+            self.tt.clear()
+            self._set_position(config.BASE_FEN, [])
+        elif command == "position":
+            await self._stop_search()
+            self._position(arguments.split())
+        elif command == "go":
+            await self._stop_search()
+            self._go(arguments.split())
+        elif command == "stop":
+            await self._stop_search()
+        elif command == "ponderhit":
+            self._ponderhit()
+        elif command == "quit":
+            return False
+        return True
+
+    def _set_option(self, arguments: str) -> None:
+        name, _, value = arguments.removeprefix("name ").partition(" value ")
+        name = name.strip().lower()
+        value = value.strip()
+        if name == "hash":
+            self.hash_mb = max(1, int(value))
+            self.tt = TranspositionTable(self.hash_mb)
+            self.search = None
+            self._close_parallel()
+        elif name == "threads":
+            self.threads = max(1, int(value))
+            self._close_parallel()
+        elif name == "bookfile":
+            self.book_path = value if value and value != "<empty>" else None
+            if self._book is not None:
+                self._book.close()
+            self._book = OpeningBook(self.book_path) if self.book_path else None
+        elif name == "tablebasepath":
+            self.tablebase_path = value if value and value != "<empty>" else None
+            self._tablebase = Tablebase(self.tablebase_path) if self.tablebase_path else None
+            self.search = None
+            self._close_parallel()
+
+    def _close_parallel(self) -> None:
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+
+    def _set_position(self, fen: str, moves: list) -> None:
+        self.game = Game(fen=fen)
+        self.search = None
+        self._base_fen = fen
+        self._played = []
+        self._play(moves)
+
+    def _play(self, moves: list) -> None:
+        generator = MoveGenerator(self.game)
+        for text in moves:
+            self.game.make_move(parse_uci_move(self.game, text, generator))
+            self._played.append(text)
+
+    def _position(self, tokens: list) -> None:
+        if not tokens:
+            return
+        if tokens[0] == "startpos":
+            fen = config.BASE_FEN
+            rest = tokens[1:]
+        elif tokens[0] == "fen":
+            end = tokens.index("moves") if "moves" in tokens else len(tokens)
+            fen = " ".join(tokens[1:end])
+            rest = tokens[end:]
+        else:
+            return
+        moves = rest[1:] if rest[:1] == ["moves"] else []
+
+        try:
+            if fen != self._base_fen:
+                self._set_position(fen, moves)
+                return
+            # Same start: keep the common moves, take back or play the difference
+            common = 0
+            while common < min(len(moves), len(self._played)) and moves[common] == self._played[common]:
+                common += 1
+            while len(self._played) > common:
+                self.game.unmake_move()
+                self._played.pop()
+            self._play(moves[common:])
+        except ValueError as error:
+            self.send(f"info string {error}")
+            self._set_position(config.BASE_FEN, [])
+
+    def _go(self, tokens: list) -> None:
+        options = {}
+        flags = set()
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token in ("infinite", "ponder"):
+                flags.add(token)
+                index += 1
+            elif token == "searchmoves":
+                break  # Not supported, the whole position is searched
+            elif index + 1 < len(tokens):
+                options[token] = int(tokens[index + 1])
+                index += 2
+            else:
+                index += 1
+
+        game = self.game
+        if self._book is not None and not flags:
+            move = self._book.choose(game)
+            if move:
+                self.send(f"bestmove {move_to_uci(move)}")
+                return
+
+        depth = options.get("depth", MAX_DEPTH)
+        nodes = options.get("nodes")
+        movetime = options["movetime"] / 1000 if "movetime" in options else None
+        budget = self._time_budget(options)
+        if budget is not None and "ponder" not in flags:
+            movetime = budget if movetime is None else min(movetime, budget)
+        self._ponder_budget = budget if "ponder" in flags else None
+        self._hold_bestmove = bool(flags)
+        self._release = asyncio.Event()
+        self._search_task = asyncio.create_task(self._run_search(depth, movetime, nodes))
+
+    def _time_budget(self, options: dict) -> float:
+        """
+        Time to spend on the move from the clock, None without clock
+        """
+        remaining = options.get("wtime" if self.game.turn == 0 else "btime")
+        if remaining is None:
+            return None
+        increment = options.get("winc" if self.game.turn == 0 else "binc", 0)
+        moves_to_go = options.get("movestogo", DEFAULT_MOVES_TO_GO)
+        budget = remaining / max(moves_to_go, 1) + increment * 0.75
+        budget = min(budget, remaining * 0.5) / 1000
+        return max(budget - MOVE_OVERHEAD, 0.01)
+
+    def _info(self, depth: int, score: int, nodes: int, elapsed: float, pv: list) -> None:
+        nps = int(nodes / elapsed) if elapsed else 0
+        self.send(
+            f"info depth {depth} score {format_score(score)} nodes {nodes} nps {nps} "
+            f"hashfull {self.tt.hashfull()} time {int(elapsed * 1000)} "
+            f"pv {' '.join(move_to_uci(move) for move in pv)}"
+        )
+
+    async def _report_progress(self, start: float) -> None:
+        """
+        Stream node counts while the search runs
+        """
+        while True:
+            await asyncio.sleep(INFO_INTERVAL)
+            searcher = self._searcher
+            if isinstance(searcher, Search):
+                elapsed = time.perf_counter() - start
+                nodes = searcher.nodes
+                self.send(
+                    f"info nodes {nodes} nps {int(nodes / elapsed) if elapsed else 0} "
+                    f"hashfull {self.tt.hashfull()} time {int(elapsed * 1000)}"
+                )
+
+    async def _run_search(self, depth: int, movetime: float, nodes: int) -> None:
+        start = time.perf_counter()
+        progress = asyncio.create_task(self._report_progress(start))
+        try:
+            if self.threads > 1:
+                if self._parallel is None:
+                    self._parallel = ParallelSearch(self.threads, self.hash_mb, self.tablebase_path)
+                self._searcher = self._parallel
+                move, score = await asyncio.to_thread(
+                    self._parallel.search, self.game, depth, movetime, nodes
+                )
+                elapsed = time.perf_counter() - start
+                searched = self._parallel.nodes
+                self.send(
+                    f"info depth {self._parallel.completed_depth} score {format_score(score)} "
+                    f"nodes {searched} nps {int(searched / elapsed) if elapsed else 0} "
+                    f"time {int(elapsed * 1000)}"
+                )
+            else:
+                if self.search is None:
+                    self.search = Search(self.game, self.tt, tablebase=self._tablebase)
+                self._searcher = self.search
+                move, score = await asyncio.to_thread(
+                    self.search.search, depth, movetime, nodes, self._info
+                )
+        finally:
+            progress.cancel()
+            if self._ponder_timer is not None:
+                self._ponder_timer.cancel()
+                self._ponder_timer = None
+        # Infinite and ponder searches answer only once stopped
+        if self._hold_bestmove:
+            await self._release.wait()
+        self._searcher = None
+        self.send(f"bestmove {move_to_uci(move) if move else '0000'}")
+
+    async def _stop_search(self) -> None:
+        """
+        Stop the running search, if any, and wait for its bestmove
+        :return:
+        """
+        task = self._search_task
+        if task is None:
+            return
+        self._release.set()
+        self._search_task = None
+        # A stop sent before the worker thread started the search would be
+        # reset by it, repeat it until the search returns
+        while not task.done():
+            if self._searcher is not None:
+                self._searcher.stop()
+            await asyncio.wait({task}, timeout=0.05)
+        await task
+
+    def _ponderhit(self) -> None:
+        """
+        The expected move was played: the ponder search goes on as a normal
+        search, stopped once the clock budget is spent
+        """
+        if self._search_task is None or self._search_task.done():
+            return
+        self._hold_bestmove = False
+        self._release.set()
+        if self._ponder_budget is not None:
+            self._ponder_timer = asyncio.get_running_loop().call_later(
+                self._ponder_budget, self._searcher.stop
+            )
@@ -0,0 +1,18 @@
+"""
+UCI engine on stdin / stdout.
+
+    python -m src.uci
+"""
+import asyncio
+import sys
+
+from src.uci.UciEngine import UciEngine
+
+
+def main() -> int:
+    asyncio.run(UciEngine().run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Per-square attack tables for the non-sliding pieces, built once at import.
+Each table holds 64 bitboards indexed by square (a1 = 0, h8 = 63).
+"""
+from src.utils import constants
+from src.utils.magic import bishop_attacks, rook_attacks
+
+
+def _knight_attacks(position: bin) -> bin:
+    """
+    Compute the squares attacked by a knight with the shift-and-mask formulas.
+    :param position: bitboard of the knight's position
+    :return: bitboard of attacked squares
+    """
+    a_file_mask = constants.A_FILE_MASK
+    ab_file_mask = constants.AB_FILE_MASK  # For two rightward moves
+    h_file_mask = constants.H_FILE_MASK
+    gh_file_mask = constants.GH_FILE_MASK  # For two leftward moves
+
+    attacks = (
+        (position << 17) & a_file_mask  # Two up, one right
+        | (position << 15) & h_file_mask  # Two up, one left
+        | (position << 10) & ab_file_mask  # One up, two right
+        | (position << 6) & gh_file_mask  # One up, two left
+        | (position >> 15) & a_file_mask  # Two down, one right
+        | (position >> 17) & h_file_mask  # Two down, one left
+        | (position >> 6) & ab_file_mask  # One down, two right
+        | (position >> 10) & gh_file_mask  # One down, two left
+    )
+    return attacks & constants.BOARD_MASK
+
+
+def _king_attacks(position: bin) -> bin:
+    """
+    Compute the squares attacked by a king with the shift-and-mask formulas.
+    :param position: bitboard of the king's position
+    :return: bitboard of attacked squares
+    """
+    not_a_file = constants.NOT_A_FILE
+    not_h_file = constants.NOT_H_FILE
+
+    attacks = (
+        (position << 8)  # Up
+        | (position >> 8)  # Down
+        | (position << 1) & not_a_file  # Right
+        | (position >> 1) & not_h_file  # Left
+        | (position << 9) & not_a_file  # Up-right
+        | (position << 7) & not_h_file  # Up-left
+        | (position >> 7) & not_a_file  # Down-right
+        | (position >> 9) & not_h_file  # Down-left
+    )
+    return attacks & constants.BOARD_MASK
+
+
+def _pawn_attacks(color: int, position: bin) -> bin:
+    """
+    Compute the squares attacked by a pawn.
+    :param color: color of the pawn, 0 for white, 1 for black
+    :param position: bitboard of the pawn's position
+    :return: bitboard of attacked squares
+    """
+    if color == 0:
+        attacks = (position << 7) & constants.H_FILE_MASK | (position << 9) & constants.A_FILE_MASK
+    else:
+        attacks = (position >> 9) & constants.H_FILE_MASK | (position >> 7) & constants.A_FILE_MASK
+    return attacks & constants.BOARD_MASK
+
+
+KNIGHT_ATTACKS = tuple(_knight_attacks(1 << square) for square in range(64))
+KING_ATTACKS = tuple(_king_attacks(1 << square) for square in range(64))
+# Indexed by color then square: PAWN_ATTACKS[color][square]
+PAWN_ATTACKS = tuple(
+    tuple(_pawn_attacks(color, 1 << square) for square in range(64)) for color in (0, 1)
+)
+
+
+def attacked_squares(
+    color: int, pawns: bin, knights: bin, diagonal: bin, straight: bin, king: bin, occupied: bin
+) -> bin:
+    """
+    Get every square attacked by one side
+    :param color: color of the attacking side, 0 for white, 1 for black
+    :param pawns: bitboard of the attacking pawns
+    :param knights: bitboard of the attacking knights
+    :param diagonal: bitboard of the attacking bishops and queens
+    :param straight: bitboard of the attacking rooks and queens
+    :param king: bitboard of the attacking king
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    if color == 0:
+        attacks = (pawns << 7) & constants.H_FILE_MASK | (pawns << 9) & constants.A_FILE_MASK
+    else:
+        attacks = (pawns >> 9) & constants.H_FILE_MASK | (pawns >> 7) & constants.A_FILE_MASK
+    if king:
+        attacks |= KING_ATTACKS[king.bit_length() - 1]
+    while knights:
+        knight = knights & -knights
+        knights ^= knight
+        attacks |= KNIGHT_ATTACKS[knight.bit_length() - 1]
+    while diagonal:
+        slider = diagonal & -diagonal
+        diagonal ^= slider
+        attacks |= bishop_attacks(slider.bit_length() - 1, occupied)
+    while straight:
+        slider = straight & -straight
+        straight ^= slider
+        attacks |= rook_attacks(slider.bit_length() - 1, occupied)
+    return attacks & constants.BOARD_MASK
+
+
+def _between(square_a: int, square_b: int) -> bin:
+    """
+    Compute the squares strictly between two aligned squares.
+    :param square_a: int: index of the first square
+    :param square_b: int: index of the second square
+    :return: bitboard of the squares in between, 0 if not aligned
+    """
+    bit_a, bit_b = 1 << square_a, 1 << square_b
+    if rook_attacks(square_a, 0) & bit_b:
+        return rook_attacks(square_a, bit_b) & rook_attacks(square_b, bit_a)
+    if bishop_attacks(square_a, 0) & bit_b:
+        return bishop_attacks(square_a, bit_b) & bishop_attacks(square_b, bit_a)
+    return 0
+
+
+# Indexed by both squares: BETWEEN[square_a][square_b]
+BETWEEN = tuple(tuple(_between(a, b) for b in range(64)) for a in range(64))
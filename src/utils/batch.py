@@ -0,0 +1,225 @@
+"""
+Vectorized attack and mobility bitboards for many positions at once.
+
+Positions are given as an (N, 12) uint64 array of piece bitboards in the
+order of Game.PIECE_BITBOARDS (white pawns .. white king, black pawns ..
+black king). Every formula works on whole columns: knight, king and pawn
+attacks are the shift-and-mask expressions of the piece classes, sliders
+use an occluded (Kogge-Stone) fill, so no per-position Python code runs.
+"""
+import numpy as np
+
+from src.game.Game import Game
+from src.utils import constants
+
+_BOARD = np.uint64(constants.BOARD_MASK)
+_NOT_A_FILE = np.uint64(constants.NOT_A_FILE)
+_NOT_H_FILE = np.uint64(constants.NOT_H_FILE)
+_NOT_AB_FILE = np.uint64(constants.AB_FILE_MASK)
+_NOT_GH_FILE = np.uint64(constants.GH_FILE_MASK)
+_SECOND_RANK = np.uint64(constants.SECOND_RANK)
+_SEVENTH_RANK = np.uint64(constants.SEVENTH_RANK)
+_S = {n: np.uint64(n) for n in (1, 2, 4, 6, 7, 8, 9, 10, 14, 15, 16, 17, 18, 28, 32, 36)}
+
+# (shift, wrap mask) of each ray, positive shifts go up the board
+_ROOK_RAYS = ((8, _BOARD), (-8, _BOARD), (1, _NOT_A_FILE), (-1, _NOT_H_FILE))
+_BISHOP_RAYS = ((9, _NOT_A_FILE), (7, _NOT_H_FILE), (-7, _NOT_A_FILE), (-9, _NOT_H_FILE))
+
+
+def _shift(bitboards: np.ndarray, shift: int) -> np.ndarray:
+    if shift > 0:
+        return bitboards << _S[shift]
+    return bitboards >> _S[-shift]
+
+
+def knight_attacks(knights: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by knights
+    :param knights: uint64 array of knight bitboards
+    :return: uint64 array of attacked squares, same shape
+    """
+    return (
+        (knights << _S[17]) & _NOT_A_FILE
+        | (knights << _S[15]) & _NOT_H_FILE
+        | (knights << _S[10]) & _NOT_AB_FILE
+        | (knights << _S[6]) & _NOT_GH_FILE
+        | (knights >> _S[15]) & _NOT_A_FILE
+        | (knights >> _S[17]) & _NOT_H_FILE
+        | (knights >> _S[6]) & _NOT_AB_FILE
+        | (knights >> _S[10]) & _NOT_GH_FILE
+    )
+
+
+def king_attacks(kings: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by kings
+    :param kings: uint64 array of king bitboards
+    :return: uint64 array of attacked squares, same shape
+    """
+    sideways = (kings << _S[1]) & _NOT_A_FILE | (kings >> _S[1]) & _NOT_H_FILE
+    row = kings | sideways
+    return sideways | (row << _S[8]) | (row >> _S[8])
+
+
+def pawn_attacks(pawns: np.ndarray, color: int) -> np.ndarray:
+    """
+    Squares attacked by pawns
+    :param pawns: uint64 array of pawn bitboards
+    :param color: color of the pawns, 0 for white, 1 for black
+    :return: uint64 array of attacked squares, same shape
+    """
+    if color == 0:
+        return (pawns << _S[7]) & _NOT_H_FILE | (pawns << _S[9]) & _NOT_A_FILE
+    return (pawns >> _S[9]) & _NOT_H_FILE | (pawns >> _S[7]) & _NOT_A_FILE
+
+
+def _ray_attacks(sliders: np.ndarray, empty: np.ndarray, rays) -> np.ndarray:
+    """
+    Occluded fill of every slider along each ray, stopping on (and
+    including) the first occupied square
+    """
+    attacks = np.zeros_like(sliders)
+    for shift, mask in rays:
+        propagate = empty & mask
+        fill = sliders
+        # Three doubling steps cover the 7 squares of the longest ray
+        for step in (shift, 2 * shift, 4 * shift):
+            fill = fill | propagate & _shift(fill, step)
+            propagate = propagate & _shift(propagate, step)
+        attacks |= _shift(fill, shift) & mask
+    return attacks
+
+
+def rook_attacks(rooks: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by rooks (or queens along ranks and files), blockers included
+    :param rooks: uint64 array of rook bitboards
+    :param occupied: uint64 array of occupied squares, same shape
+    :return: uint64 array of attacked squares
+    """
+    return _ray_attacks(rooks, ~occupied, _ROOK_RAYS)
+
+
+def bishop_attacks(bishops: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by bishops (or queens along diagonals), blockers included
+    :param bishops: uint64 array of bishop bitboards
+    :param occupied: uint64 array of occupied squares, same shape
+    :return: uint64 array of attacked squares
+    """
+    return _ray_attacks(bishops, ~occupied, _BISHOP_RAYS)
+
+
+def _check_boards(boards: np.ndarray) -> np.ndarray:
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 12:
+        raise ValueError("boards must be an (N, 12) array of piece bitboards")
+    return boards.astype(np.uint64, copy=False)
+
+
+def attack_maps(boards: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by each piece set of every position
+    :param boards: (N, 12) uint64 array of piece bitboards
+    :return: (N, 12) uint64 array, column i holds the attacks of piece set i
+    """
+    boards = _check_boards(boards)
+    occupied = np.bitwise_or.reduce(boards, axis=1)
+    attacks = np.empty_like(boards)
+    for color in (0, 1):
+        base = 6 * color
+        attacks[:, base + constants.PAWN] = pawn_attacks(boards[:, base + constants.PAWN], color)
+        attacks[:, base + constants.KNIGHT] = knight_attacks(boards[:, base + constants.KNIGHT])
+        attacks[:, base + constants.BISHOP] = bishop_attacks(boards[:, base + constants.BISHOP], occupied)
+        attacks[:, base + constants.ROOK] = rook_attacks(boards[:, base + constants.ROOK], occupied)
+        queens = boards[:, base + constants.QUEEN]
+        attacks[:, base + constants.QUEEN] = (
+            rook_attacks(queens, occupied) | bishop_attacks(queens, occupied)
+        )
+        attacks[:, base + constants.KING] = king_attacks(boards[:, base + constants.KING])
+    return attacks
+
+
+def side_attacks(boards: np.ndarray) -> np.ndarray:
+    """
+    Squares attacked by each side of every position
+    :param boards: (N, 12) uint64 array of piece bitboards
+    :return: (N, 2) uint64 array, white then black attacks
+    """
+    attacks = attack_maps(boards)
+    return np.stack(
+        (
+            np.bitwise_or.reduce(attacks[:, :6], axis=1),
+            np.bitwise_or.reduce(attacks[:, 6:], axis=1),
+        ),
+        axis=1,
+    )
+
+
+def mobility_maps(boards: np.ndarray) -> np.ndarray:
+    """
+    Pseudo-legal destination squares of each piece set of every position:
+    attacks minus own pieces, pawns push to empty squares and capture only
+    enemy pieces (en passant and castling are not included)
+    :param boards: (N, 12) uint64 array of piece bitboards
+    :return: (N, 12) uint64 array of destination squares
+    """
+    boards = _check_boards(boards)
+    attacks = attack_maps(boards)
+    pieces = np.stack(
+        (
+            np.bitwise_or.reduce(boards[:, :6], axis=1),
+            np.bitwise_or.reduce(boards[:, 6:], axis=1),
+        ),
+        axis=1,
+    )
+    empty = ~(pieces[:, 0] | pieces[:, 1])
+    mobility = np.empty_like(attacks)
+    for color in (0, 1):
+        base = 6 * color
+        own, enemy = pieces[:, color], pieces[:, 1 - color]
+        mobility[:, base:base + 6] = attacks[:, base:base + 6] & ~own[:, None]
+        pawns = boards[:, base + constants.PAWN]
+        if color == 0:
+            single = (pawns << _S[8]) & empty
+            double = ((pawns & _SECOND_RANK) << _S[16]) & empty & (empty << _S[8])
+        else:
+            single = (pawns >> _S[8]) & empty
+            double = ((pawns & _SEVENTH_RANK) >> _S[16]) & empty & (empty >> _S[8])
+        mobility[:, base + constants.PAWN] = (
+            single | double | attacks[:, base + constants.PAWN] & enemy
+        )
+    return mobility
+
+
+def popcount(bitboards: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits of every bitboard
+    :param bitboards: uint64 array
+    :return: uint8 array of bit counts, same shape
+    """
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(bitboards)
+    bits = np.unpackbits(np.ascontiguousarray(bitboards).view(np.uint8), axis=-1)
+    return bits.reshape(*bitboards.shape, 64).sum(axis=-1, dtype=np.uint8)
+
+
+def mobility_counts(boards: np.ndarray) -> np.ndarray:
+    """
+    Number of pseudo-legal destination squares of each piece set
+    :param boards: (N, 12) uint64 array of piece bitboards
+    :return: (N, 12) uint8 array
+    """
+    return popcount(mobility_maps(boards))
+
+
+def boards_from_games(games) -> np.ndarray:
+    """
+    Gather the piece bitboards of Game objects
+    :param games: iterable of Game
+    :return: (N, 12) uint64 array
+    """
+    return np.array(
+        [[getattr(game, name) for name in Game.PIECE_BITBOARDS] for game in games],
+        dtype=np.uint64,
+    ).reshape(-1, 12)
@@ -15,13 +15,55 @@ BLACK_KING = "k"
 WHITE = "w"
 BLACK = "b"
 
+# Piece indexes: color * 6 + piece type, white pieces first
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+NO_PIECE = 12
+PIECE_SYMBOLS = "PNBRQKpnbrqk"
+
+# Castling rights bits (KQkq)
+WHITE_KINGSIDE_CASTLE = 1 << 3
+WHITE_QUEENSIDE_CASTLE = 1 << 2
+BLACK_KINGSIDE_CASTLE = 1 << 1
+BLACK_QUEENSIDE_CASTLE = 1 << 0
+
+# Move encoding on 16 bits: from square | to square << 6 | flag << 12
+QUIET_MOVE = 0
+DOUBLE_PAWN_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT_CAPTURE = 5
+KNIGHT_PROMOTION = 8
+BISHOP_PROMOTION = 9
+ROOK_PROMOTION = 10
+QUEEN_PROMOTION = 11
+KNIGHT_PROMOTION_CAPTURE = 12
+BISHOP_PROMOTION_CAPTURE = 13
+ROOK_PROMOTION_CAPTURE = 14
+QUEEN_PROMOTION_CAPTURE = 15
+# Flag bits shared by every capture / promotion flag
+CAPTURE_FLAG = 4
+PROMOTION_FLAG = 8
+
 SECOND_RANK = 0x000000000000FF00
 SEVENTH_RANK = 0x00FF000000000000
+FIRST_RANK = 0x00000000000000FF
+EIGHTH_RANK = 0xFF00000000000000
+
+# Squares are indexed a1 = 0, h1 = 7, ..., h8 = 63 (see utils.move_to_index),
+# so the A file is the lowest bit of each rank byte.
+BOARD_MASK = 0xFFFFFFFFFFFFFFFF
 
+# Masks clearing the named file(s), applied after a shift to avoid wraparound
 A_FILE_MASK = 0xFEFEFEFEFEFEFEFE
 AB_FILE_MASK = 0xFCFCFCFCFCFCFCFC
 H_FILE_MASK = 0x7F7F7F7F7F7F7F7F
 GH_FILE_MASK = 0x3F3F3F3F3F3F3F3F
 
-NOT_A_FILE = 0x7F7F7F7F7F7F7F7F
-NOT_H_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
@@ -0,0 +1,272 @@
+"""
+Magic bitboard attack tables for the sliding pieces (rook, bishop, queen).
+
+Squares use the little-endian rank-file mapping of ``move_to_index``: a1 is
+square 0, h1 square 7 and h8 square 63. For every square the relevant
+occupancy (the ray squares, edges excluded) is multiplied by a magic number
+and shifted to index a table of precomputed attack sets.
+
+The magic numbers below were found with ``find_magic`` (see ``__main__``).
+The attack tables are built from them on first use and cached on disk under
+``config.CACHE_PATH`` so later imports only need to read the file back.
+"""
+import os
+import random
+import zlib
+from array import array
+
+from src import config
+from src.utils.constants import BOARD_MASK
+
+# (file, rank) steps of each ray
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+MAGIC_SEED = 0x5EED
+
+ROOK_MAGICS = (
+    0x0380002A1281C000, 0x0200102302408200, 0x3480200289100080, 0x0480100208008004,
+    0x0280080180040002, 0x0600100600040831, 0x0400300401084082, 0x1A00020040810024,
+    0x0082002080420101, 0x0202002080410200, 0x0210801000200882, 0x2408801000080080,
+    0x5090800800840080, 0x0222000488908200, 0x0004001002080104, 0x0C20800080005900,
+    0x924380800820C011, 0x0040484010002000, 0x0020008020801000, 0x1020808010000804,
+    0x0402850008009100, 0x8054008002008004, 0x400004005F100802, 0x00C65A0004164A81,
+    0x0C00408200210200, 0x041002C240002000, 0x0020004100210010, 0x0600100080080082,
+    0xC208008880040080, 0x0400020080040080, 0xE000420400614810, 0x0020008200104104,
+    0x0800804000800038, 0x0290002008400048, 0x2080200282801000, 0x0C1600100A004120,
+    0xC100800800800402, 0x04A0020080800400, 0x0208480184000210, 0x1801010082000044,
+    0x1000400080008024, 0x100120100040C000, 0xA025002002450010, 0xC240080010008080,
+    0x842B010801050010, 0x0080040002008080, 0x0040821001840008, 0x0000412040920004,
+    0x0421400680002480, 0x0100400080200080, 0x0018801042002200, 0x0800480080100280,
+    0x0685800402080080, 0x0089008400020900, 0x5044302802018400, 0x0200005084110200,
+    0x0020310080012441, 0x0000204104120086, 0x00004010800A2202, 0x2002082010000501,
+    0x0002006010440882, 0x8002004150381402, 0x050004A502181004, 0xC200002081004402,
+)
+BISHOP_MAGICS = (
+    0x0020202210404086, 0x0082480101020000, 0x00044902120000A0, 0x8008285302400064,
+    0x8002021000008100, 0x040288200A000000, 0x0080440208400840, 0x1B02010042022000,
+    0x4080C14808008080, 0x3200901031090021, 0x0080086808488000, 0x48150404218C2200,
+    0x2000040504409000, 0x0040084110100900, 0x0002040101082042, 0x8E00202108088408,
+    0x00040A0810041800, 0x0002A00802140408, 0x8088041008881013, 0x9000800802094032,
+    0x544400CE01215008, 0x0804212200900800, 0x0041001401280200, 0x4100800100411090,
+    0x000EA80C41886800, 0x000A1800B1010808, 0x0805100021040820, 0x4021080344004010,
+    0x2102840008802000, 0x0810010040240101, 0x0084004000882408, 0x0000848401004840,
+    0x2028201000044408, 0x000090484004A800, 0x4041040100A88800, 0x0010C20080180082,
+    0x0021100400008020, 0x0002174501020088, 0x8085040404093300, 0xC048044840090500,
+    0x1811010920204000, 0x02C2085B0C014820, 0x0000082488007000, 0x8004020122088400,
+    0x00403A0202005412, 0x8C40080089010020, 0x020408009400A100, 0x0402008101029208,
+    0x2004008404208000, 0x08008080A8208000, 0x0201004A08040804, 0xA12000020A020002,
+    0x8004113102022104, 0x0262040408120200, 0x08D002B001120000, 0x2810042804822481,
+    0x0030110410122814, 0x8082042684100800, 0x00C0201210840400, 0x681440000C208810,
+    0x4400000120042400, 0x0022022060420224, 0x0100102008010050, 0x0002200200821081,
+)
+
+
+def sliding_attacks(square: int, occupied: bin, directions) -> bin:
+    """
+    Compute the attacks of a slider by walking each ray square by square.
+    The first occupied square of a ray is included (capture square).
+    Only used to build the tables, use rook_attacks / bishop_attacks instead.
+    :param square: int: index of the slider square
+    :param occupied: bitboard of all occupied squares
+    :param directions: (file, rank) steps of the rays
+    :return: bitboard of attacked squares
+    """
+    start_file, start_rank = square & 7, square >> 3
+    attacks = 0
+    for file_step, rank_step in directions:
+        file, rank = start_file + file_step, start_rank + rank_step
+        while 0 <= file < 8 and 0 <= rank < 8:
+            bit = 1 << (rank * 8 + file)
+            attacks |= bit
+            if occupied & bit:
+                break
+            file += file_step
+            rank += rank_step
+    return attacks
+
+
+def relevant_occupancy_mask(square: int, directions) -> bin:
+    """
+    Get the squares whose occupancy can change the attacks of a slider,
+    i.e. its rays without the last square before the board edge.
+    :param square: int: index of the slider square
+    :param directions: (file, rank) steps of the rays
+    :return: bitboard of relevant occupancy squares
+    """
+    start_file, start_rank = square & 7, square >> 3
+    mask = 0
+    for file_step, rank_step in directions:
+        file, rank = start_file + file_step, start_rank + rank_step
+        while 0 <= file + file_step < 8 and 0 <= rank + rank_step < 8:
+            mask |= 1 << (rank * 8 + file)
+            file += file_step
+            rank += rank_step
+    return mask
+
+
+def _occupancy_subsets(mask: bin):
+    """
+    Enumerate every subset of mask (Carry-Rippler trick), starting with 0.
+    """
+    subset = 0
+    while True:
+        yield subset
+        subset = (subset - mask) & mask
+        if not subset:
+            return
+
+
+def find_magic(square: int, directions, rng: random.Random) -> int:
+    """
+    Search a magic number mapping every relevant occupancy of square to a
+    table slot without destructive collisions.
+    :param square: int: index of the slider square
+    :param directions: (file, rank) steps of the rays
+    :param rng: random generator used to draw candidates
+    :return: int: magic number
+    """
+    mask = relevant_occupancy_mask(square, directions)
+    bits = mask.bit_count()
+    shift = 64 - bits
+    occupancies = list(_occupancy_subsets(mask))
+    attacks = [sliding_attacks(square, occ, directions) for occ in occupancies]
+    while True:
+        # Sparse candidates are much more likely to be magics
+        magic = rng.getrandbits(64) & rng.getrandbits(64) & rng.getrandbits(64)
+        if ((mask * magic) & 0xFF00000000000000).bit_count() < 6:
+            continue
+        used = [0] * (1 << bits)
+        for occ, attack in zip(occupancies, attacks):
+            index = ((occ * magic) & BOARD_MASK) >> shift
+            if not used[index]:
+                used[index] = attack
+            elif used[index] != attack:
+                break
+        else:
+            return magic
+
+
+def _build_table(square: int, directions, mask: bin, magic: int, shift: int) -> list:
+    """
+    Build the attack table of one square for the given magic.
+    :return: list: attacks indexed by the magic index
+    """
+    table = [0] * (1 << (64 - shift))
+    for occ in _occupancy_subsets(mask):
+        table[((occ * magic) & BOARD_MASK) >> shift] = sliding_attacks(
+            square, occ, directions
+        )
+    return table
+
+
+def _cache_file() -> str:
+    """
+    Path of the cached tables, keyed by a checksum of the magic numbers so a
+    stale cache is never read back.
+    """
+    magics = array("Q", ROOK_MAGICS + BISHOP_MAGICS)
+    checksum = zlib.crc32(magics.tobytes())
+    project_root = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    return os.path.join(project_root, config.CACHE_PATH, f"magic-{checksum:08x}.bin")
+
+
+def _load_tables() -> tuple:
+    """
+    Load the rook and bishop tables from the disk cache, building and saving
+    them if the cache is missing or truncated.
+    :return: tuple: (rook tables, bishop tables), one list per square
+    """
+    sizes = [1 << (64 - shift) for shift in ROOK_SHIFTS + BISHOP_SHIFTS]
+    flat = array("Q")
+    path = _cache_file()
+    try:
+        with open(path, "rb") as file:
+            flat.fromfile(file, sum(sizes))
+    except (OSError, EOFError):
+        flat = array("Q")
+        specs = [
+            (ROOK_DIRECTIONS, ROOK_MASKS, ROOK_MAGICS, ROOK_SHIFTS),
+            (BISHOP_DIRECTIONS, BISHOP_MASKS, BISHOP_MAGICS, BISHOP_SHIFTS),
+        ]
+        for directions, masks, magics, shifts in specs:
+            for square in range(64):
+                flat.extend(
+                    _build_table(
+                        square, directions, masks[square], magics[square], shifts[square]
+                    )
+                )
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                flat.tofile(file)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Read-only checkout, the tables are simply rebuilt next time
+
+    tables = []
+    start = 0
+    for size in sizes:
+        tables.append(flat[start:start + size].tolist())
+        start += size
+    return tables[:64], tables[64:]
+
+
+ROOK_MASKS = tuple(relevant_occupancy_mask(sq, ROOK_DIRECTIONS) for sq in range(64))
+BISHOP_MASKS = tuple(relevant_occupancy_mask(sq, BISHOP_DIRECTIONS) for sq in range(64))
+ROOK_SHIFTS = tuple(64 - mask.bit_count() for mask in ROOK_MASKS)
+BISHOP_SHIFTS = tuple(64 - mask.bit_count() for mask in BISHOP_MASKS)
+ROOK_TABLES, BISHOP_TABLES = _load_tables()
+
+
+def rook_attacks(square: int, occupied: bin) -> bin:
+    """
+    Get the squares attacked by a rook, blockers included.
+    :param square: int: index of the rook square
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return ROOK_TABLES[square][
+        (((occupied & ROOK_MASKS[square]) * ROOK_MAGICS[square]) & BOARD_MASK)
+        >> ROOK_SHIFTS[square]
+    ]
+
+
+def bishop_attacks(square: int, occupied: bin) -> bin:
+    """
+    Get the squares attacked by a bishop, blockers included.
+    :param square: int: index of the bishop square
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return BISHOP_TABLES[square][
+        (((occupied & BISHOP_MASKS[square]) * BISHOP_MAGICS[square]) & BOARD_MASK)
+        >> BISHOP_SHIFTS[square]
+    ]
+
+
+def queen_attacks(square: int, occupied: bin) -> bin:
+    """
+    Get the squares attacked by a queen, blockers included.
+    :param square: int: index of the queen square
+    :param occupied: bitboard of all occupied squares
+    :return: bitboard of attacked squares
+    """
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+if __name__ == "__main__":
+    # Regenerate the magic numbers (slow, ~30s)
+    generator = random.Random(MAGIC_SEED)
+    for name, directions in (
+        ("ROOK_MAGICS", ROOK_DIRECTIONS),
+        ("BISHOP_MAGICS", BISHOP_DIRECTIONS),
+    ):
+        found = [find_magic(sq, directions, generator) for sq in range(64)]
+        print(f"{name} = (")
+        for i in range(0, 64, 4):
+            print("    " + " ".join(f"0x{magic:016X}," for magic in found[i:i + 4]))
+        print(")")
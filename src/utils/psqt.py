@@ -0,0 +1,165 @@
+"""
+Material and piece-square tables of the evaluation.
+
+Every term has a middlegame and an endgame value, packed in one int as
+mg + (eg << 16) so that both are added or subtracted at once: the Game
+keeps the sum of PSQT[piece][square] over its pieces, updated by
+make_move / unmake_move with a few additions. Black entries are the
+negated, rank-mirrored white ones, the sum is from white's point of view.
+The game phase (24 with all pieces on the board, 0 with pawns and kings
+only) blends the two values.
+"""
+from src.utils import constants
+
+
+def make_score(mg: int, eg: int) -> int:
+    """
+    Pack a middlegame and an endgame value
+    :param mg: int: middlegame value
+    :param eg: int: endgame value
+    :return: int: packed score
+    """
+    return mg + (eg << 16)
+
+
+def mg_score(score: int) -> int:
+    """
+    Middlegame value of a packed score
+    """
+    return ((score + 0x8000) & 0xFFFF) - 0x8000
+
+
+def eg_score(score: int) -> int:
+    """
+    Endgame value of a packed score
+    """
+    return (score + 0x8000) >> 16
+
+
+# Material (middlegame, endgame) by piece type, pawn .. king
+PIECE_VALUES = ((100, 120), (320, 300), (330, 320), (500, 520), (900, 930), (0, 0))
+# Phase weight by piece type
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+TOTAL_PHASE = 24
+
+# White's tables, rank 8 first as seen from white (middlegame, endgame)
+_PAWN = (
+    (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        80, 80, 80, 80, 80, 80, 80, 80,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        30, 30, 30, 30, 30, 30, 30, 30,
+        15, 15, 15, 15, 15, 15, 15, 15,
+        5, 5, 5, 5, 5, 5, 5, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROOK = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+_QUEEN = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+_KING = (
+    (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+    (
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10, 0, 0, -10, -20, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -30, 0, 0, 0, 0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50,
+    ),
+)
+# (middlegame, endgame) table of each piece type
+_TABLES = (_PAWN, (_KNIGHT, _KNIGHT), (_BISHOP, _BISHOP), (_ROOK, _ROOK), (_QUEEN, _QUEEN), _KING)
+
+
+def _white_table(piece_type: int) -> tuple:
+    mg_values, eg_values = PIECE_VALUES[piece_type]
+    mg_table, eg_table = _TABLES[piece_type]
+    # Table row 0 is rank 8: square s is at position s ^ 56
+    return tuple(
+        make_score(mg_values + mg_table[square ^ 56], eg_values + eg_table[square ^ 56])
+        for square in range(64)
+    )
+
+
+_WHITE_TABLES = tuple(_white_table(piece_type) for piece_type in range(6))
+# Indexed by piece index then square: PSQT[piece][square]
+PSQT = _WHITE_TABLES + tuple(
+    tuple(-table[square ^ 56] for square in range(64)) for table in _WHITE_TABLES
+)
+# Indexed by piece index
+PIECE_PHASES = PHASE_WEIGHTS + PHASE_WEIGHTS
+
+
+def compute_scores(game) -> tuple:
+    """
+    Compute the piece-square sum and the phase of a position from scratch
+    :param game: Game: position to score
+    :return: tuple: (packed score from white's point of view, phase)
+    """
+    score = 0
+    phase = 0
+    for square, piece in enumerate(game.board):
+        if piece != constants.NO_PIECE:
+            score += PSQT[piece][square]
+            phase += PIECE_PHASES[piece]
+    return score, phase
@@ -1,3 +1,6 @@
+from src.utils import constants
+
+
 def move_to_index(move: str) -> int:
     """
     Convert a move string to a square index
@@ -14,3 +17,54 @@ def index_to_move(index: int) -> str:
     :return: str: move string in algebraic notation
     """
     return chr(index % 8 + ord("a")) + str(index // 8 + 1)
+
+
+def encode_move(from_square: int, to_square: int, flag: int = 0) -> int:
+    """
+    Pack a move on 16 bits
+    :param from_square: int: index of the departure square
+    :param to_square: int: index of the arrival square
+    :param flag: int: move flag (see constants, QUIET_MOVE, CAPTURE, ...)
+    :return: int: encoded move
+    """
+    return from_square | (to_square << 6) | (flag << 12)
+
+
+def move_from_square(move: int) -> int:
+    """
+    Get the departure square of an encoded move
+    :param move: int: encoded move
+    :return: int: square index
+    """
+    return move & 0x3F
+
+
+def move_to_square(move: int) -> int:
+    """
+    Get the arrival square of an encoded move
+    :param move: int: encoded move
+    :return: int: square index
+    """
+    return (move >> 6) & 0x3F
+
+
+def move_flag(move: int) -> int:
+    """
+    Get the flag of an encoded move
+    :param move: int: encoded move
+    :return: int: move flag
+    """
+    return move >> 12
+
+
+def move_to_uci(move: int) -> str:
+    """
+    Convert an encoded move to its UCI string (e2e4, e7e8q, ...)
+    :param move: int: encoded move
+    :return: str: move in UCI notation
+    """
+    uci = index_to_move(move & 0x3F) + index_to_move((move >> 6) & 0x3F)
+    flag = move >> 12
+    if flag & constants.PROMOTION_FLAG:
+        uci += "nbrq"[flag & 3]
+    return uci
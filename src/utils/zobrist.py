@@ -0,0 +1,61 @@
+"""
+Zobrist keys: one random 64-bit number per (piece, square), castling rights
+value, en passant file and side to move. The key of a position is the XOR of
+the numbers of its features, so a move updates it with a few XORs.
+The generator is seeded, keys are identical from one run to the next.
+"""
+import random
+
+ZOBRIST_SEED = 0x2B7E151628AED2A6
+
+_generator = random.Random(ZOBRIST_SEED)
+
+# Indexed by piece index then square: PIECE_KEYS[piece][square]
+PIECE_KEYS = tuple(
+    tuple(_generator.getrandbits(64) for _ in range(64)) for _ in range(12)
+)
+_CASTLING_RIGHT_KEYS = tuple(_generator.getrandbits(64) for _ in range(4))
+# Indexed by the 4 bits castling rights value, XOR of each right set
+CASTLING_KEYS = tuple(
+    _CASTLING_RIGHT_KEYS[0] * (rights & 1)
+    ^ _CASTLING_RIGHT_KEYS[1] * (rights >> 1 & 1)
+    ^ _CASTLING_RIGHT_KEYS[2] * (rights >> 2 & 1)
+    ^ _CASTLING_RIGHT_KEYS[3] * (rights >> 3 & 1)
+    for rights in range(16)
+)
+# Indexed by the file of the en passant square
+EN_PASSANT_KEYS = tuple(_generator.getrandbits(64) for _ in range(8))
+# XORed in when black is to move
+SIDE_KEY = _generator.getrandbits(64)
+
+
+def compute_key(game) -> int:
+    """
+    Compute the Zobrist key of a position from scratch
+    :param game: Game: position to hash
+    :return: int: 64 bits key
+    """
+    key = 0
+    for square, piece in enumerate(game.board):
+        if piece < 12:
+            key ^= PIECE_KEYS[piece][square]
+    key ^= CASTLING_KEYS[game.castling_rights]
+    if game.en_passant_square:
+        key ^= EN_PASSANT_KEYS[(game.en_passant_square.bit_length() - 1) & 7]
+    if game.turn:
+        key ^= SIDE_KEY
+    return key
+
+
+def compute_pawn_key(game) -> int:
+    """
+    Compute the pawn-only Zobrist key of a position from scratch, the key
+    of its pawn structure (see evaluation.PawnTable)
+    :param game: Game: position to hash
+    :return: int: 64 bits key
+    """
+    key = 0
+    for square, piece in enumerate(game.board):
+        if piece == 0 or piece == 6:  # White or black pawn
+            key ^= PIECE_KEYS[piece][square]
+    return key